@@ -0,0 +1,235 @@
+import json
+import psycopg2
+from app_logging import get_logger
+from responses import dumps, json_response
+
+# Пространство ключей advisory-блокировок бан-пика (первый аргумент pg_advisory_xact_lock)
+BAN_PICK_LOCK_NAMESPACE = 4701
+
+# Последовательность драфта по формату (best_of, размер пула карт).
+# Команда 1 ходит на четных шагах, команда 2 — на нечетных; оставшаяся карта — десайдер
+DRAFT_SEQUENCES = {
+    (1, 7): ('ban', 'ban', 'ban', 'ban', 'ban', 'ban'),
+    (3, 7): ('ban', 'ban', 'pick', 'pick', 'ban', 'ban'),
+    (5, 7): ('ban', 'ban', 'pick', 'pick', 'pick', 'pick'),
+}
+
+log = get_logger('admin-actions.ban_pick')
+
+
+def draft_sequence(best_of: int, pool_size: int) -> tuple:
+    """
+    Шаги драфта для формата: из DRAFT_SEQUENCES или по общему правилу
+    (половина банов, пики best_of - 1 карт, остальные баны, десайдер).
+
+    Если карт в пуле меньше best_of, пиков столько, чтобы осталась одна
+    карта-десайдер: иначе драфт никогда не завершится.
+    """
+    sequence = DRAFT_SEQUENCES.get((best_of, pool_size))
+    if sequence:
+        return sequence
+    bans = max(pool_size - best_of, 0)
+    picks = max(min(best_of, pool_size) - 1, 0)
+    opening_bans = bans - bans // 2
+    return ('ban',) * opening_bans + ('pick',) * picks + ('ban',) * (bans - opening_bans)
+
+
+def parse_map_pool(value) -> list:
+    """map_pool турнира: TEXT[] или JSON-строка"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = [item.strip() for item in value.strip('{}').split(',')]
+    return [str(item) for item in value if item]
+
+
+def load_draft(cur, match_id: int):
+    """
+    Состояние драфта одним запросом: матч, формат и пул турнира, сделанные шаги.
+
+    Returns:
+        dict | None: None, если матч не найден
+    """
+    cur.execute("""
+        SELECT bm.id, bm.team1_id, bm.team2_id, bm.status,
+               COALESCE(t.best_of, 1) as best_of, t.map_pool,
+               COALESCE((
+                   SELECT json_agg(json_build_object(
+                       'id', bp.id,
+                       'team_id', bp.team_id,
+                       'map_name', bp.map_name,
+                       'action', bp.action,
+                       'pick_order', bp.pick_order,
+                       'created_at', bp.created_at,
+                       'team', json_build_object('id', tm.id, 'name', tm.name, 'color', tm.team_color)
+                   ) ORDER BY bp.pick_order)
+                   FROM t_p4831367_esport_gta_disaster.match_ban_pick bp
+                   LEFT JOIN t_p4831367_esport_gta_disaster.teams tm ON bp.team_id = tm.id
+                   WHERE bp.match_id = bm.id
+               ), '[]'::json) as actions
+        FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+        LEFT JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+        LEFT JOIN t_p4831367_esport_gta_disaster.tournaments t ON tb.tournament_id = t.id
+        WHERE bm.id = %s
+    """, (match_id,))
+    row = cur.fetchone()
+    if not row:
+        return None
+
+    map_pool = parse_map_pool(row['map_pool'])
+    best_of = row['best_of']
+    sequence = draft_sequence(best_of, len(map_pool))
+    actions = row['actions']
+    step = len(actions)
+
+    next_action = None
+    if step < len(sequence):
+        next_action = {
+            'order': step + 1,
+            'team_id': row['team1_id'] if step % 2 == 0 else row['team2_id'],
+            'action': sequence[step]
+        }
+
+    taken = {action['map_name'] for action in actions}
+    remaining = [map_name for map_name in map_pool if map_name not in taken]
+
+    return {
+        'match_id': row['id'],
+        'team1_id': row['team1_id'],
+        'team2_id': row['team2_id'],
+        'status': row['status'],
+        'best_of': best_of,
+        'map_pool': map_pool,
+        'sequence': sequence,
+        'actions': actions,
+        'remaining': remaining,
+        'next': next_action,
+        'decider': remaining[0] if next_action is None and len(remaining) == 1 else None
+    }
+
+
+def validate_ban_pick(draft: dict, team_id: int, action: str, map_name: str):
+    """Ошибка хода драфта или None, если ход допустим"""
+    if draft['status'] in ('completed', 'walkover'):
+        return 'Матч уже завершен'
+    if not draft['map_pool']:
+        return 'У турнира не задан пул карт'
+    if team_id not in (draft['team1_id'], draft['team2_id']):
+        return 'Команда не участвует в матче'
+    expected = draft['next']
+    if expected is None:
+        return 'Бан-пик уже завершен'
+    if expected['team_id'] != team_id:
+        return 'Сейчас ход другой команды'
+    if expected['action'] != action:
+        return f"Ожидается {'бан' if expected['action'] == 'ban' else 'пик'}"
+    if map_name not in draft['map_pool']:
+        return 'Карты нет в пуле турнира'
+    if map_name not in draft['remaining']:
+        return 'Карта уже забанена или выбрана'
+    return None
+
+
+def draft_payload(draft: dict) -> dict:
+    return {
+        'bans_picks': draft['actions'],
+        'map_pool': draft['map_pool'],
+        'best_of': draft['best_of'],
+        'sequence': draft['sequence'],
+        'next': draft['next'],
+        'decider': draft['decider'],
+        'complete': draft['next'] is None
+    }
+
+
+def get_ban_pick(cur, conn, body: dict) -> dict:
+    """Бан-пик карт матча и следующий ожидаемый ход (команда и действие)"""
+    match_id = body.get('match_id')
+
+    if not match_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'match_id обязателен'}),
+            'isBase64Encoded': False
+        }
+
+    draft = load_draft(cur, int(match_id))
+    if not draft:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Матч не найден'}),
+            'isBase64Encoded': False
+        }
+
+    return json_response(draft_payload(draft))
+
+
+def make_ban_pick(cur, conn, body: dict) -> dict:
+    """
+    Бан или пик карты.
+
+    Ход проверяется под advisory-блокировкой матча по состоянию, загруженному
+    одним запросом: очередь команды, тип шага, карта в пуле и еще свободна.
+    Уникальность (match_id, pick_order) страхует от гонок.
+
+    body: {'match_id', 'team_id', 'map_name', 'action_type': 'ban' | 'pick'}
+    """
+    match_id = body.get('match_id')
+    team_id = body.get('team_id')
+    map_name = body.get('map_name')
+    action = body.get('action_type')
+
+    if not match_id or not team_id or not map_name or action not in ('ban', 'pick'):
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'match_id, team_id, map_name и action_type (ban/pick) обязательны'}),
+            'isBase64Encoded': False
+        }
+
+    match_id = int(match_id)
+    team_id = int(team_id)
+
+    try:
+        cur.execute("SELECT pg_advisory_xact_lock(%s, %s)", (BAN_PICK_LOCK_NAMESPACE, match_id))
+        draft = load_draft(cur, match_id)
+
+        if not draft:
+            conn.rollback()
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Матч не найден'}),
+                'isBase64Encoded': False
+            }
+
+        error = validate_ban_pick(draft, team_id, action, map_name)
+        if error:
+            conn.rollback()
+            return json_response({'error': error, 'next': draft['next']}, 409)
+
+        cur.execute("""
+            INSERT INTO t_p4831367_esport_gta_disaster.match_ban_pick
+            (match_id, team_id, map_name, action, pick_order)
+            VALUES (%s, %s, %s, %s, %s)
+            RETURNING id
+        """, (match_id, team_id, map_name, action, draft['next']['order']))
+        ban_pick_id = cur.fetchone()['id']
+        conn.commit()
+    except psycopg2.IntegrityError:
+        conn.rollback()
+        return {
+            'statusCode': 409,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Этот шаг драфта уже сделан'}),
+            'isBase64Encoded': False
+        }
+
+    log.debug('ban_pick match=%s order=%s %s %s', match_id, draft['next']['order'], action, map_name)
+
+    return json_response({'message': 'Действие выполнено', 'ban_pick_id': ban_pick_id})
@@ -0,0 +1,132 @@
+import json
+from app_logging import get_logger
+from responses import dumps, json_response
+
+BATCH_MAX_ITEMS = 100
+BATCH_MODES = ('atomic', 'best_effort')
+
+log = get_logger('admin-actions.batch')
+
+
+class DeferredCommitConnection:
+    """
+    Соединение для режима atomic: commit() действий откладывается до конца
+    пакета, rollback() откатывает всю транзакцию и помечает пакет неуспешным.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.rolled_back = False
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rolled_back = True
+        self._conn.rollback()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def parse_response_body(response: dict):
+    """Тело ответа действия как JSON (или строка, если это не JSON)"""
+    body = response.get('body') if isinstance(response, dict) else None
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+def run_batch(cur, conn, admin_id: str, admin_role: dict, body: dict, run_action) -> dict:
+    """
+    Выполняет массив действий администратора за один вызов: одно соединение
+    и одна проверка прав (в handler).
+
+    body: {
+        'action': 'batch',
+        'mode': 'atomic' | 'best_effort',
+        'actions': [{'action': 'approve_registration', 'registration_id': 1}, ...]
+    }
+
+    atomic: все действия в одной транзакции; первая ошибка откатывает пакет,
+    оставшиеся действия пропускаются. best_effort: каждое действие фиксируется
+    отдельно, ошибки не останавливают пакет.
+
+    Returns:
+        dict: Ответ с результатом по каждому действию
+    """
+    mode = body.get('mode', 'atomic')
+    items = body.get('actions')
+
+    if mode not in BATCH_MODES:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Неизвестный режим пакета: {mode}'}),
+            'isBase64Encoded': False
+        }
+
+    if not isinstance(items, list) or not items:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'actions должен быть непустым массивом'}),
+            'isBase64Encoded': False
+        }
+
+    if len(items) > BATCH_MAX_ITEMS:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Не больше {BATCH_MAX_ITEMS} действий в пакете'}),
+            'isBase64Encoded': False
+        }
+
+    atomic = mode == 'atomic'
+    item_conn = DeferredCommitConnection(conn) if atomic else conn
+    results = []
+    failed = False
+
+    for index, item in enumerate(items):
+        action = item.get('action') if isinstance(item, dict) else None
+
+        if failed and atomic:
+            results.append({'index': index, 'action': action, 'status': 'skipped'})
+            continue
+
+        if not action or action == 'batch':
+            status, result = 400, {'error': 'Некорректное действие в пакете'}
+        else:
+            try:
+                response = run_action(cur, item_conn, admin_id, admin_role, action, item)
+                status = response.get('statusCode', 500)
+                result = parse_response_body(response)
+            except Exception as e:
+                status, result = 500, {'error': str(e)}
+
+        ok = status < 400 and not (atomic and item_conn.rolled_back)
+        if ok and not atomic:
+            conn.commit()
+        elif not ok:
+            failed = True
+            conn.rollback()
+
+        results.append({'index': index, 'action': action, 'status': status, 'ok': ok, 'result': result})
+
+    if atomic and not failed:
+        conn.commit()
+
+    succeeded = sum(1 for entry in results if entry.get('ok'))
+    log.info('batch %s: %s/%s succeeded', mode, succeeded, len(items))
+
+    return json_response({
+        'success': not failed,
+        'mode': mode,
+        'committed': not (atomic and failed),
+        'succeeded': succeeded,
+        'failed': sum(1 for entry in results if entry.get('ok') is False),
+        'results': results
+    }, 409 if atomic and failed else 200)
@@ -0,0 +1,159 @@
+import os
+from app_logging import get_logger
+from responses import dumps
+
+# Сетка публикуется, когда с последнего изменения прошло столько секунд:
+# серия правок (счет, подтверждение, продвижение победителя) дает одну выгрузку
+SNAPSHOT_DEBOUNCE_SECONDS = int(os.environ.get('BRACKET_SNAPSHOT_DEBOUNCE_SECONDS', '10'))
+# ...но не позже этого срока после первого неопубликованного изменения,
+# даже если правки идут непрерывно (финал в прямом эфире)
+SNAPSHOT_MAX_WAIT_SECONDS = int(os.environ.get('BRACKET_SNAPSHOT_MAX_WAIT_SECONDS', '60'))
+SNAPSHOT_BATCH_SIZE = 20
+
+log = get_logger('admin-actions.bracket_snapshots')
+
+
+def fetch_bracket_snapshot(cur, tournament_id: int):
+    """
+    Последний опубликованный снимок сетки для клиентов, читающих CDN напрямую.
+
+    Версия снимка запрашивается триггерами на bracket_matches и
+    group_stage_matches (V0067), а
+    brackets/{tournament_id}/latest.json всегда указывает на последнюю версию.
+
+    Returns:
+        dict | None: {'version', 'url', 'latest_url'} или None, если снимок еще не выгружен
+    """
+    cur.execute("""
+        SELECT published_version, url
+        FROM t_p4831367_esport_gta_disaster.bracket_snapshots
+        WHERE tournament_id = %s AND published_version > 0 AND url IS NOT NULL
+    """, (tournament_id,))
+    row = cur.fetchone()
+    if not row:
+        return None
+    return {
+        'version': row['published_version'],
+        'url': row['url'],
+        'latest_url': row['url'].rsplit('/', 1)[0] + '/latest.json'
+    }
+
+
+def snapshot_key(tournament_id: int, name: str) -> str:
+    return f"brackets/{tournament_id}/{name}.json"
+
+
+def snapshot_url(key: str) -> str:
+    return f"https://cdn.poehali.dev/projects/{os.environ['AWS_ACCESS_KEY_ID']}/bucket/{key}"
+
+
+def render_bracket_snapshot(cur, tournament_id: int, version: int):
+    """JSON снимка: сетка плей-офф и групповая стадия, как в get_bracket / get_group_stage"""
+    from brackets import fetch_bracket, fetch_group_stage
+
+    bracket = fetch_bracket(cur, tournament_id)
+    if not bracket:
+        return None
+
+    snapshot = {'tournament_id': tournament_id, 'version': version}
+    snapshot.update(bracket)
+    groups = fetch_group_stage(cur, tournament_id)
+    if groups['teams']:
+        snapshot['groups'] = groups
+    return dumps(snapshot).encode('utf-8')
+
+
+def publish_bracket_snapshots(cur, conn, event: dict) -> dict:
+    """
+    Выгружает в бакет снимки сеток, изменившихся не позже чем
+    SNAPSHOT_DEBOUNCE_SECONDS назад или ждущих публикации дольше
+    SNAPSHOT_MAX_WAIT_SECONDS (вызывается по расписанию).
+
+    Каждая версия пишется в brackets/{tournament_id}/v{version}.json (неизменяемый
+    файл), а latest.json указывает на последнюю.
+    """
+    headers = event.get('headers', {})
+    cron_secret = headers.get('X-Cron-Secret') or headers.get('x-cron-secret')
+    expected_secret = os.environ.get('CRON_SECRET')
+
+    if not expected_secret or cron_secret != expected_secret:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Доступ запрещен'}),
+            'isBase64Encoded': False
+        }
+
+    cur.execute("""
+        SELECT tournament_id, requested_version
+        FROM t_p4831367_esport_gta_disaster.bracket_snapshots
+        WHERE requested_version > published_version
+        AND (
+            requested_at < NOW() - make_interval(secs => %s)
+            OR first_requested_at < NOW() - make_interval(secs => %s)
+        )
+        ORDER BY first_requested_at
+        LIMIT %s
+    """, (SNAPSHOT_DEBOUNCE_SECONDS, SNAPSHOT_MAX_WAIT_SECONDS, SNAPSHOT_BATCH_SIZE))
+    pending = cur.fetchall()
+
+    if not pending:
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'published': []}),
+            'isBase64Encoded': False
+        }
+
+    import boto3
+    s3 = boto3.client(
+        's3',
+        endpoint_url='https://bucket.poehali.dev',
+        aws_access_key_id=os.environ['AWS_ACCESS_KEY_ID'],
+        aws_secret_access_key=os.environ['AWS_SECRET_ACCESS_KEY']
+    )
+
+    published = []
+    failed = []
+    for row in pending:
+        tournament_id = row['tournament_id']
+        version = row['requested_version']
+        try:
+            data = render_bracket_snapshot(cur, tournament_id, version)
+            if data is None:
+                url = None
+            else:
+                version_key = snapshot_key(tournament_id, f'v{version}')
+                s3.put_object(
+                    Bucket='files', Key=version_key, Body=data,
+                    ContentType='application/json', CacheControl='public, max-age=31536000, immutable'
+                )
+                s3.put_object(
+                    Bucket='files', Key=snapshot_key(tournament_id, 'latest'), Body=data,
+                    ContentType='application/json', CacheControl='public, max-age=5'
+                )
+                url = snapshot_url(version_key)
+
+            # Изменения во время выгрузки увеличили requested_version и попадут в следующий запуск
+            cur.execute("""
+                UPDATE t_p4831367_esport_gta_disaster.bracket_snapshots
+                SET published_version = GREATEST(published_version, %s),
+                    published_at = NOW(),
+                    url = COALESCE(%s, url)
+                WHERE tournament_id = %s
+            """, (version, url, tournament_id))
+            conn.commit()
+            published.append({'tournament_id': tournament_id, 'version': version, 'url': url})
+        except Exception as e:
+            conn.rollback()
+            log.error('bracket snapshot %s v%s failed: %s', tournament_id, version, e)
+            failed.append({'tournament_id': tournament_id, 'version': version, 'error': str(e)})
+
+    log.info('bracket snapshots: %s published, %s failed', len(published), len(failed))
+
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': not failed, 'published': published, 'failed': failed}),
+        'isBase64Encoded': False
+    }
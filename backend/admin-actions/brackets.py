@@ -0,0 +1,1054 @@
+from datetime import datetime
+from achievements import award_match_achievements
+from app_logging import get_logger
+from bracket_snapshots import fetch_bracket_snapshot
+from common import escape_sql
+from match_maps import clear_map_scores
+from responses import dumps, json_response
+from tournament_archive import load_tournament_archive
+
+log = get_logger('admin-actions.brackets')
+
+def generate_bracket(cur, conn, admin_id: str, body: dict) -> dict:
+    """Генерирует турнирную сетку для турнира"""
+    tournament_id = body.get('tournament_id')
+    bracket_format = body.get('format', 'single_elimination')
+    bracket_style = body.get('style', 'esports')
+    
+    if not tournament_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'tournament_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        # Получаем информацию о турнире включая starting_stage
+        cur.execute(f"""
+            SELECT max_teams, starting_stage FROM t_p4831367_esport_gta_disaster.tournaments
+            WHERE id = {tournament_id}
+        """)
+        tournament_data = cur.fetchone()
+        
+        if not tournament_data:
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Турнир не найден'}),
+                'isBase64Encoded': False
+            }
+        
+        # Используем starting_stage вместо max_teams для определения размера сетки
+        starting_stage = tournament_data.get('starting_stage') or tournament_data.get('max_teams') or 16
+        max_teams = starting_stage  # Размер сетки определяется starting_stage
+        
+        # Получаем все одобренные регистрации (статус approved или confirmed)
+        cur.execute(f"""
+            SELECT tr.team_id, t.name, t.logo_url
+            FROM t_p4831367_esport_gta_disaster.tournament_registrations tr
+            JOIN t_p4831367_esport_gta_disaster.teams t ON tr.team_id = t.id
+            WHERE tr.tournament_id = {tournament_id} 
+            AND (tr.status = 'approved' OR tr.status = 'confirmed')
+            ORDER BY tr.registered_at
+        """)
+        teams = cur.fetchall()
+        
+        if len(teams) == 0:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Нет одобренных команд для создания сетки'}),
+                'isBase64Encoded': False
+            }
+        
+        # Проверяем, есть ли уже сетка
+        cur.execute(f"""
+            SELECT id FROM t_p4831367_esport_gta_disaster.tournament_brackets
+            WHERE tournament_id = {tournament_id}
+        """)
+        existing_bracket = cur.fetchone()
+        
+        if existing_bracket:
+            bracket_id = existing_bracket['id']
+            # Удаляем старые матчи и обновляем стиль
+            cur.execute(f"""
+                DELETE FROM t_p4831367_esport_gta_disaster.bracket_matches
+                WHERE bracket_id = {bracket_id}
+            """)
+            cur.execute(f"""
+                UPDATE t_p4831367_esport_gta_disaster.tournament_brackets
+                SET style = '{escape_sql(bracket_style)}', updated_at = NOW()
+                WHERE id = {bracket_id}
+            """)
+        else:
+            # Создаем новый bracket
+            cur.execute(f"""
+                INSERT INTO t_p4831367_esport_gta_disaster.tournament_brackets 
+                (tournament_id, format, style, created_by, created_at, updated_at)
+                VALUES ({tournament_id}, '{escape_sql(bracket_format)}', '{escape_sql(bracket_style)}', {admin_id}, NOW(), NOW())
+                RETURNING id
+            """)
+            bracket_id = cur.fetchone()['id']
+        
+        # Генерируем сетку на основе max_teams (фиксированная сетка)
+        import math
+        rounds = int(math.log2(max_teams))  # Например, 16 команд = 4 раунда
+        
+        # Создаем список слотов для первого раунда
+        slots = [None] * max_teams
+        for i, team in enumerate(teams):
+            if i < max_teams:
+                slots[i] = team['team_id']  # team_id
+        
+        # Первый раунд - создаем матчи попарно
+        match_number = 1
+        for i in range(0, max_teams, 2):
+            team1_id = slots[i] if slots[i] else None
+            team2_id = slots[i + 1] if slots[i + 1] else None
+            
+            # Если только одна команда в паре - она автоматически проходит дальше
+            if team1_id and not team2_id:
+                # Команда проходит дальше автоматически
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.bracket_matches
+                    (bracket_id, round, match_number, team1_id, team2_id, winner_id, status, created_at, updated_at)
+                    VALUES ({bracket_id}, 1, {match_number}, {team1_id}, NULL, {team1_id}, 'walkover', NOW(), NOW())
+                """)
+            elif team2_id and not team1_id:
+                # Команда 2 проходит дальше автоматически
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.bracket_matches
+                    (bracket_id, round, match_number, team1_id, team2_id, winner_id, status, created_at, updated_at)
+                    VALUES ({bracket_id}, 1, {match_number}, NULL, {team2_id}, {team2_id}, 'walkover', NOW(), NOW())
+                """)
+            else:
+                # Обычный матч (может быть NULL vs NULL или team vs team)
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.bracket_matches
+                    (bracket_id, round, match_number, team1_id, team2_id, status, created_at, updated_at)
+                    VALUES ({bracket_id}, 1, {match_number}, {'NULL' if not team1_id else team1_id}, {'NULL' if not team2_id else team2_id}, 'pending', NOW(), NOW())
+                """)
+            
+            match_number += 1
+        
+        # Создаем пустые матчи для следующих раундов
+        for round_num in range(2, rounds + 1):
+            matches_in_round = max_teams // (2 ** round_num)
+            for match_num in range(1, matches_in_round + 1):
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.bracket_matches
+                    (bracket_id, round, match_number, status, created_at, updated_at)
+                    VALUES ({bracket_id}, {round_num}, {match_num}, 'pending', NOW(), NOW())
+                """)
+        
+        conn.commit()
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({
+                'success': True,
+                'bracket_id': bracket_id,
+                'total_teams': len(teams),
+                'max_teams': max_teams,
+                'rounds': rounds,
+                'message': f'Турнирная сетка создана для {len(teams)} из {max_teams} команд'
+            }),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка генерации сетки: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def fetch_bracket(cur, tournament_id: int):
+    """
+    Сетка турнира со всеми матчами.
+
+    Returns:
+        dict: {'bracket_id', 'format', 'style', 'matches'} или None, если сетки нет
+    """
+    cur.execute("""
+        SELECT tb.id, tb.format, tb.style, t.bracket_style as tournament_bracket_style
+        FROM t_p4831367_esport_gta_disaster.tournament_brackets tb
+        LEFT JOIN t_p4831367_esport_gta_disaster.tournaments t ON tb.tournament_id = t.id
+        WHERE tb.tournament_id = %s
+    """, (tournament_id,))
+    bracket_data = cur.fetchone()
+    
+    if not bracket_data:
+        return None
+    
+    cur.execute("""
+        SELECT 
+            bm.id, bm.round, bm.match_number,
+            bm.team1_id, t1.name as team1_name, t1.logo_url as team1_logo_url,
+            bm.team2_id, t2.name as team2_name, t2.logo_url as team2_logo_url,
+            bm.winner_id, tw.name as winner_name,
+            bm.team1_score, bm.team2_score,
+            bm.status, bm.scheduled_at,
+            bm.team1_captain_confirmed as team1_confirmed,
+            bm.team2_captain_confirmed as team2_confirmed,
+            bm.moderator_verified, bm.map_name
+        FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+        LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
+        LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
+        LEFT JOIN t_p4831367_esport_gta_disaster.teams tw ON bm.winner_id = tw.id
+        WHERE bm.bracket_id = %s
+        ORDER BY bm.round, bm.match_number
+    """, (bracket_data['id'],))
+    
+    return {
+        'bracket_id': bracket_data['id'],
+        'format': bracket_data['format'],
+        'style': bracket_data.get('tournament_bracket_style') or bracket_data.get('style', 'esports'),
+        'matches': cur.fetchall()
+    }
+
+def get_bracket(cur, conn, body: dict) -> dict:
+    """Получает турнирную сетку"""
+    tournament_id = body.get('tournament_id')
+    
+    if not tournament_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'tournament_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    archive = load_tournament_archive(cur, int(tournament_id))
+    bracket = archive['bracket'] if archive else fetch_bracket(cur, int(tournament_id))
+    
+    if not bracket:
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'bracket': None, 'message': 'Сетка еще не создана'}),
+            'isBase64Encoded': False
+        }
+    
+    # Клиенты могут дальше читать статический снимок из CDN, не вызывая get_bracket
+    return json_response(dict(bracket, snapshot=fetch_bracket_snapshot(cur, int(tournament_id))))
+
+def update_match_score(cur, conn, admin_id: str, body: dict) -> dict:
+    """Обновляет счет матча"""
+    match_id = body.get('match_id')
+    team1_score = body.get('team1_score')
+    team2_score = body.get('team2_score')
+    
+    if not match_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'match_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    # Определяем победителя
+    winner_id = None
+    if team1_score is not None and team2_score is not None:
+        cur.execute(f"""
+            SELECT team1_id, team2_id FROM t_p4831367_esport_gta_disaster.bracket_matches
+            WHERE id = {match_id}
+        """)
+        teams = cur.fetchone()
+        if teams:
+            winner_id = teams['team1_id'] if team1_score > team2_score else teams['team2_id'] if team2_score > team1_score else None
+    
+    # Обновляем матч
+    winner_sql = f", winner_id = {winner_id}" if winner_id else ""
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+        SET team1_score = {team1_score if team1_score is not None else 'NULL'},
+            team2_score = {team2_score if team2_score is not None else 'NULL'},
+            moderator_verified = TRUE,
+            updated_at = NOW()
+            {winner_sql}
+        WHERE id = {match_id}
+    """)
+    # Итоговые карты судьи больше не соответствуют записанному счету серии
+    clear_map_scores(cur, int(match_id), ('final',))
+    
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Счет обновлен'}),
+        'isBase64Encoded': False
+    }
+
+def complete_match(cur, conn, admin_id: str, body: dict) -> dict:
+    """Завершает матч и продвигает победителя в следующий раунд"""
+    match_id = body.get('match_id')
+    
+    if not match_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'match_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    # Получаем данные матча
+    cur.execute(f"""
+        SELECT bracket_id, round, match_number, winner_id, team1_score, team2_score
+        FROM t_p4831367_esport_gta_disaster.bracket_matches
+        WHERE id = {match_id}
+    """)
+    match_data = cur.fetchone()
+    
+    if not match_data:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Матч не найден'}),
+            'isBase64Encoded': False
+        }
+    
+    bracket_id = match_data['bracket_id']
+    current_round = match_data['round']
+    match_number = match_data['match_number']
+    winner_id = match_data['winner_id']
+    team1_score = match_data['team1_score']
+    team2_score = match_data['team2_score']
+    
+    if not winner_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Не определен победитель матча'}),
+            'isBase64Encoded': False
+        }
+    
+    # Обновляем статус матча
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+        SET status = 'completed', completed_at = NOW(), updated_at = NOW()
+        WHERE id = {match_id}
+    """)
+    
+    # Продвигаем победителя в следующий раунд
+    next_round = current_round + 1
+    next_match_number = (match_number + 1) // 2
+    
+    # Определяем, какая позиция в следующем матче (team1 или team2)
+    is_team1 = (match_number % 2 == 1)
+    team_column = 'team1_id' if is_team1 else 'team2_id'
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+        SET {team_column} = {winner_id}, updated_at = NOW()
+        WHERE bracket_id = {bracket_id} 
+        AND round = {next_round} 
+        AND match_number = {next_match_number}
+    """)
+    
+    conn.commit()
+    
+    # Отправляем уведомления игрокам обеих команд о завершении матча
+    try:
+        cur.execute(f"""
+            SELECT bm.team1_id, bm.team2_id, bm.winner_id,
+                   t1.name as team1_name, t2.name as team2_name,
+                   tw.name as winner_name,
+                   tour.name as tournament_name, tour.id as tournament_id
+            FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams tw ON bm.winner_id = tw.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournaments tour ON tb.tournament_id = tour.id
+            WHERE bm.id = {match_id}
+        """)
+        match_info = cur.fetchone()
+        
+        if match_info:
+            team1_id = match_info['team1_id']
+            team2_id = match_info['team2_id']
+            winner_name = match_info['winner_name']
+            tournament_name = match_info['tournament_name']
+            tournament_id = match_info['tournament_id']
+            
+            # Получаем игроков обеих команд
+            all_members = []
+            if team1_id:
+                cur.execute(f"SELECT user_id FROM t_p4831367_esport_gta_disaster.team_members WHERE team_id = {team1_id} AND status = 'active'")
+                all_members.extend([row['user_id'] for row in cur.fetchall()])
+            if team2_id:
+                cur.execute(f"SELECT user_id FROM t_p4831367_esport_gta_disaster.team_members WHERE team_id = {team2_id} AND status = 'active'")
+                all_members.extend([row['user_id'] for row in cur.fetchall()])
+            
+            # Отправляем уведомления
+            for user_id in all_members:
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+                    (user_id, type, title, message, link, read, created_at)
+                    VALUES (
+                        {user_id},
+                        'match_result',
+                        'Матч завершен',
+                        'Матч в турнире "{escape_sql(tournament_name)}" завершен. Победитель: {escape_sql(winner_name)}',
+                        '/tournaments/{tournament_id}/bracket',
+                        false,
+                        NOW()
+                    )
+                """)
+            conn.commit()
+    except Exception as e:
+        # Если уведомления не отправились - не критично, матч уже завершен
+        log.warning('failed to send notifications: %s', e)
+    
+    award_match_achievements(cur, conn, int(match_id))
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({
+            'success': True,
+            'message': 'Матч завершен, победитель продвинут в следующий раунд'
+        }),
+        'isBase64Encoded': False
+    }
+
+def notify_match_start(cur, conn, admin_id: str, body: dict) -> dict:
+    """Отправляет уведомления всем игрокам команд о начале матча"""
+    match_id = body.get('match_id')
+    tournament_id = body.get('tournament_id')
+    
+    if not match_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'match_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        # Получаем информацию о матче
+        cur.execute(f"""
+            SELECT bm.id, bm.team1_id, bm.team2_id, bm.scheduled_at,
+                   t1.name as team1_name, t2.name as team2_name,
+                   tr.name as tournament_name, tb.tournament_id
+            FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournaments tr ON tb.tournament_id = tr.id
+            WHERE bm.id = {match_id}
+        """)
+        
+        match_data = cur.fetchone()
+        
+        if not match_data:
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Матч не найден'}),
+                'isBase64Encoded': False
+            }
+        
+        team1_id = match_data['team1_id']
+        team2_id = match_data['team2_id']
+        team1_name = match_data['team1_name']
+        team2_name = match_data['team2_name']
+        tournament_name = match_data['tournament_name']
+        tournament_id_from_match = match_data['tournament_id']
+        
+        notifications = []
+        
+        # Получаем всех игроков команды 1
+        if team1_id:
+            cur.execute(f"""
+                SELECT user_id FROM t_p4831367_esport_gta_disaster.team_members
+                WHERE team_id = {team1_id} AND status = 'active'
+            """)
+            team1_members = [row['user_id'] for row in cur.fetchall()]
+            
+            # Создаем уведомления для каждого игрока команды 1
+            for user_id in team1_members:
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+                    (user_id, type, title, message, link, read, created_at)
+                    VALUES (
+                        {user_id},
+                        'match_start',
+                        'Матч скоро начнется!',
+                        'Ваша команда "{escape_sql(team1_name)}" играет против "{escape_sql(team2_name)}" в турнире "{escape_sql(tournament_name)}"',
+                        '/tournaments/{tournament_id_from_match}/bracket',
+                        false,
+                        NOW()
+                    )
+                """)
+                notifications.append(user_id)
+        
+        # Получаем всех игроков команды 2
+        if team2_id:
+            cur.execute(f"""
+                SELECT user_id FROM t_p4831367_esport_gta_disaster.team_members
+                WHERE team_id = {team2_id} AND status = 'active'
+            """)
+            team2_members = [row['user_id'] for row in cur.fetchall()]
+            
+            # Создаем уведомления для каждого игрока команды 2
+            for user_id in team2_members:
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+                    (user_id, type, title, message, link, read, created_at)
+                    VALUES (
+                        {user_id},
+                        'match_start',
+                        'Матч скоро начнется!',
+                        'Ваша команда "{escape_sql(team2_name)}" играет против "{escape_sql(team1_name)}" в турнире "{escape_sql(tournament_name)}"',
+                        '/tournaments/{tournament_id_from_match}/bracket',
+                        false,
+                        NOW()
+                    )
+                """)
+                notifications.append(user_id)
+        
+        conn.commit()
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({
+                'success': True,
+                'message': f'Уведомления отправлены {len(notifications)} игрокам',
+                'notified_users': notifications
+            }),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка отправки уведомлений: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def notify_round_start(cur, conn, admin_id: str, body: dict) -> dict:
+    """
+    Уведомляет игроков всех матчей раунда о начале за постоянное число запросов.
+
+    body: {
+        'tournament_id': 1,
+        'round': 2,
+        'start_at': '2024-05-01T18:00:00',  # необязательно: назначить scheduled_at
+        'interval_minutes': 30               # шаг между матчами раунда (по умолчанию 0)
+    }
+
+    Матчи без одной из команд и уже сыгранные пропускаются.
+    """
+    tournament_id = body.get('tournament_id')
+    round_num = body.get('round')
+    start_at = body.get('start_at')
+    
+    if not tournament_id or not round_num:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'tournament_id и round обязательны'}),
+            'isBase64Encoded': False
+        }
+    
+    if start_at:
+        try:
+            start_at = datetime.fromisoformat(str(start_at).replace('Z', '+00:00'))
+            interval_minutes = int(body.get('interval_minutes') or 0)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Некорректные start_at или interval_minutes'}),
+                'isBase64Encoded': False
+            }
+    
+    try:
+        schedule = []
+        if start_at:
+            # Время матча: start_at + (номер среди предстоящих матчей раунда - 1) * interval_minutes.
+            # Сыгранные матчи и матчи без обеих команд не переносятся
+            cur.execute("""
+                UPDATE t_p4831367_esport_gta_disaster.bracket_matches bm
+                SET scheduled_at = %s + (slot.position - 1) * make_interval(mins => %s),
+                    updated_at = NOW()
+                FROM (
+                    SELECT m.id, ROW_NUMBER() OVER (ORDER BY m.match_number) as position
+                    FROM t_p4831367_esport_gta_disaster.bracket_matches m
+                    JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON m.bracket_id = tb.id
+                    WHERE tb.tournament_id = %s AND m.round = %s
+                    AND m.status NOT IN ('completed', 'walkover')
+                    AND m.team1_id IS NOT NULL
+                    AND m.team2_id IS NOT NULL
+                ) slot
+                WHERE bm.id = slot.id
+                RETURNING bm.id as match_id, bm.bracket_id, bm.match_number, bm.scheduled_at
+            """, (start_at, interval_minutes, int(tournament_id), int(round_num)))
+            schedule = sorted(cur.fetchall(), key=lambda row: row['match_number'])
+        
+        # Составы всех матчей раунда и уведомления одной вставкой
+        cur.execute("""
+            INSERT INTO t_p4831367_esport_gta_disaster.notifications
+            (user_id, type, title, message, link, read, created_at)
+            SELECT tm.user_id,
+                   'match_start',
+                   'Матч скоро начнется!',
+                   'Ваша команда "' || own.name || '" играет против "' || opp.name || '" в турнире "' || tr.name || '"',
+                   '/tournaments/' || tr.id || '/bracket',
+                   false,
+                   NOW()
+            FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+            JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+            JOIN t_p4831367_esport_gta_disaster.tournaments tr ON tb.tournament_id = tr.id
+            CROSS JOIN LATERAL (VALUES (bm.team1_id, bm.team2_id), (bm.team2_id, bm.team1_id)) side(team_id, opponent_id)
+            JOIN t_p4831367_esport_gta_disaster.teams own ON own.id = side.team_id
+            JOIN t_p4831367_esport_gta_disaster.teams opp ON opp.id = side.opponent_id
+            JOIN t_p4831367_esport_gta_disaster.team_members tm ON tm.team_id = side.team_id AND tm.status = 'active'
+            WHERE tb.tournament_id = %s
+            AND bm.round = %s
+            AND bm.status NOT IN ('completed', 'walkover')
+            RETURNING user_id
+        """, (int(tournament_id), int(round_num)))
+        notified_users = [row['user_id'] for row in cur.fetchall()]
+        
+        conn.commit()
+        
+        log.info('round %s of tournament %s: %s notifications, %s matches scheduled',
+                 round_num, tournament_id, len(notified_users), len(schedule))
+        
+        return json_response({
+            'success': True,
+            'message': f'Уведомления отправлены {len(notified_users)} игрокам',
+            'notified_users': notified_users,
+            'schedule': [
+                {'match_id': row['match_id'], 'match_number': row['match_number'], 'scheduled_at': row['scheduled_at']}
+                for row in schedule
+            ]
+        })
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка отправки уведомлений: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def fetch_group_stage(cur, tournament_id: int) -> dict:
+    """
+    Команды, матчи и турнирные таблицы групповой стадии.
+
+    Returns:
+        dict: {'teams', 'matches', 'standings'}
+    """
+    # Получаем все команды турнира
+    cur.execute("""
+        SELECT tr.team_id, t.name, t.logo_url
+        FROM t_p4831367_esport_gta_disaster.tournament_registrations tr
+        JOIN t_p4831367_esport_gta_disaster.teams t ON tr.team_id = t.id
+        WHERE tr.tournament_id = %s
+        AND (tr.status = 'approved' OR tr.status = 'confirmed')
+        ORDER BY tr.registered_at
+    """, (tournament_id,))
+    teams = cur.fetchall()
+    
+    # Получаем матчи групповой стадии
+    cur.execute("""
+        SELECT id, group_name, team1_id, team2_id, team1_score, team2_score, played
+        FROM t_p4831367_esport_gta_disaster.group_stage_matches
+        WHERE tournament_id = %s
+        ORDER BY group_name, id
+    """, (tournament_id,))
+    matches = cur.fetchall()
+    
+    # Вычисляем турнирную таблицу для каждой группы
+    standings = {}
+    groups = ['A', 'B', 'C', 'D']
+    
+    for group in groups:
+        group_matches = [m for m in matches if m['group_name'] == group]
+        team_stats = {}
+        
+        # Инициализируем статистику для всех команд группы
+        for match in group_matches:
+            for team_id in [match['team1_id'], match['team2_id']]:
+                if team_id not in team_stats:
+                    team_name = next((t['name'] for t in teams if t['team_id'] == team_id), 'Unknown')
+                    team_stats[team_id] = {
+                        'team_id': team_id,
+                        'team_name': team_name,
+                        'matches_played': 0,
+                        'wins': 0,
+                        'draws': 0,
+                        'losses': 0,
+                        'goals_for': 0,
+                        'goals_against': 0,
+                        'goal_difference': 0,
+                        'points': 0
+                    }
+        
+        # Обрабатываем сыгранные матчи
+        for match in group_matches:
+            if match['played']:
+                team1_id = match['team1_id']
+                team2_id = match['team2_id']
+                score1 = match['team1_score']
+                score2 = match['team2_score']
+                
+                # Обновляем статистику
+                team_stats[team1_id]['matches_played'] += 1
+                team_stats[team2_id]['matches_played'] += 1
+                
+                team_stats[team1_id]['goals_for'] += score1
+                team_stats[team1_id]['goals_against'] += score2
+                team_stats[team2_id]['goals_for'] += score2
+                team_stats[team2_id]['goals_against'] += score1
+                
+                if score1 > score2:
+                    team_stats[team1_id]['wins'] += 1
+                    team_stats[team1_id]['points'] += 3
+                    team_stats[team2_id]['losses'] += 1
+                elif score2 > score1:
+                    team_stats[team2_id]['wins'] += 1
+                    team_stats[team2_id]['points'] += 3
+                    team_stats[team1_id]['losses'] += 1
+                else:
+                    team_stats[team1_id]['draws'] += 1
+                    team_stats[team2_id]['draws'] += 1
+                    team_stats[team1_id]['points'] += 1
+                    team_stats[team2_id]['points'] += 1
+        
+        # Вычисляем разницу мячей и сортируем
+        for stats in team_stats.values():
+            stats['goal_difference'] = stats['goals_for'] - stats['goals_against']
+        
+        standings[group] = sorted(
+            team_stats.values(),
+            key=lambda x: (x['points'], x['goal_difference'], x['goals_for']),
+            reverse=True
+        )
+    
+    return {
+        'teams': teams,
+        'matches': matches,
+        'standings': standings
+    }
+
+def get_group_stage(cur, conn, body: dict) -> dict:
+    """Получает данные групповой стадии турнира"""
+    tournament_id = body.get('tournament_id')
+    
+    if not tournament_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'tournament_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        archive = load_tournament_archive(cur, int(tournament_id))
+        if archive:
+            return json_response(archive['group_stage'])
+        return json_response(fetch_group_stage(cur, int(tournament_id)))
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка получения групповой стадии: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def create_group_stage(cur, conn, admin_id: str, body: dict) -> dict:
+    """Создает групповую стадию для турнира"""
+    tournament_id = body.get('tournament_id')
+    
+    if not tournament_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'tournament_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        # Получаем команды
+        cur.execute(f"""
+            SELECT tr.team_id, t.name
+            FROM t_p4831367_esport_gta_disaster.tournament_registrations tr
+            JOIN t_p4831367_esport_gta_disaster.teams t ON tr.team_id = t.id
+            WHERE tr.tournament_id = {tournament_id} 
+            AND (tr.status = 'approved' OR tr.status = 'confirmed')
+            ORDER BY RANDOM()
+        """)
+        teams = cur.fetchall()
+        
+        if len(teams) < 16:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': f'Недостаточно команд для групповой стадии. Нужно минимум 16, есть {len(teams)}'}),
+                'isBase64Encoded': False
+            }
+        
+        # Удаляем старые матчи групповой стадии если есть
+        cur.execute(f"""
+            DELETE FROM t_p4831367_esport_gta_disaster.group_stage_matches
+            WHERE tournament_id = {tournament_id}
+        """)
+        
+        # Разбиваем команды на 4 группы по 4 команды
+        groups = {'A': [], 'B': [], 'C': [], 'D': []}
+        group_names = ['A', 'B', 'C', 'D']
+        
+        for i, team in enumerate(teams[:16]):
+            group_name = group_names[i % 4]
+            groups[group_name].append(team['team_id'])
+        
+        # Создаем матчи для каждой группы (каждый с каждым)
+        for group_name, team_ids in groups.items():
+            for i in range(len(team_ids)):
+                for j in range(i + 1, len(team_ids)):
+                    cur.execute(f"""
+                        INSERT INTO t_p4831367_esport_gta_disaster.group_stage_matches
+                        (tournament_id, group_name, team1_id, team2_id, team1_score, team2_score, played, created_at)
+                        VALUES ({tournament_id}, '{group_name}', {team_ids[i]}, {team_ids[j]}, 0, 0, false, NOW())
+                    """)
+        
+        conn.commit()
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({
+                'success': True,
+                'message': 'Групповая стадия создана',
+                'groups': {name: len(team_ids) for name, team_ids in groups.items()}
+            }),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка создания групповой стадии: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def update_group_match(cur, conn, admin_id: str, body: dict) -> dict:
+    """Обновляет результат матча групповой стадии"""
+    tournament_id = body.get('tournament_id')
+    match_id = body.get('match_id')
+    team1_score = body.get('team1_score', 0)
+    team2_score = body.get('team2_score', 0)
+    played = body.get('played', False)
+    
+    if not tournament_id or not match_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'tournament_id и match_id обязательны'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        cur.execute(f"""
+            UPDATE t_p4831367_esport_gta_disaster.group_stage_matches
+            SET team1_score = {team1_score}, team2_score = {team2_score}, played = {played}, updated_at = NOW()
+            WHERE id = {match_id} AND tournament_id = {tournament_id}
+        """)
+        
+        conn.commit()
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({
+                'success': True,
+                'message': 'Результат матча обновлен'
+            }),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка обновления матча: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def finalize_group_stage(cur, conn, admin_id: str, body: dict) -> dict:
+    """Завершает групповую стадию и переводит топ-2 команды в плей-офф"""
+    tournament_id = body.get('tournament_id')
+    
+    if not tournament_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'tournament_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        # Получаем все матчи групповой стадии
+        cur.execute(f"""
+            SELECT id, group_name, team1_id, team2_id, team1_score, team2_score, played
+            FROM t_p4831367_esport_gta_disaster.group_stage_matches
+            WHERE tournament_id = {tournament_id}
+            ORDER BY group_name, id
+        """)
+        matches = [dict(row) for row in cur.fetchall()]
+        
+        # Получаем команды
+        cur.execute(f"""
+            SELECT tr.team_id, t.name
+            FROM t_p4831367_esport_gta_disaster.tournament_registrations tr
+            JOIN t_p4831367_esport_gta_disaster.teams t ON tr.team_id = t.id
+            WHERE tr.tournament_id = {tournament_id} 
+            AND (tr.status = 'approved' OR tr.status = 'confirmed')
+        """)
+        teams = {row['team_id']: row['name'] for row in cur.fetchall()}
+        
+        # Вычисляем таблицу для каждой группы
+        groups = ['A', 'B', 'C', 'D']
+        qualified_teams = []
+        
+        for group in groups:
+            group_matches = [m for m in matches if m['group_name'] == group]
+            team_stats = {}
+            
+            # Инициализируем статистику
+            for match in group_matches:
+                for team_id in [match['team1_id'], match['team2_id']]:
+                    if team_id not in team_stats:
+                        team_stats[team_id] = {
+                            'team_id': team_id,
+                            'points': 0,
+                            'goal_difference': 0,
+                            'goals_for': 0
+                        }
+            
+            # Считаем статистику
+            for match in group_matches:
+                if match['played']:
+                    team1_id = match['team1_id']
+                    team2_id = match['team2_id']
+                    score1 = match['team1_score']
+                    score2 = match['team2_score']
+                    
+                    team_stats[team1_id]['goals_for'] += score1
+                    team_stats[team1_id]['goal_difference'] += (score1 - score2)
+                    team_stats[team2_id]['goals_for'] += score2
+                    team_stats[team2_id]['goal_difference'] += (score2 - score1)
+                    
+                    if score1 > score2:
+                        team_stats[team1_id]['points'] += 3
+                    elif score2 > score1:
+                        team_stats[team2_id]['points'] += 3
+                    else:
+                        team_stats[team1_id]['points'] += 1
+                        team_stats[team2_id]['points'] += 1
+            
+            # Сортируем и берем топ-2
+            sorted_teams = sorted(
+                team_stats.values(),
+                key=lambda x: (x['points'], x['goal_difference'], x['goals_for']),
+                reverse=True
+            )
+            
+            qualified_teams.extend([t['team_id'] for t in sorted_teams[:2]])
+        
+        if len(qualified_teams) != 8:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': f'Недостаточно данных для формирования плей-офф. Получено {len(qualified_teams)} команд, нужно 8'}),
+                'isBase64Encoded': False
+            }
+        
+        # Проверяем наличие bracket
+        cur.execute(f"""
+            SELECT id FROM t_p4831367_esport_gta_disaster.tournament_brackets
+            WHERE tournament_id = {tournament_id}
+        """)
+        bracket = cur.fetchone()
+        
+        if not bracket:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Сначала создайте турнирную сетку'}),
+                'isBase64Encoded': False
+            }
+        
+        bracket_id = bracket['id']
+        
+        # Удаляем старые матчи плей-офф
+        cur.execute(f"""
+            DELETE FROM t_p4831367_esport_gta_disaster.bracket_matches
+            WHERE bracket_id = {bracket_id}
+        """)
+        
+        # Создаем матчи 1/4 финала (8 команд -> 4 матча)
+        # Сетка: A1-B2, C1-D2, B1-A2, D1-C2
+        pairs = [
+            (qualified_teams[0], qualified_teams[3]),  # A1 vs B2
+            (qualified_teams[4], qualified_teams[7]),  # C1 vs D2
+            (qualified_teams[2], qualified_teams[1]),  # B1 vs A2
+            (qualified_teams[6], qualified_teams[5])   # D1 vs C2
+        ]
+        
+        for i, (team1_id, team2_id) in enumerate(pairs, 1):
+            cur.execute(f"""
+                INSERT INTO t_p4831367_esport_gta_disaster.bracket_matches
+                (bracket_id, round, match_number, team1_id, team2_id, status, created_at, updated_at)
+                VALUES ({bracket_id}, 1, {i}, {team1_id}, {team2_id}, 'pending', NOW(), NOW())
+            """)
+        
+        # Создаем пустые матчи для 1/2 финала (2 матча)
+        for i in range(1, 3):
+            cur.execute(f"""
+                INSERT INTO t_p4831367_esport_gta_disaster.bracket_matches
+                (bracket_id, round, match_number, status, created_at, updated_at)
+                VALUES ({bracket_id}, 2, {i}, 'pending', NOW(), NOW())
+            """)
+        
+        # Создаем финал (1 матч)
+        cur.execute(f"""
+            INSERT INTO t_p4831367_esport_gta_disaster.bracket_matches
+            (bracket_id, round, match_number, status, created_at, updated_at)
+            VALUES ({bracket_id}, 3, 1, 'pending', NOW(), NOW())
+        """)
+        
+        conn.commit()
+        
+        qualified_names = [teams.get(tid, 'Unknown') for tid in qualified_teams]
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({
+                'success': True,
+                'message': 'Групповая стадия завершена, команды переведены в плей-офф',
+                'qualified_teams': qualified_names
+            }),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка завершения групповой стадии: {str(e)}'}),
+            'isBase64Encoded': False
+        }
@@ -0,0 +1,23 @@
+from app_logging import get_logger
+
+log = get_logger('admin-actions.common')
+
+def escape_sql(value):
+    """Escape single quotes in SQL strings by doubling them"""
+    if value is None:
+        return 'NULL'
+    return str(value).replace("'", "''")
+
+def log_admin_action(cur, conn, admin_id: str, action_type: str, description: str, target_type: str = None, target_id: int = None):
+    """Логирование действий администраторов"""
+    try:
+        cur.execute(f"""
+            INSERT INTO t_p4831367_esport_gta_disaster.admin_action_logs
+            (admin_id, action_type, action_description, target_type, target_id, created_at)
+            VALUES ({int(admin_id)}, '{escape_sql(action_type)}', '{escape_sql(description)}', 
+                    {'NULL' if not target_type else f"'{escape_sql(target_type)}'"}, 
+                    {'NULL' if not target_id else int(target_id)}, NOW())
+        """)
+        conn.commit()
+    except Exception as e:
+        log.error('logging admin action failed: %s', e)
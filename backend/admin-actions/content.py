@@ -0,0 +1,438 @@
+from app_logging import get_logger
+from common import escape_sql, log_admin_action
+from responses import dumps
+
+log = get_logger('admin-actions.content')
+
+def create_news(cur, conn, admin_id: str, body: dict, admin_role: str) -> dict:
+    """Создает новость"""
+    
+    if admin_role not in ['admin', 'founder']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недостаточно прав для создания новостей'}),
+            'isBase64Encoded': False
+        }
+    
+    title = body.get('title')
+    content = body.get('content')
+    image_url = body.get('image_url')
+    published = body.get('published', False)
+    
+    if not title or not content:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Заполните заголовок и содержание'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        cur.execute("""
+            INSERT INTO t_p4831367_esport_gta_disaster.news 
+            (title, content, image_url, author_id, published, created_at, updated_at)
+            VALUES (%s, %s, %s, %s, %s, NOW(), NOW())
+            RETURNING id
+        """, (title, content, image_url, int(admin_id), published))
+        
+        result = cur.fetchone()
+        news_id = result['id'] if result else None
+        conn.commit()
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'message': 'Новость создана', 'news_id': news_id}),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка создания новости: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def update_news(cur, conn, admin_id: str, body: dict, admin_role: str) -> dict:
+    """Обновляет новость"""
+    
+    if admin_role not in ['admin', 'founder']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недостаточно прав для редактирования новостей'}),
+            'isBase64Encoded': False
+        }
+    
+    news_id = body.get('news_id')
+    title = body.get('title')
+    content = body.get('content')
+    image_url = body.get('image_url')
+    published = body.get('published')
+    
+    update_fields = []
+    params = []
+    
+    if title is not None:
+        update_fields.append("title = %s")
+        params.append(title)
+    if content is not None:
+        update_fields.append("content = %s")
+        params.append(content)
+    if image_url is not None:
+        update_fields.append("image_url = %s")
+        params.append(image_url)
+    if published is not None:
+        update_fields.append("published = %s")
+        params.append(published)
+    
+    if not update_fields:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Нет данных для обновления'}),
+            'isBase64Encoded': False
+        }
+    
+    update_fields.append("updated_at = NOW()")
+    params.append(int(news_id))
+    
+    # Получаем заголовок новости для логирования
+    cur.execute("SELECT title FROM t_p4831367_esport_gta_disaster.news WHERE id = %s", (int(news_id),))
+    news_title_row = cur.fetchone()
+    news_title = news_title_row['title'] if news_title_row else 'Unknown'
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.news
+        SET {', '.join(update_fields)}
+        WHERE id = %s
+    """, tuple(params))
+    conn.commit()
+    
+    # Логируем обновление новости
+    log_admin_action(cur, conn, admin_id, 'news_update', 
+                     f"Обновил новость '{news_title}'", 'news', int(news_id))
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Новость обновлена'}),
+        'isBase64Encoded': False
+    }
+
+def delete_news(cur, conn, admin_id: str, body: dict, admin_role: str) -> dict:
+    """Удаляет новость"""
+    
+    log.debug('delete_news called: admin_id=%s, admin_role=%s', admin_id, admin_role)
+    log.debug('body: %s', body)
+    
+    if admin_role not in ['admin', 'founder']:
+        log.debug('ROLE CHECK FAILED: %s', admin_role)
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недостаточно прав для удаления новостей'}),
+            'isBase64Encoded': False
+        }
+    
+    news_id = body.get('news_id')
+    log.debug('Deleting news_id: %s', news_id)
+    
+    try:
+        # Получаем заголовок новости для логирования
+        cur.execute(f"SELECT title FROM t_p4831367_esport_gta_disaster.news WHERE id = {int(news_id)}")
+        news_title_row = cur.fetchone()
+        news_title = news_title_row['title'] if news_title_row else 'Unknown'
+        
+        cur.execute(f"""
+            DELETE FROM t_p4831367_esport_gta_disaster.news WHERE id = {int(news_id)}
+        """)
+        conn.commit()
+        
+        # Логируем удаление новости
+        log_admin_action(cur, conn, admin_id, 'news_delete', 
+                         f"Удалил новость '{news_title}'", 'news', int(news_id))
+        log.debug('News deleted successfully')
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'message': 'Новость удалена'}),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        log.exception('delete_news failed: %s', e)
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': str(e)}),
+            'isBase64Encoded': False
+        }
+
+def get_news(cur, conn, body: dict) -> dict:
+    """Получает новости"""
+    
+    limit = int(body.get('limit', 50))
+    offset = int(body.get('offset', 0))
+    include_unpublished = body.get('include_unpublished', False)
+    
+    log.debug('get_news: limit=%s, offset=%s, include_unpublished=%s', limit, offset, include_unpublished)
+    
+    try:
+        if include_unpublished:
+            query = f"""
+                SELECT id, title, content, image_url, author_id, published, pinned, created_at, updated_at
+                FROM t_p4831367_esport_gta_disaster.news
+                ORDER BY pinned DESC, created_at DESC
+                LIMIT {limit} OFFSET {offset}
+            """
+        else:
+            query = f"""
+                SELECT id, title, content, image_url, author_id, published, pinned, created_at, updated_at
+                FROM t_p4831367_esport_gta_disaster.news
+                WHERE published = TRUE
+                ORDER BY pinned DESC, created_at DESC
+                LIMIT {limit} OFFSET {offset}
+            """
+        
+        log.debug('get_news query: %s', query)
+        cur.execute(query)
+        log.debug('Query executed successfully')
+    except Exception as e:
+        log.exception('get_news query failed: %s', e)
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': str(e)}),
+            'isBase64Encoded': False
+        }
+    
+    news_list = []
+    for row in cur.fetchall():
+        news_list.append({
+            'id': row['id'],
+            'title': row['title'],
+            'content': row['content'],
+            'image_url': row['image_url'],
+            'author_id': row['author_id'],
+            'author_name': 'Администратор',
+            'published': row['published'] if row['published'] is not None else False,
+            'pinned': row['pinned'] if row['pinned'] is not None else False,
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+            'updated_at': row['updated_at'].isoformat() if row['updated_at'] else None
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'news': news_list}, ensure_ascii=False),
+        'isBase64Encoded': False
+    }
+
+def create_news_with_image(cur, conn, admin_id: str, body: dict, admin_role: str) -> dict:
+    """Создает новость с изображением"""
+    
+    if admin_role not in ['admin', 'founder']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недостаточно прав для создания новостей'}),
+            'isBase64Encoded': False
+        }
+    
+    title = body.get('title')
+    content = body.get('content')
+    category = body.get('category', 'general')
+    image_url = body.get('image_url')
+    
+    cur.execute(f"""
+        INSERT INTO t_p4831367_esport_gta_disaster.news (title, content, category, author_id, image_url)
+        VALUES ('{escape_sql(title)}', '{escape_sql(content)}', '{escape_sql(category)}', '{escape_sql(admin_id)}', '{escape_sql(image_url)}')
+        RETURNING id
+    """)
+    
+    news_id = cur.fetchone()[0]
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Новость создана', 'news_id': news_id}),
+        'isBase64Encoded': False
+    }
+
+def create_rule(cur, conn, admin_id: str, body: dict, admin_role: str) -> dict:
+    """Создает правило"""
+    
+    if admin_role not in ['admin', 'founder']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недостаточно прав для создания правил'}),
+            'isBase64Encoded': False
+        }
+    
+    title = body.get('title')
+    content = body.get('content')
+    category = body.get('category', 'general')
+    
+    cur.execute(f"""
+        INSERT INTO t_p4831367_esport_gta_disaster.rules (title, content, category, created_by)
+        VALUES ('{escape_sql(title)}', '{escape_sql(content)}', '{escape_sql(category)}', '{escape_sql(admin_id)}')
+        RETURNING id
+    """)
+    
+    rule_id = cur.fetchone()['id']
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Правило создано', 'rule_id': rule_id}),
+        'isBase64Encoded': False
+    }
+
+def update_rule(cur, conn, admin_id: str, body: dict, admin_role: str) -> dict:
+    """Обновляет правило"""
+    
+    if admin_role not in ['admin', 'founder']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недостаточно прав для редактирования правил'}),
+            'isBase64Encoded': False
+        }
+    
+    rule_id = body.get('rule_id')
+    title = body.get('title')
+    content = body.get('content')
+    category = body.get('category')
+    
+    cur.execute(f"""
+        UPDATE rules
+        SET title = '{escape_sql(title)}', content = '{escape_sql(content)}', category = '{escape_sql(category)}'
+        WHERE id = {int(rule_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Правило обновлено'}),
+        'isBase64Encoded': False
+    }
+
+def delete_rule(cur, conn, admin_id: str, body: dict, admin_role: str) -> dict:
+    """Удаляет правило"""
+    
+    if admin_role not in ['admin', 'founder']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недостаточно прав для удаления правил'}),
+            'isBase64Encoded': False
+        }
+    
+    rule_id = body.get('rule_id')
+    
+    cur.execute(f"""
+        DELETE FROM t_p4831367_esport_gta_disaster.rules WHERE id = {int(rule_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Правило удалено'}),
+        'isBase64Encoded': False
+    }
+
+def get_rules(cur, conn) -> dict:
+    """Получает все правила"""
+    
+    cur.execute("""
+        SELECT id, title, content, category, created_by, created_at
+        FROM rules
+        ORDER BY created_at DESC
+    """)
+    
+    rules = []
+    for row in cur.fetchall():
+        rules.append({
+            'id': row['id'],
+            'title': row['title'],
+            'content': row['content'],
+            'category': row['category'],
+            'created_by': row['created_by'],
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'rules': rules}),
+        'isBase64Encoded': False
+    }
+
+def update_support(cur, conn, admin_id: str, body: dict, admin_role: str) -> dict:
+    """Обновляет информацию о поддержке"""
+    
+    if admin_role not in ['admin', 'founder']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недостаточно прав для редактирования поддержки'}),
+            'isBase64Encoded': False
+        }
+    
+    email = body.get('email')
+    discord = body.get('discord')
+    telegram = body.get('telegram')
+    
+    cur.execute(f"""
+        UPDATE support_info
+        SET email = '{escape_sql(email)}', discord = '{escape_sql(discord)}', telegram = '{escape_sql(telegram)}'
+        WHERE id = 1
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Информация о поддержке обновлена'}),
+        'isBase64Encoded': False
+    }
+
+def get_support(cur, conn) -> dict:
+    """Получает информацию о поддержке"""
+    
+    cur.execute("""
+        SELECT email, discord, telegram
+        FROM support_info
+        WHERE id = 1
+    """)
+    
+    row = cur.fetchone()
+    
+    if row:
+        support_info = {
+            'email': row['email'],
+            'discord': row['discord'],
+            'telegram': row['telegram']
+        }
+    else:
+        support_info = {
+            'email': '',
+            'discord': '',
+            'telegram': ''
+        }
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'support': support_info}),
+        'isBase64Encoded': False
+    }
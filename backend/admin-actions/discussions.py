@@ -0,0 +1,352 @@
+import os
+from app_logging import get_logger
+from common import escape_sql, log_admin_action
+from responses import dumps
+
+log = get_logger('admin-actions.discussions')
+
+def create_discussion(cur, conn, admin_id: str, admin_role: str, body: dict) -> dict:
+    """Создаёт новое обсуждение (только администраторы)"""
+    
+    if admin_role not in ['admin', 'founder', 'organizer']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недостаточно прав для создания обсуждений'}),
+            'isBase64Encoded': False
+        }
+    
+    title = body.get('title', '').strip()
+    content = body.get('content', '').strip()
+    
+    if not title or not content:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Укажите название и содержание обсуждения'}),
+            'isBase64Encoded': False
+        }
+    
+    cur.execute(f"""
+        INSERT INTO t_p4831367_esport_gta_disaster.discussions 
+        (title, content, author_id, created_at, is_locked, is_pinned)
+        VALUES ('{escape_sql(title)}', '{escape_sql(content)}', {int(admin_id)}, NOW(), FALSE, FALSE)
+        RETURNING id
+    """)
+    
+    discussion_id = cur.fetchone()[0]
+    conn.commit()
+    
+    log_admin_action(cur, conn, admin_id, 'create_discussion', f'Создано обсуждение: {title}', 'discussion', discussion_id)
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Обсуждение создано', 'discussion_id': discussion_id}),
+        'isBase64Encoded': False
+    }
+
+def add_comment(cur, conn, admin_id: str, admin_role: str, body: dict) -> dict:
+    """Добавляет комментарий к обсуждению"""
+    
+    discussion_id = body.get('discussion_id')
+    content = body.get('content', '').strip()
+    image_base64 = body.get('image_base64')
+    image_filename = body.get('image_filename')
+    
+    if not discussion_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Укажите discussion_id'}),
+            'isBase64Encoded': False
+        }
+    
+    if not content:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Комментарий не может быть пустым'}),
+            'isBase64Encoded': False
+        }
+    
+    # Проверяем, не заблокировано ли обсуждение
+    cur.execute(f"""
+        SELECT is_locked FROM t_p4831367_esport_gta_disaster.discussions 
+        WHERE id = {int(discussion_id)}
+    """)
+    
+    discussion = cur.fetchone()
+    
+    if not discussion:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Обсуждение не найдено'}),
+            'isBase64Encoded': False
+        }
+    
+    if discussion[0] and admin_role not in ['admin', 'founder']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Обсуждение заблокировано'}),
+            'isBase64Encoded': False
+        }
+    
+    # Загрузка изображения, если есть
+    image_url = None
+    if image_base64 and image_filename:
+        try:
+            import boto3
+            import base64
+            from datetime import datetime
+            
+            image_data = base64.b64decode(image_base64)
+            
+            s3 = boto3.client('s3',
+                endpoint_url='https://bucket.poehali.dev',
+                aws_access_key_id=os.environ['AWS_ACCESS_KEY_ID'],
+                aws_secret_access_key=os.environ['AWS_SECRET_ACCESS_KEY']
+            )
+            
+            timestamp = datetime.now().timestamp()
+            filename = f"discussion-comments/{discussion_id}/{timestamp}_{image_filename}"
+            
+            s3.put_object(
+                Bucket='files',
+                Key=filename,
+                Body=image_data,
+                ContentType='image/png' if image_filename.endswith('.png') else 'image/jpeg'
+            )
+            
+            image_url = f"https://cdn.poehali.dev/projects/{os.environ['AWS_ACCESS_KEY_ID']}/bucket/{filename}"
+        except Exception as e:
+            log.error('image upload failed: %s', e)
+    
+    # Добавляем комментарий
+    cur.execute(f"""
+        INSERT INTO t_p4831367_esport_gta_disaster.discussion_comments 
+        (discussion_id, author_id, content, image_url, created_at)
+        VALUES ({int(discussion_id)}, {int(admin_id)}, '{escape_sql(content)}', 
+                {'NULL' if not image_url else f"'{image_url}'"}, NOW())
+        RETURNING id
+    """)
+    
+    comment_id = cur.fetchone()[0]
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Комментарий добавлен', 'comment_id': comment_id}),
+        'isBase64Encoded': False
+    }
+
+def get_discussions(cur, conn) -> dict:
+    """Получает список обсуждений"""
+    
+    cur.execute("""
+        SELECT d.id, d.title, d.content, d.author_id, u.nickname, d.is_locked, d.is_pinned, d.created_at,
+            (SELECT COUNT(*) FROM t_p4831367_esport_gta_disaster.discussion_comments dc WHERE dc.discussion_id = d.id) as comments_count
+        FROM t_p4831367_esport_gta_disaster.discussions d
+        JOIN t_p4831367_esport_gta_disaster.users u ON d.author_id = u.id
+        ORDER BY d.is_pinned DESC, d.created_at DESC
+    """)
+    
+    discussions = []
+    for row in cur.fetchall():
+        discussions.append({
+            'id': row[0],
+            'title': row[1],
+            'content': row[2],
+            'author_id': row[3],
+            'author_nickname': row[4],
+            'is_locked': row[5],
+            'is_pinned': row[6],
+            'created_at': row[7].isoformat() if row[7] else None,
+            'comments_count': row[8]
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'discussions': discussions}),
+        'isBase64Encoded': False
+    }
+
+def get_discussion(cur, conn, body: dict) -> dict:
+    """Получает обсуждение с комментариями"""
+    
+    discussion_id = body.get('discussion_id')
+    
+    cur.execute(f"""
+        SELECT d.id, d.title, d.content, d.author_id, u.nickname, d.is_locked, d.is_pinned, d.created_at
+        FROM t_p4831367_esport_gta_disaster.discussions d
+        JOIN t_p4831367_esport_gta_disaster.users u ON d.author_id = u.id
+        WHERE d.id = {int(discussion_id)}
+    """)
+    
+    row = cur.fetchone()
+    
+    if not row:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Обсуждение не найдено'}),
+            'isBase64Encoded': False
+        }
+    
+    discussion = {
+        'id': row[0],
+        'title': row[1],
+        'content': row[2],
+        'author_id': row[3],
+        'author_nickname': row[4],
+        'is_locked': row[5],
+        'is_pinned': row[6],
+        'created_at': row[7].isoformat() if row[7] else None
+    }
+    
+    cur.execute(f"""
+        SELECT dc.id, dc.author_id, u.nickname, dc.content, dc.created_at, dc.image_url
+        FROM t_p4831367_esport_gta_disaster.discussion_comments dc
+        JOIN t_p4831367_esport_gta_disaster.users u ON dc.author_id = u.id
+        WHERE dc.discussion_id = {int(discussion_id)}
+        ORDER BY dc.created_at
+    """)
+    
+    comments = []
+    for row in cur.fetchall():
+        comments.append({
+            'id': row[0],
+            'author_id': row[1],
+            'author_nickname': row[2],
+            'content': row[3],
+            'created_at': row[4].isoformat() if row[4] else None,
+            'image_url': row[5]
+        })
+    
+    discussion['comments'] = comments
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'discussion': discussion}),
+        'isBase64Encoded': False
+    }
+
+def lock_discussion(cur, conn, body: dict) -> dict:
+    """Блокирует обсуждение"""
+    
+    discussion_id = body.get('discussion_id')
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.discussions
+        SET is_locked = TRUE
+        WHERE id = {int(discussion_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Обсуждение заблокировано'}),
+        'isBase64Encoded': False
+    }
+
+def unlock_discussion(cur, conn, body: dict) -> dict:
+    """Разблокирует обсуждение"""
+    
+    discussion_id = body.get('discussion_id')
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.discussions
+        SET is_locked = FALSE
+        WHERE id = {int(discussion_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Обсуждение разблокировано'}),
+        'isBase64Encoded': False
+    }
+
+def pin_discussion(cur, conn, body: dict) -> dict:
+    """Закрепляет обсуждение"""
+    
+    discussion_id = body.get('discussion_id')
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.discussions
+        SET is_pinned = TRUE
+        WHERE id = {int(discussion_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Обсуждение закреплено'}),
+        'isBase64Encoded': False
+    }
+
+def unpin_discussion(cur, conn, body: dict) -> dict:
+    """Открепляет обсуждение"""
+    
+    discussion_id = body.get('discussion_id')
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.discussions
+        SET is_pinned = FALSE
+        WHERE id = {int(discussion_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Обсуждение откреплено'}),
+        'isBase64Encoded': False
+    }
+
+def delete_discussion(cur, conn, body: dict) -> dict:
+    """Удаляет обсуждение"""
+    
+    discussion_id = body.get('discussion_id')
+    
+    cur.execute(f"""
+        DELETE FROM t_p4831367_esport_gta_disaster.discussions WHERE id = {int(discussion_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Обсуждение удалено'}),
+        'isBase64Encoded': False
+    }
+
+def edit_discussion(cur, conn, admin_id: str, body: dict) -> dict:
+    """Редактирует обсуждение"""
+    
+    discussion_id = body.get('discussion_id')
+    title = body.get('title')
+    content = body.get('content')
+    category = body.get('category')
+    
+    cur.execute(f"""
+        UPDATE discussions
+        SET title = '{escape_sql(title)}', content = '{escape_sql(content)}', category = '{escape_sql(category)}'
+        WHERE id = {int(discussion_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Обсуждение обновлено'}),
+        'isBase64Encoded': False
+    }
@@ -0,0 +1,40 @@
+import os
+from responses import dumps
+
+def run_partition_maintenance(cur, conn, event: dict) -> dict:
+    """Обслуживание секций журналов: новые секции и хранение (вызывается по расписанию)"""
+    headers = event.get('headers', {})
+    cron_secret = headers.get('X-Cron-Secret') or headers.get('x-cron-secret')
+    expected_secret = os.environ.get('CRON_SECRET')
+    
+    if not expected_secret or cron_secret != expected_secret:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Доступ запрещен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        cur.execute("SELECT * FROM t_p4831367_esport_gta_disaster.run_partition_maintenance()")
+        changes = [{
+            'table': row['out_table'],
+            'partition': row['out_partition'],
+            'action': row['out_action']
+        } for row in cur.fetchall()]
+        conn.commit()
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'changes': changes}),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка обслуживания секций: {str(e)}'}),
+            'isBase64Encoded': False
+        }
@@ -0,0 +1,154 @@
+import time
+
+MATCH_CACHE_TTL_SECONDS = 10
+MATCH_CACHE_SIZE = 500
+
+# match_id -> (updated_at, данные матча, время записи)
+_cache = {}
+
+# Тяжелая часть (составы, скриншоты) вычисляется только если версия
+# матча (updated_at) отличается от закэшированной
+MATCH_DETAILS_QUERY = """
+    SELECT 
+        bm.updated_at,
+        CASE WHEN %(force)s OR bm.updated_at IS DISTINCT FROM %(cached_at)s THEN
+            json_build_object(
+                'id', bm.id,
+                'round', bm.round,
+                'match_number', bm.match_number,
+                'team1_id', bm.team1_id,
+                'team2_id', bm.team2_id,
+                'team1_score', bm.team1_score,
+                'team2_score', bm.team2_score,
+                'team1_reported_score', bm.team1_reported_score,
+                'team2_reported_score', bm.team2_reported_score,
+                'winner_id', bm.winner_id,
+                'status', bm.status,
+                'match_details', bm.match_details,
+                'team1_captain_confirmed', bm.team1_captain_confirmed,
+                'team2_captain_confirmed', bm.team2_captain_confirmed,
+                'moderator_verified', bm.moderator_verified,
+                'scheduled_at', bm.scheduled_at,
+                'completed_at', bm.completed_at,
+                'map_name', bm.map_name,
+                'tournament_id', tour.id,
+                'tournament_name', tour.name,
+                'team1', CASE WHEN t1.id IS NULL THEN NULL ELSE json_build_object(
+                    'id', t1.id,
+                    'name', t1.name,
+                    'logo_url', t1.logo_url,
+                    'captain_id', t1.captain_id,
+                    'team_color', t1.team_color,
+                    'members', COALESCE((
+                        SELECT json_agg(json_build_object(
+                            'user_id', tm.user_id,
+                            'nickname', u.nickname,
+                            'avatar_url', u.avatar_url,
+                            'player_role', tm.player_role
+                        ))
+                        FROM t_p4831367_esport_gta_disaster.team_members tm
+                        JOIN t_p4831367_esport_gta_disaster.users u ON tm.user_id = u.id
+                        WHERE tm.team_id = t1.id
+                    ), '[]'::json)
+                ) END,
+                'team2', CASE WHEN t2.id IS NULL THEN NULL ELSE json_build_object(
+                    'id', t2.id,
+                    'name', t2.name,
+                    'logo_url', t2.logo_url,
+                    'captain_id', t2.captain_id,
+                    'team_color', t2.team_color,
+                    'members', COALESCE((
+                        SELECT json_agg(json_build_object(
+                            'user_id', tm.user_id,
+                            'nickname', u.nickname,
+                            'avatar_url', u.avatar_url,
+                            'player_role', tm.player_role
+                        ))
+                        FROM t_p4831367_esport_gta_disaster.team_members tm
+                        JOIN t_p4831367_esport_gta_disaster.users u ON tm.user_id = u.id
+                        WHERE tm.team_id = t2.id
+                    ), '[]'::json)
+                ) END,
+                'referee', CASE WHEN ref.id IS NULL THEN NULL ELSE json_build_object(
+                    'id', ref.id,
+                    'nickname', ref.nickname
+                ) END,
+                'screenshots', COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'id', ms.id,
+                        'team_id', ms.team_id,
+                        'screenshot_url', ms.screenshot_url,
+                        'description', ms.description,
+                        'uploaded_at', ms.uploaded_at,
+                        'uploaded_by_name', su.nickname,
+                        'team_name', st.name
+                    ) ORDER BY ms.uploaded_at DESC)
+                    FROM t_p4831367_esport_gta_disaster.match_screenshots ms
+                    JOIN t_p4831367_esport_gta_disaster.users su ON ms.uploaded_by = su.id
+                    JOIN t_p4831367_esport_gta_disaster.teams st ON ms.team_id = st.id
+                    WHERE ms.match_id = bm.id
+                ), '[]'::json),
+                'map_scores', COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'map_number', mm.map_number,
+                        'map_name', mm.map_name,
+                        'team1_score', mm.team1_score,
+                        'team2_score', mm.team2_score,
+                        'winner_id', mm.winner_id
+                    ) ORDER BY mm.map_number)
+                    FROM t_p4831367_esport_gta_disaster.bracket_match_maps mm
+                    WHERE mm.match_id = bm.id AND mm.source = 'final'
+                ), '[]'::json)
+            )
+        END as details
+    FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+    LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
+    LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
+    LEFT JOIN t_p4831367_esport_gta_disaster.users ref ON bm.referee_id = ref.id
+    LEFT JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+    LEFT JOIN t_p4831367_esport_gta_disaster.tournaments tour ON tb.tournament_id = tour.id
+    WHERE bm.id = %(match_id)s
+"""
+
+
+def fetch_match_details(cur, match_id: int):
+    """
+    Загружает матч целиком (оба состава, скриншоты, судья, счет по картам)
+    одним запросом.
+
+    Результат кэшируется на MATCH_CACHE_TTL_SECONDS по ключу match_id + updated_at:
+    запрос выполняется всегда, но при совпадении версии Postgres возвращает
+    только updated_at, а данные берутся из кэша.
+
+    Returns:
+        dict | None: Данные матча или None, если матч не найден
+    """
+    match_id = int(match_id)
+    now = time.monotonic()
+
+    cached = _cache.get(match_id)
+    if cached and now - cached[2] > MATCH_CACHE_TTL_SECONDS:
+        del _cache[match_id]
+        cached = None
+
+    cur.execute(MATCH_DETAILS_QUERY, {
+        'match_id': match_id,
+        'force': cached is None,
+        'cached_at': cached[0] if cached else None
+    })
+
+    row = cur.fetchone()
+    if not row:
+        _cache.pop(match_id, None)
+        return None
+
+    if row['details'] is None:
+        return cached[1]
+
+    if len(_cache) >= MATCH_CACHE_SIZE:
+        oldest = min(_cache, key=lambda key: _cache[key][2])
+        del _cache[oldest]
+
+    _cache[match_id] = (row['updated_at'], row['details'], now)
+
+    return row['details']
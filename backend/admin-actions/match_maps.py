@@ -0,0 +1,102 @@
+MAP_SOURCES = ('team1', 'team2', 'final')
+MAX_MAPS = 7
+
+# Куда записывается счет серии для каждого источника карт
+SERIES_COLUMNS = {
+    'team1': ('team1_reported_score', 'team2_reported_score'),
+    'team2': ('team1_reported_score', 'team2_reported_score'),
+    'final': ('team1_score', 'team2_score'),
+}
+
+
+def parse_maps(maps, swap: bool = False) -> list:
+    """
+    Карты из запроса -> [(map_name, team1_score, team2_score)] по порядку.
+
+    Принимает {'map_name', 'team1_score', 'team2_score'} или, для отчета
+    капитана, {'map_name', 'team_score', 'opponent_score'} (swap=True, если
+    капитан из команды 2).
+
+    Raises:
+        ValueError: если карт нет, их больше MAX_MAPS или счет не число
+    """
+    if not isinstance(maps, list) or not maps or len(maps) > MAX_MAPS:
+        raise ValueError(f'maps должен содержать от 1 до {MAX_MAPS} карт')
+
+    parsed = []
+    for item in maps:
+        if 'team_score' in item:
+            first, second = int(item['team_score']), int(item['opponent_score'])
+            if swap:
+                first, second = second, first
+        else:
+            first, second = int(item['team1_score']), int(item['team2_score'])
+        if first < 0 or second < 0:
+            raise ValueError('Счет карты не может быть отрицательным')
+        parsed.append((item.get('map_name'), first, second))
+    return parsed
+
+
+def save_map_scores(cur, match_id: int, source: str, maps: list) -> dict:
+    """
+    Заменяет карты источника source одной вставкой и пересчитывает счет серии
+    в строке матча тем же запросом.
+
+    Args:
+        maps: результат parse_maps
+
+    Returns:
+        dict: {'team1_id', 'team2_id', 'team1_maps', 'team2_maps'}
+    """
+    team1_column, team2_column = SERIES_COLUMNS[source]
+    cur.execute(f"""
+        WITH input AS (
+            SELECT *
+            FROM unnest(%(numbers)s::smallint[], %(names)s::text[], %(team1)s::int[], %(team2)s::int[])
+                AS m(map_number, map_name, team1_score, team2_score)
+        ), saved AS (
+            INSERT INTO t_p4831367_esport_gta_disaster.bracket_match_maps
+            (match_id, source, map_number, map_name, team1_score, team2_score, winner_id)
+            SELECT bm.id, %(source)s, m.map_number, m.map_name, m.team1_score, m.team2_score,
+                   CASE WHEN m.team1_score > m.team2_score THEN bm.team1_id
+                        WHEN m.team2_score > m.team1_score THEN bm.team2_id END
+            FROM input m
+            JOIN t_p4831367_esport_gta_disaster.bracket_matches bm ON bm.id = %(match_id)s
+            ON CONFLICT (match_id, source, map_number) DO UPDATE
+            SET map_name = EXCLUDED.map_name,
+                team1_score = EXCLUDED.team1_score,
+                team2_score = EXCLUDED.team2_score,
+                winner_id = EXCLUDED.winner_id,
+                created_at = NOW()
+            RETURNING team1_score, team2_score
+        ), trimmed AS (
+            DELETE FROM t_p4831367_esport_gta_disaster.bracket_match_maps
+            WHERE match_id = %(match_id)s AND source = %(source)s AND map_number > %(count)s
+        )
+        UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+        SET {team1_column} = (SELECT COUNT(*) FROM saved WHERE team1_score > team2_score),
+            {team2_column} = (SELECT COUNT(*) FROM saved WHERE team2_score > team1_score),
+            updated_at = NOW()
+        WHERE id = %(match_id)s
+        RETURNING team1_id, team2_id, {team1_column} as team1_maps, {team2_column} as team2_maps
+    """, {
+        'match_id': match_id,
+        'source': source,
+        'count': len(maps),
+        'numbers': list(range(1, len(maps) + 1)),
+        'names': [name for name, _, _ in maps],
+        'team1': [first for _, first, _ in maps],
+        'team2': [second for _, _, second in maps],
+    })
+    return cur.fetchone()
+
+
+def clear_map_scores(cur, match_id: int, sources: tuple = MAP_SOURCES):
+    """
+    Удаляет карты матча из источников sources: при сбросе счета и при записи
+    только итогового счета серии, чтобы карты не расходились со счетом
+    """
+    cur.execute("""
+        DELETE FROM t_p4831367_esport_gta_disaster.bracket_match_maps
+        WHERE match_id = %s AND source = ANY(%s)
+    """, (match_id, list(sources)))
@@ -0,0 +1,685 @@
+from achievements import award_match_achievements
+from app_logging import get_logger
+from common import escape_sql, log_admin_action
+from match_details import fetch_match_details
+from match_maps import clear_map_scores, parse_maps, save_map_scores
+from responses import dumps, json_response
+
+log = get_logger('admin-actions.matches')
+
+def get_match_chat(cur, conn, body: dict) -> dict:
+    """Получает чат матча"""
+    
+    match_id = body.get('match_id')
+    
+    cur.execute(f"""
+        SELECT mc.id, mc.user_id, u.nickname as username, u.avatar_url, mc.message, mc.created_at, mc.message_type,
+               u.role
+        FROM t_p4831367_esport_gta_disaster.match_chat mc
+        JOIN t_p4831367_esport_gta_disaster.users u ON mc.user_id = u.id
+        WHERE mc.match_id = {int(match_id)}
+          AND mc.created_at >= COALESCE((
+              SELECT created_at FROM t_p4831367_esport_gta_disaster.bracket_matches WHERE id = {int(match_id)}
+          ), '-infinity'::timestamp)
+        ORDER BY mc.created_at
+    """)
+    
+    messages = []
+    for row in cur.fetchall():
+        is_referee = row['role'] in ['admin', 'founder', 'organizer', 'referee']
+        messages.append({
+            'id': row['id'],
+            'user_id': row['user_id'],
+            'username': row['username'],
+            'avatar_url': row['avatar_url'],
+            'message': row['message'],
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+            'message_type': row['message_type'],
+            'is_referee': is_referee
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'messages': messages}),
+        'isBase64Encoded': False
+    }
+
+def send_chat_message(cur, conn, admin_id: str, body: dict) -> dict:
+    """Отправляет сообщение в чат матча"""
+    
+    match_id = body.get('match_id')
+    message = body.get('message')
+    message_type = body.get('message_type', 'text')
+    
+    cur.execute(f"""
+        INSERT INTO t_p4831367_esport_gta_disaster.match_chat (match_id, user_id, message, message_type)
+        VALUES ({int(match_id)}, '{escape_sql(admin_id)}', '{escape_sql(message)}', '{escape_sql(message_type)}')
+        RETURNING id
+    """)
+    
+    message_id = cur.fetchone()['id']
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Сообщение отправлено', 'message_id': message_id}),
+        'isBase64Encoded': False
+    }
+
+def calculate_match_rating(cur, conn, admin_id: str, body: dict) -> dict:
+    """Рассчитывает рейтинг команд после матча"""
+    
+    match_id = body.get('match_id')
+    winner_id = body.get('winner_id')
+    loser_id = body.get('loser_id')
+    
+    K = 32
+    
+    cur.execute(f"""
+        SELECT rating FROM team_ratings WHERE team_id = {int(winner_id)}
+    """)
+    winner_rating_row = cur.fetchone()
+    winner_rating = winner_rating_row['rating'] if winner_rating_row else 1000
+    
+    cur.execute(f"""
+        SELECT rating FROM team_ratings WHERE team_id = {int(loser_id)}
+    """)
+    loser_rating_row = cur.fetchone()
+    loser_rating = loser_rating_row['rating'] if loser_rating_row else 1000
+    
+    expected_winner = 1 / (1 + 10 ** ((loser_rating - winner_rating) / 400))
+    expected_loser = 1 / (1 + 10 ** ((winner_rating - loser_rating) / 400))
+    
+    new_winner_rating = winner_rating + K * (1 - expected_winner)
+    new_loser_rating = loser_rating + K * (0 - expected_loser)
+    
+    if winner_rating_row:
+        cur.execute(f"""
+            UPDATE team_ratings
+            SET rating = {new_winner_rating}, matches_played = matches_played + 1, wins = wins + 1
+            WHERE team_id = {int(winner_id)}
+        """)
+    else:
+        cur.execute(f"""
+            INSERT INTO team_ratings (team_id, rating, matches_played, wins)
+            VALUES ({int(winner_id)}, {new_winner_rating}, 1, 1)
+        """)
+    
+    if loser_rating_row:
+        cur.execute(f"""
+            UPDATE team_ratings
+            SET rating = {new_loser_rating}, matches_played = matches_played + 1, losses = losses + 1
+            WHERE team_id = {int(loser_id)}
+        """)
+    else:
+        cur.execute(f"""
+            INSERT INTO team_ratings (team_id, rating, matches_played, losses)
+            VALUES ({int(loser_id)}, {new_loser_rating}, 1, 1)
+        """)
+    
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({
+            'message': 'Рейтинг обновлен',
+            'winner_new_rating': new_winner_rating,
+            'loser_new_rating': new_loser_rating
+        }),
+        'isBase64Encoded': False
+    }
+
+def get_team_ratings(cur, conn) -> dict:
+    """Получает рейтинг всех команд"""
+    
+    cur.execute("""
+        SELECT tr.team_id, t.name, tr.rating, tr.matches_played, tr.wins, tr.losses
+        FROM team_ratings tr
+        JOIN t_p4831367_esport_gta_disaster.teams t ON tr.team_id = t.id
+        ORDER BY tr.rating DESC
+    """)
+    
+    ratings = []
+    for row in cur.fetchall():
+        ratings.append({
+            'team_id': row['team_id'],
+            'team_name': row['team_name'],
+            'rating': row['rating'],
+            'matches_played': row['matches_played'],
+            'wins': row['wins'],
+            'losses': row['losses']
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'ratings': ratings}),
+        'isBase64Encoded': False
+    }
+
+def get_match_details(cur, conn, body: dict) -> dict:
+    """Получает подробную информацию о матче"""
+    match_id = body.get('match_id')
+    user_id = body.get('user_id')
+    
+    if not match_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'match_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    match_data = fetch_match_details(cur, match_id)
+    
+    if not match_data:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Матч не найден'}),
+            'isBase64Encoded': False
+        }
+    
+    team1 = match_data['team1']
+    team2 = match_data['team2']
+    
+    is_captain = False
+    captain_team_id = None
+    if user_id:
+        if team1 and team1['captain_id'] == int(user_id):
+            is_captain = True
+            captain_team_id = team1['id']
+        elif team2 and team2['captain_id'] == int(user_id):
+            is_captain = True
+            captain_team_id = team2['id']
+    
+    def format_team(team):
+        if not team:
+            return None
+        return {
+            'id': team['id'],
+            'name': team['name'],
+            'logo_url': team['logo_url'],
+            'captain_id': team['captain_id'],
+            'members': [{
+                'id': member['user_id'],
+                'nickname': member['nickname'],
+                'avatar_url': member['avatar_url'],
+                'role': 'Player',
+                'status': 'offline'
+            } for member in team['members']]
+        }
+    
+    result = {
+        'id': match_data['id'],
+        'round': match_data['round'],
+        'match_number': match_data['match_number'],
+        'team1': format_team(team1),
+        'team2': format_team(team2),
+        'team1_score': match_data['team1_score'] or 0,
+        'team2_score': match_data['team2_score'] or 0,
+        'reported_team1': match_data['team1_reported_score'],
+        'reported_team2': match_data['team2_reported_score'],
+        'winner_id': match_data['winner_id'],
+        'status': match_data['status'],
+        'moderator_verified': match_data['moderator_verified'],
+        'scheduled_at': match_data['scheduled_at'],
+        'map_name': match_data['map_name'],
+        'tournament_name': match_data['tournament_name'],
+        'tournament_id': match_data['tournament_id'],
+        'is_captain': is_captain,
+        'captain_team_id': captain_team_id,
+        'map_scores': match_data['map_scores'],
+        'referee': match_data['referee'],
+        'screenshots': match_data['screenshots']
+    }
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'match': result}),
+        'isBase64Encoded': False
+    }
+
+def submit_match_score(cur, conn, body: dict) -> dict:
+    """
+    Капитан команды отправляет результат матча: счет серии (team_score,
+    opponent_score) или карты maps: [{'map_name', 'team_score', 'opponent_score'}],
+    по которым счет серии считается в SQL.
+    """
+    match_id = body.get('match_id')
+    user_id = body.get('user_id')
+    team_score = body.get('team_score')
+    opponent_score = body.get('opponent_score')
+    maps = body.get('maps')
+    
+    if not all([match_id, user_id]) or (not maps and (team_score is None or opponent_score is None)):
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Все поля обязательны'}),
+            'isBase64Encoded': False
+        }
+    
+    cur.execute(f"""
+        SELECT bm.team1_id, bm.team2_id, t1.captain_id as team1_captain, t2.captain_id as team2_captain
+        FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+        LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
+        LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
+        WHERE bm.id = {int(match_id)}
+    """)
+    
+    match_data = cur.fetchone()
+    
+    if not match_data:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Матч не найден'}),
+            'isBase64Encoded': False
+        }
+    
+    is_team1_captain = match_data['team1_captain'] == int(user_id)
+    is_team2_captain = match_data['team2_captain'] == int(user_id)
+    
+    if not is_team1_captain and not is_team2_captain:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Только капитан команды может отправлять результат'}),
+            'isBase64Encoded': False
+        }
+    
+    if maps:
+        try:
+            parsed_maps = parse_maps(maps, swap=not is_team1_captain)
+        except (ValueError, KeyError, TypeError) as e:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': f'Некорректные карты: {str(e)}'}),
+                'isBase64Encoded': False
+            }
+        series = save_map_scores(cur, int(match_id), 'team1' if is_team1_captain else 'team2', parsed_maps)
+        if is_team1_captain:
+            team_score, opponent_score = series['team1_maps'], series['team2_maps']
+        else:
+            team_score, opponent_score = series['team2_maps'], series['team1_maps']
+    elif is_team1_captain:
+        clear_map_scores(cur, int(match_id), ('team1',))
+        cur.execute(f"""
+            UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+            SET team1_reported_score = {int(team_score)},
+                team2_reported_score = {int(opponent_score)},
+                updated_at = NOW()
+            WHERE id = {int(match_id)}
+        """)
+    else:
+        clear_map_scores(cur, int(match_id), ('team2',))
+        cur.execute(f"""
+            UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+            SET team1_reported_score = {int(opponent_score)},
+                team2_reported_score = {int(team_score)},
+                updated_at = NOW()
+            WHERE id = {int(match_id)}
+        """)
+    
+    conn.commit()
+    
+    try:
+        cur.execute(f"""
+            SELECT bm.team1_id, bm.team2_id,
+                   t1.name as team1_name, t1.captain_id as team1_captain,
+                   t2.name as team2_name, t2.captain_id as team2_captain,
+                   tour.name as tournament_name, tour.id as tournament_id
+            FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournaments tour ON tb.tournament_id = tour.id
+            WHERE bm.id = {int(match_id)}
+        """)
+        match_info = cur.fetchone()
+        
+        if match_info:
+            tournament_name = match_info['tournament_name']
+            tournament_id = match_info['tournament_id']
+            team1_captain = match_info['team1_captain']
+            team2_captain = match_info['team2_captain']
+            
+            reporting_captain = team1_captain if is_team1_captain else team2_captain
+            opponent_captain = team2_captain if is_team1_captain else team1_captain
+            reporting_team = match_info['team1_name'] if is_team1_captain else match_info['team2_name']
+            
+            if opponent_captain:
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+                    (user_id, type, title, message, link, read, created_at)
+                    VALUES (
+                        {opponent_captain},
+                        'match_update',
+                        '📊 Результат матча отправлен',
+                        'Капитан команды "{escape_sql(reporting_team)}" отправил результат матча в турнире "{escape_sql(tournament_name)}". Счет: {int(team_score) if is_team1_captain else int(opponent_score)}:{int(opponent_score) if is_team1_captain else int(team_score)}. Ожидается подтверждение судьи.',
+                        '/tournaments/{tournament_id}/bracket',
+                        false,
+                        NOW()
+                    )
+                """)
+                conn.commit()
+    except Exception as e:
+        log.warning('failed to send notification: %s', e)
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Результат отправлен на проверку'}),
+        'isBase64Encoded': False
+    }
+
+def reset_match_score(cur, conn, admin_id: str, body: dict) -> dict:
+    """Судья сбрасывает счет матча"""
+    match_id = body.get('match_id')
+    
+    if not match_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'match_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        cur.execute(f"""
+            SELECT bm.bracket_id, bm.team1_id, bm.team2_id,
+                   t1.captain_id as team1_captain,
+                   t2.captain_id as team2_captain,
+                   tour.name as tournament_name, tour.id as tournament_id
+            FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournaments tour ON tb.tournament_id = tour.id
+            WHERE bm.id = {int(match_id)}
+        """)
+        match_info = cur.fetchone()
+    except Exception as e:
+        match_info = None
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+        SET team1_score = NULL,
+            team2_score = NULL,
+            team1_reported_score = NULL,
+            team2_reported_score = NULL,
+            winner_id = NULL,
+            moderator_verified = FALSE,
+            status = 'pending',
+            updated_at = NOW()
+        WHERE id = {int(match_id)}
+    """)
+    clear_map_scores(cur, int(match_id))
+    
+    conn.commit()
+    
+    log_admin_action(cur, conn, admin_id, 'reset_match', f'Сбросил счет матча #{match_id}', 'match', int(match_id))
+    
+    try:
+        if match_info:
+            tournament_name = match_info['tournament_name']
+            tournament_id = match_info['tournament_id']
+            team1_captain = match_info['team1_captain']
+            team2_captain = match_info['team2_captain']
+            
+            for captain_id in [team1_captain, team2_captain]:
+                if captain_id:
+                    cur.execute(f"""
+                        INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+                        (user_id, type, title, message, link, read, created_at)
+                        VALUES (
+                            {captain_id},
+                            'match_update',
+                            '🔄 Счет матча сброшен',
+                            'Судья сбросил результат матча в турнире "{escape_sql(tournament_name)}". Необходимо повторно отправить результат.',
+                            '/tournaments/{tournament_id}/bracket',
+                            false,
+                            NOW()
+                        )
+                    """)
+            conn.commit()
+    except Exception as e:
+        log.warning('failed to send reset notifications: %s', e)
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Счет матча сброшен'}),
+        'isBase64Encoded': False
+    }
+
+def confirm_match(cur, conn, admin_id: str, body: dict) -> dict:
+    """
+    Судья подтверждает результат матча и продвигает победителя.
+
+    Вместо team1_score/team2_score можно передать карты
+    maps: [{'map_name', 'team1_score', 'team2_score'}]: счет серии
+    (выигранные карты) считается по ним в SQL.
+    """
+    match_id = body.get('match_id')
+    team1_score = body.get('team1_score')
+    team2_score = body.get('team2_score')
+    maps = body.get('maps')
+    
+    if not match_id or (not maps and (team1_score is None or team2_score is None)):
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Все поля обязательны'}),
+            'isBase64Encoded': False
+        }
+    
+    cur.execute(f"""
+        SELECT bracket_id, round, match_number, team1_id, team2_id
+        FROM t_p4831367_esport_gta_disaster.bracket_matches
+        WHERE id = {int(match_id)}
+    """)
+    
+    match_data = cur.fetchone()
+    
+    if not match_data:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Матч не найден'}),
+            'isBase64Encoded': False
+        }
+    
+    if maps:
+        try:
+            parsed_maps = parse_maps(maps)
+        except (ValueError, KeyError, TypeError) as e:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': f'Некорректные карты: {str(e)}'}),
+                'isBase64Encoded': False
+            }
+        series = save_map_scores(cur, int(match_id), 'final', parsed_maps)
+        team1_score, team2_score = series['team1_maps'], series['team2_maps']
+    else:
+        clear_map_scores(cur, int(match_id), ('final',))
+    
+    winner_id = match_data['team1_id'] if int(team1_score) > int(team2_score) else match_data['team2_id']
+    
+    if int(team1_score) == int(team2_score):
+        conn.rollback()
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Счет не может быть равным'}),
+            'isBase64Encoded': False
+        }
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+        SET team1_score = {int(team1_score)},
+            team2_score = {int(team2_score)},
+            winner_id = {winner_id},
+            moderator_verified = TRUE,
+            status = 'completed',
+            completed_at = NOW(),
+            updated_at = NOW()
+        WHERE id = {int(match_id)}
+    """)
+    
+    next_round = match_data['round'] + 1
+    next_match_number = (match_data['match_number'] + 1) // 2
+    is_team1 = (match_data['match_number'] % 2 == 1)
+    team_column = 'team1_id' if is_team1 else 'team2_id'
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+        SET {team_column} = {winner_id}, updated_at = NOW()
+        WHERE bracket_id = {match_data['bracket_id']} 
+        AND round = {next_round} 
+        AND match_number = {next_match_number}
+    """)
+    
+    conn.commit()
+    
+    log_admin_action(cur, conn, admin_id, 'confirm_match', f'Подтвердил результат матча #{match_id}', 'match', int(match_id))
+    
+    try:
+        cur.execute(f"""
+            SELECT t1.name as team1_name, t1.captain_id as team1_captain,
+                   t2.name as team2_name, t2.captain_id as team2_captain,
+                   tw.name as winner_name,
+                   tour.name as tournament_name, tour.id as tournament_id,
+                   bm.team1_score, bm.team2_score
+            FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams tw ON bm.winner_id = tw.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.tournaments tour ON tb.tournament_id = tour.id
+            WHERE bm.id = {int(match_id)}
+        """)
+        match_info = cur.fetchone()
+        
+        if match_info and match_data['team1_id'] and match_data['team2_id']:
+            tournament_name = match_info['tournament_name']
+            winner_name = match_info['winner_name']
+            team1_name = match_info['team1_name']
+            team2_name = match_info['team2_name']
+            score = f"{match_info['team1_score']}:{match_info['team2_score']}"
+            tournament_id = match_info['tournament_id']
+            
+            team1_captain = match_info['team1_captain']
+            team2_captain = match_info['team2_captain']
+            
+            cur.execute(f"SELECT user_id FROM t_p4831367_esport_gta_disaster.team_members WHERE team_id = {match_data['team1_id']} AND status = 'active'")
+            team1_members = [row['user_id'] for row in cur.fetchall()]
+            
+            cur.execute(f"SELECT user_id FROM t_p4831367_esport_gta_disaster.team_members WHERE team_id = {match_data['team2_id']} AND status = 'active'")
+            team2_members = [row['user_id'] for row in cur.fetchall()]
+            
+            is_team1_winner = winner_id == match_data['team1_id']
+            
+            for user_id in team1_members:
+                if user_id == team1_captain:
+                    title = '🏆 Победа!' if is_team1_winner else '😔 Поражение'
+                    message = f"Судья подтвердил результат матча в турнире \"{escape_sql(tournament_name)}\". Счет: {score}. {'Ваша команда прошла в следующий раунд!' if is_team1_winner else f'Победитель: {escape_sql(winner_name)}'}"
+                else:
+                    title = 'Матч завершен'
+                    message = f"Матч в турнире \"{escape_sql(tournament_name)}\" завершен. Счет: {score}. Победитель: {escape_sql(winner_name)}"
+                
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+                    (user_id, type, title, message, link, read, created_at)
+                    VALUES (
+                        {user_id},
+                        'match_result',
+                        '{escape_sql(title)}',
+                        '{escape_sql(message)}',
+                        '/tournaments/{tournament_id}/bracket',
+                        false,
+                        NOW()
+                    )
+                """)
+            
+            for user_id in team2_members:
+                if user_id == team2_captain:
+                    title = '🏆 Победа!' if not is_team1_winner else '😔 Поражение'
+                    message = f"Судья подтвердил результат матча в турнире \"{escape_sql(tournament_name)}\". Счет: {score}. {'Ваша команда прошла в следующий раунд!' if not is_team1_winner else f'Победитель: {escape_sql(winner_name)}'}"
+                else:
+                    title = 'Матч завершен'
+                    message = f"Матч в турнире \"{escape_sql(tournament_name)}\" завершен. Счет: {score}. Победитель: {escape_sql(winner_name)}"
+                
+                cur.execute(f"""
+                    INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+                    (user_id, type, title, message, link, read, created_at)
+                    VALUES (
+                        {user_id},
+                        'match_result',
+                        '{escape_sql(title)}',
+                        '{escape_sql(message)}',
+                        '/tournaments/{tournament_id}/bracket',
+                        false,
+                        NOW()
+                    )
+                """)
+            
+            conn.commit()
+    except Exception as e:
+        log.warning('failed to send notifications: %s', e)
+    
+    award_match_achievements(cur, conn, int(match_id))
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Матч подтвержден, победитель продвинут'}),
+        'isBase64Encoded': False
+    }
+
+def get_active_matches(cur, conn, body: dict) -> dict:
+    """Получить активные матчи для отображения на главной панели"""
+    try:
+        limit = body.get('limit', 10)
+        
+        cur.execute(f"""
+            SELECT 
+                bm.id,
+                t.name as tournament_name,
+                bm.round,
+                bm.match_number,
+                t1.name as team1_name,
+                t2.name as team2_name,
+                bm.team1_score,
+                bm.team2_score,
+                bm.status,
+                bm.scheduled_at
+            FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+            JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+            JOIN t_p4831367_esport_gta_disaster.tournaments t ON tb.tournament_id = t.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
+            WHERE bm.status IN ('pending', 'in_progress')
+            AND (t.removed = 0 OR t.removed IS NULL)
+            ORDER BY bm.scheduled_at ASC NULLS LAST, bm.id DESC
+            LIMIT {limit}
+        """)
+        
+        return json_response({'matches': cur.fetchall()})
+    except Exception as e:
+        import traceback
+        error_msg = traceback.format_exc()
+        log.error('get_active_matches failed: %s', error_msg)
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': str(e), 'traceback': error_msg}),
+            'isBase64Encoded': False
+        }
@@ -0,0 +1,541 @@
+import json
+import os
+from datetime import datetime, timedelta
+from app_logging import get_logger
+from common import escape_sql, log_admin_action
+from responses import dumps
+
+log = get_logger('admin-actions.moderation')
+
+def send_verification_code(cur, conn, admin_id: str, body: dict) -> dict:
+    """Генерирует и отправляет код подтверждения на email администратора"""
+    import random
+    import string
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    
+    code = ''.join(random.choices(string.digits, k=6))
+    action_type = body.get('action_type')
+    action_data = json.dumps(body.get('action_data', {}))
+    expires_at = datetime.now() + timedelta(minutes=10)
+    
+    cur.execute(f"""
+        INSERT INTO t_p4831367_esport_gta_disaster.admin_verification_codes (admin_id, code, action_type, action_data, expires_at)
+        VALUES ('{escape_sql(admin_id)}', '{escape_sql(code)}', '{escape_sql(action_type)}', '{escape_sql(action_data)}', '{expires_at}')
+    """)
+    conn.commit()
+    
+    cur.execute(f"SELECT email FROM t_p4831367_esport_gta_disaster.users WHERE id = '{escape_sql(admin_id)}'")
+    admin_email = cur.fetchone()['email']
+    
+    smtp_host = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
+    smtp_port = int(os.environ.get('SMTP_PORT', 587))
+    smtp_user = os.environ.get('SMTP_USER')
+    smtp_password = os.environ.get('SMTP_PASSWORD')
+    
+    msg = MIMEMultipart()
+    msg['From'] = smtp_user
+    msg['To'] = admin_email
+    msg['Subject'] = 'Код подтверждения административного действия'
+    
+    body_text = f"""
+    Ваш код подтверждения: {code}
+    
+    Код действителен в течение 10 минут.
+    Действие: {action_type}
+    """
+    
+    msg.attach(MIMEText(body_text, 'plain'))
+    
+    try:
+        server = smtplib.SMTP(smtp_host, smtp_port)
+        server.starttls()
+        server.login(smtp_user, smtp_password)
+        server.send_message(msg)
+        server.quit()
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка отправки email: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Код подтверждения отправлен на email'}),
+        'isBase64Encoded': False
+    }
+
+def verify_and_execute(cur, conn, admin_id: str, body: dict) -> dict:
+    """Проверяет код и выполняет административное действие"""
+    
+    code = body.get('code')
+    
+    cur.execute(f"""
+        SELECT action_type, action_data FROM t_p4831367_esport_gta_disaster.admin_verification_codes
+        WHERE admin_id = '{escape_sql(admin_id)}' AND code = '{escape_sql(code)}'
+        AND expires_at > NOW() AND used = FALSE
+        ORDER BY created_at DESC LIMIT 1
+    """)
+    
+    result = cur.fetchone()
+    
+    if not result:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Неверный или истекший код'}),
+            'isBase64Encoded': False
+        }
+    
+    action_type = result['action_type']
+    action_data = json.loads(result['action_data'])
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.admin_verification_codes
+        SET used = TRUE
+        WHERE admin_id = '{escape_sql(admin_id)}' AND code = '{escape_sql(code)}'
+    """)
+    conn.commit()
+    
+    if action_type == 'ban':
+        return execute_ban(cur, conn, admin_id, action_data)
+    elif action_type == 'mute':
+        return execute_mute(cur, conn, admin_id, action_data)
+    elif action_type == 'tournament_exclusion':
+        return execute_tournament_exclusion(cur, conn, admin_id, action_data)
+    else:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Неизвестный тип действия'}),
+            'isBase64Encoded': False
+        }
+
+def execute_ban(cur, conn, admin_id: str, data: dict) -> dict:
+    """Выполняет бан пользователя"""
+    
+    user_id = data.get('user_id')
+    reason = data.get('reason')
+    duration_days = data.get('duration_days')
+    
+    # Получаем имя пользователя для логирования
+    cur.execute(f"SELECT nickname FROM t_p4831367_esport_gta_disaster.users WHERE id = {int(user_id)}")
+    user_row = cur.fetchone()
+    user_name = user_row['nickname'] if user_row else 'Unknown'
+    
+    if duration_days:
+        expires_at = datetime.now() + timedelta(days=duration_days)
+        cur.execute(f"""
+            INSERT INTO t_p4831367_esport_gta_disaster.bans (user_id, admin_id, reason, expires_at)
+            VALUES ('{escape_sql(user_id)}', '{escape_sql(admin_id)}', '{escape_sql(reason)}', '{expires_at}')
+        """)
+    else:
+        cur.execute(f"""
+            INSERT INTO t_p4831367_esport_gta_disaster.bans (user_id, admin_id, reason)
+            VALUES ('{escape_sql(user_id)}', '{escape_sql(admin_id)}', '{escape_sql(reason)}')
+        """)
+    
+    conn.commit()
+    
+    # Логируем бан
+    duration_text = f" на {duration_days} дней" if duration_days else " навсегда"
+    log_admin_action(cur, conn, admin_id, 'user_ban', 
+                     f"Забанил пользователя {user_name}{duration_text}. Причина: {reason}", 'user', int(user_id))
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Пользователь забанен'}),
+        'isBase64Encoded': False
+    }
+
+def execute_mute(cur, conn, admin_id: str, data: dict) -> dict:
+    """Выполняет мут пользователя"""
+    
+    user_id = data.get('user_id')
+    reason = data.get('reason')
+    duration_days = data.get('duration_days')
+    
+    # Получаем имя пользователя для логирования
+    cur.execute(f"SELECT nickname FROM t_p4831367_esport_gta_disaster.users WHERE id = {int(user_id)}")
+    user_row = cur.fetchone()
+    user_name = user_row['nickname'] if user_row else 'Unknown'
+    
+    if duration_days:
+        expires_at = datetime.now() + timedelta(days=duration_days)
+        cur.execute(f"""
+            INSERT INTO t_p4831367_esport_gta_disaster.mutes (user_id, admin_id, reason, expires_at)
+            VALUES ('{escape_sql(user_id)}', '{escape_sql(admin_id)}', '{escape_sql(reason)}', '{expires_at}')
+        """)
+    else:
+        cur.execute(f"""
+            INSERT INTO t_p4831367_esport_gta_disaster.mutes (user_id, admin_id, reason)
+            VALUES ('{escape_sql(user_id)}', '{escape_sql(admin_id)}', '{escape_sql(reason)}')
+        """)
+    
+    conn.commit()
+    
+    # Логируем мут
+    duration_text = f" на {duration_days} дней" if duration_days else " навсегда"
+    log_admin_action(cur, conn, admin_id, 'user_mute', 
+                     f"Замутил пользователя {user_name}{duration_text}. Причина: {reason}", 'user', int(user_id))
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Пользователь замучен'}),
+        'isBase64Encoded': False
+    }
+
+def execute_tournament_exclusion(cur, conn, admin_id: str, data: dict) -> dict:
+    """Выполняет отстранение от турниров"""
+    
+    user_id = data.get('user_id')
+    reason = data.get('reason')
+    duration_days = data.get('duration_days')
+    
+    if duration_days:
+        expires_at = datetime.now() + timedelta(days=duration_days)
+        cur.execute(f"""
+            INSERT INTO t_p4831367_esport_gta_disaster.tournament_exclusions (user_id, admin_id, reason, expires_at)
+            VALUES ('{escape_sql(user_id)}', '{escape_sql(admin_id)}', '{escape_sql(reason)}', '{expires_at}')
+        """)
+    else:
+        cur.execute(f"""
+            INSERT INTO t_p4831367_esport_gta_disaster.tournament_exclusions (user_id, admin_id, reason)
+            VALUES ('{escape_sql(user_id)}', '{escape_sql(admin_id)}', '{escape_sql(reason)}')
+        """)
+    
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Пользователь отстранен от турниров'}),
+        'isBase64Encoded': False
+    }
+
+def get_bans(cur, conn) -> dict:
+    """Получает список всех банов"""
+    
+    cur.execute("""
+        SELECT b.id, b.user_id, u.username, b.admin_id, a.username as admin_username,
+               b.reason, b.created_at, b.expires_at, b.active
+        FROM t_p4831367_esport_gta_disaster.bans b
+        JOIN t_p4831367_esport_gta_disaster.users u ON b.user_id = u.id
+        JOIN t_p4831367_esport_gta_disaster.users a ON b.admin_id = a.id
+        WHERE b.active = TRUE
+        ORDER BY b.created_at DESC
+    """)
+    
+    bans = []
+    for row in cur.fetchall():
+        bans.append({
+            'id': row['id'],
+            'user_id': row['user_id'],
+            'username': row['username'],
+            'admin_id': row['admin_id'],
+            'admin_username': row['admin_username'],
+            'reason': row['reason'],
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+            'expires_at': row['expires_at'].isoformat() if row['expires_at'] else None,
+            'active': row['active']
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'bans': bans}),
+        'isBase64Encoded': False
+    }
+
+def get_mutes(cur, conn) -> dict:
+    """Получает список всех мутов"""
+    
+    cur.execute("""
+        SELECT m.id, m.user_id, u.username, m.admin_id, a.username as admin_username,
+               m.reason, m.created_at, m.expires_at, m.active
+        FROM t_p4831367_esport_gta_disaster.mutes m
+        JOIN t_p4831367_esport_gta_disaster.users u ON m.user_id = u.id
+        JOIN t_p4831367_esport_gta_disaster.users a ON m.admin_id = a.id
+        WHERE m.active = TRUE
+        ORDER BY m.created_at DESC
+    """)
+    
+    mutes = []
+    for row in cur.fetchall():
+        mutes.append({
+            'id': row['id'],
+            'user_id': row['user_id'],
+            'username': row['username'],
+            'admin_id': row['admin_id'],
+            'admin_username': row['admin_username'],
+            'reason': row['reason'],
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+            'expires_at': row['expires_at'].isoformat() if row['expires_at'] else None,
+            'active': row['active']
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'mutes': mutes}),
+        'isBase64Encoded': False
+    }
+
+def get_exclusions(cur, conn) -> dict:
+    """Получает список всех отстранений от турниров"""
+    
+    cur.execute("""
+        SELECT e.id, e.user_id, u.username, e.admin_id, a.username as admin_username,
+               e.reason, e.created_at, e.expires_at, e.active
+        FROM t_p4831367_esport_gta_disaster.tournament_exclusions e
+        JOIN t_p4831367_esport_gta_disaster.users u ON e.user_id = u.id
+        JOIN t_p4831367_esport_gta_disaster.users a ON e.admin_id = a.id
+        WHERE e.active = TRUE
+        ORDER BY e.created_at DESC
+    """)
+    
+    exclusions = []
+    for row in cur.fetchall():
+        exclusions.append({
+            'id': row['id'],
+            'user_id': row['user_id'],
+            'username': row['username'],
+            'admin_id': row['admin_id'],
+            'admin_username': row['admin_username'],
+            'reason': row['reason'],
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+            'expires_at': row['expires_at'].isoformat() if row['expires_at'] else None,
+            'active': row['active']
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'exclusions': exclusions}),
+        'isBase64Encoded': False
+    }
+
+def remove_ban(cur, conn, admin_id: str, body: dict) -> dict:
+    """Снимает бан с пользователя"""
+    
+    ban_id = body.get('ban_id')
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.bans SET active = FALSE
+        WHERE id = {int(ban_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Бан снят'}),
+        'isBase64Encoded': False
+    }
+
+def remove_mute(cur, conn, admin_id: str, body: dict) -> dict:
+    """Снимает мут с пользователя"""
+    
+    mute_id = body.get('mute_id')
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.mutes SET active = FALSE
+        WHERE id = {int(mute_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Мут снят'}),
+        'isBase64Encoded': False
+    }
+
+def verify_admin_password(cur, conn, body: dict) -> dict:
+    """Проверяет пароль администратора"""
+    
+    admin_id = body.get('admin_id')
+    password = body.get('password')
+    
+    if not admin_id or not password:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Не указан ID администратора или пароль'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        admin_id_int = int(admin_id)
+    except (ValueError, TypeError):
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Неверный формат ID администратора'}),
+            'isBase64Encoded': False
+        }
+    
+    cur.execute("""
+        SELECT password_hash FROM t_p4831367_esport_gta_disaster.users WHERE id = %s
+    """, (admin_id_int,))
+    
+    user_data = cur.fetchone()
+    
+    if not user_data:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Пользователь не найден'}),
+            'isBase64Encoded': False
+        }
+    
+    import hashlib
+    password_hash_sha256 = hashlib.sha256(password.encode()).hexdigest()
+    
+    if password_hash_sha256 == user_data['password_hash']:
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True}),
+            'isBase64Encoded': False
+        }
+    else:
+        return {
+            'statusCode': 401,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Неверный пароль'}),
+            'isBase64Encoded': False
+        }
+
+def get_moderation_logs(cur, conn):
+    """Получение всех логов модерации"""
+    cur.execute("""
+        SELECT al.id, al.action_type, al.target_user_id, u.username as target_username,
+               al.admin_id, a.username as admin_username, al.reason, al.created_at
+        FROM admin_action_logs al
+        LEFT JOIN t_p4831367_esport_gta_disaster.users u ON al.target_user_id = u.id
+        LEFT JOIN t_p4831367_esport_gta_disaster.users a ON al.admin_id = a.id
+        ORDER BY al.created_at DESC
+        LIMIT 100
+    """)
+    logs = cur.fetchall()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({
+            'logs': [{
+                'id': log[0],
+                'action_type': log[1],
+                'target_user_id': log[2],
+                'target_username': log[3],
+                'admin_id': log[4],
+                'admin_username': log[5],
+                'reason': log[6],
+                'created_at': log[7].isoformat() if log[7] else None
+            } for log in logs]
+        }),
+        'isBase64Encoded': False
+    }
+
+def get_active_bans(cur, conn):
+    """Получение активных банов"""
+    cur.execute("""
+        SELECT b.id, b.user_id, u.username, b.reason, b.expires_at, b.banned_by, a.username as admin_name, b.created_at
+        FROM user_bans b
+        LEFT JOIN t_p4831367_esport_gta_disaster.users u ON b.user_id = u.id
+        LEFT JOIN t_p4831367_esport_gta_disaster.users a ON b.banned_by = a.id
+        WHERE b.is_active = TRUE
+        ORDER BY b.created_at DESC
+    """)
+    bans = cur.fetchall()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({
+            'bans': [{
+                'id': ban[0],
+                'user_id': ban[1],
+                'username': ban[2],
+                'reason': ban[3],
+                'expires_at': ban[4].isoformat() if ban[4] else None,
+                'banned_by': ban[5],
+                'admin_name': ban[6],
+                'created_at': ban[7].isoformat() if ban[7] else None
+            } for ban in bans]
+        }),
+        'isBase64Encoded': False
+    }
+
+def get_active_mutes(cur, conn):
+    """Получение активных мутов"""
+    cur.execute("""
+        SELECT m.id, m.user_id, u.username, m.reason, m.expires_at, m.muted_by, a.username as admin_name, m.created_at
+        FROM user_mutes m
+        LEFT JOIN t_p4831367_esport_gta_disaster.users u ON m.user_id = u.id
+        LEFT JOIN t_p4831367_esport_gta_disaster.users a ON m.muted_by = a.id
+        WHERE m.is_active = TRUE
+        ORDER BY m.created_at DESC
+    """)
+    mutes = cur.fetchall()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({
+            'mutes': [{
+                'id': mute[0],
+                'user_id': mute[1],
+                'username': mute[2],
+                'reason': mute[3],
+                'expires_at': mute[4].isoformat() if mute[4] else None,
+                'muted_by': mute[5],
+                'admin_name': mute[6],
+                'created_at': mute[7].isoformat() if mute[7] else None
+            } for mute in mutes]
+        }),
+        'isBase64Encoded': False
+    }
+
+def update_ban_status(cur, conn, admin_id: str, body: dict):
+    """Обновление статуса бана"""
+    ban_id = body.get('ban_id')
+    is_active = body.get('is_active', False)
+    
+    cur.execute(f"UPDATE user_bans SET is_active = {str(is_active).upper()} WHERE id = {int(ban_id)}")
+    conn.commit()
+    
+    cur.execute(f"INSERT INTO admin_action_logs (admin_id, action_type, reason) VALUES ('{escape_sql(admin_id)}', 'ban_status_updated', 'Ban ID {int(ban_id)} updated')")
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Статус бана обновлен'}),
+        'isBase64Encoded': False
+    }
+
+def update_mute_status(cur, conn, admin_id: str, body: dict):
+    """Обновление статуса мута"""
+    mute_id = body.get('mute_id')
+    is_active = body.get('is_active', False)
+    
+    cur.execute(f"UPDATE user_mutes SET is_active = {str(is_active).upper()} WHERE id = {int(mute_id)}")
+    conn.commit()
+    
+    cur.execute(f"INSERT INTO admin_action_logs (admin_id, action_type, reason) VALUES ('{escape_sql(admin_id)}', 'mute_status_updated', 'Mute ID {int(mute_id)} updated')")
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Статус мута обновлен'}),
+        'isBase64Encoded': False
+    }
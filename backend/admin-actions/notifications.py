@@ -0,0 +1,287 @@
+from common import escape_sql
+from responses import dumps
+
+def get_notifications(cur, conn, body: dict) -> dict:
+    """Получает список уведомлений пользователя"""
+    user_id = body.get('user_id')
+    limit = body.get('limit', 50)
+    
+    if not user_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'user_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        cur.execute(f"""
+            SELECT id, user_id, type, title, message, link, read, created_at
+            FROM t_p4831367_esport_gta_disaster.notifications
+            WHERE user_id = {user_id}
+            ORDER BY created_at DESC
+            LIMIT {limit}
+        """)
+        notifications = [dict(row) for row in cur.fetchall()]
+        
+        unread_count = read_unread_count(cur, user_id)
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({
+                'notifications': notifications,
+                'unread_count': unread_count
+            }),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка получения уведомлений: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def read_unread_count(cur, user_id) -> int:
+    """Читает счетчик непрочитанных уведомлений (поддерживается триггерами notifications)"""
+    cur.execute("""
+        SELECT unread_count FROM t_p4831367_esport_gta_disaster.notification_counters
+        WHERE user_id = %s
+    """, (int(user_id),))
+    row = cur.fetchone()
+    return row['unread_count'] if row else 0
+
+def get_unread_count(cur, conn, body: dict) -> dict:
+    """Количество непрочитанных уведомлений для значка колокольчика"""
+    user_id = body.get('user_id')
+    
+    if not user_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'user_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'unread_count': read_unread_count(cur, user_id)}),
+        'isBase64Encoded': False
+    }
+
+def mark_notification_read(cur, conn, body: dict) -> dict:
+    """Отмечает уведомление как прочитанное"""
+    notification_id = body.get('notification_id')
+    
+    if not notification_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'notification_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        cur.execute("""
+            UPDATE t_p4831367_esport_gta_disaster.notifications
+            SET read = true
+            WHERE id = %s AND read = false
+            RETURNING user_id
+        """, (int(notification_id),))
+        updated = cur.fetchone()
+        unread_count = read_unread_count(cur, updated['user_id']) if updated else None
+        conn.commit()
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'message': 'Уведомление прочитано', 'unread_count': unread_count}),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка обновления уведомления: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def mark_all_notifications_read(cur, conn, body: dict) -> dict:
+    """Отмечает все уведомления пользователя как прочитанные"""
+    user_id = body.get('user_id')
+    
+    if not user_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'user_id обязателен'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        cur.execute("""
+            UPDATE t_p4831367_esport_gta_disaster.notifications
+            SET read = true
+            WHERE user_id = %s AND read = false
+        """, (int(user_id),))
+        conn.commit()
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'message': 'Все уведомления прочитаны', 'unread_count': 0}),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка обновления уведомлений: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def notify_tournament_result(cur, conn, tournament_id: int, winner_team_id: int) -> dict:
+    """Отправляет уведомления всем участникам турнира о результатах"""
+    try:
+        # Получаем информацию о турнире и победителе
+        cur.execute(f"""
+            SELECT t.name as tournament_name, team.name as winner_name
+            FROM t_p4831367_esport_gta_disaster.tournaments t
+            LEFT JOIN t_p4831367_esport_gta_disaster.teams team ON team.id = {winner_team_id}
+            WHERE t.id = {tournament_id}
+        """)
+        info = cur.fetchone()
+        
+        if not info:
+            return {'success': False, 'error': 'Турнир не найден'}
+        
+        tournament_name = info['tournament_name']
+        winner_name = info['winner_name']
+        
+        # Получаем всех участников турнира (все команды)
+        cur.execute(f"""
+            SELECT DISTINCT tm.user_id
+            FROM t_p4831367_esport_gta_disaster.tournament_registrations tr
+            JOIN t_p4831367_esport_gta_disaster.team_members tm ON tr.team_id = tm.team_id
+            WHERE tr.tournament_id = {tournament_id} AND tm.status = 'active'
+        """)
+        participants = [row['user_id'] for row in cur.fetchall()]
+        
+        # Отправляем уведомления
+        for user_id in participants:
+            cur.execute(f"""
+                INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+                (user_id, type, title, message, link, read, created_at)
+                VALUES (
+                    {user_id},
+                    'tournament_result',
+                    'Турнир завершен!',
+                    'Турнир "{escape_sql(tournament_name)}" завершен. Победитель: {escape_sql(winner_name)}',
+                    '/tournaments/{tournament_id}',
+                    false,
+                    NOW()
+                )
+            """)
+        
+        conn.commit()
+        return {'success': True, 'notified': len(participants)}
+    except Exception as e:
+        conn.rollback()
+        return {'success': False, 'error': str(e)}
+
+def notify_team_invitation(cur, conn, user_id: int, team_id: int, inviter_name: str) -> dict:
+    """Отправляет уведомление о приглашении в команду"""
+    try:
+        # Получаем название команды
+        cur.execute(f"""
+            SELECT name FROM t_p4831367_esport_gta_disaster.teams
+            WHERE id = {team_id}
+        """)
+        team = cur.fetchone()
+        
+        if not team:
+            return {'success': False, 'error': 'Команда не найдена'}
+        
+        team_name = team['name']
+        
+        cur.execute(f"""
+            INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+            (user_id, type, title, message, link, read, created_at)
+            VALUES (
+                {user_id},
+                'team_invitation',
+                'Приглашение в команду',
+                '{escape_sql(inviter_name)} приглашает вас в команду "{escape_sql(team_name)}"',
+                '/teams/{team_id}',
+                false,
+                NOW()
+            )
+        """)
+        
+        conn.commit()
+        return {'success': True}
+    except Exception as e:
+        conn.rollback()
+        return {'success': False, 'error': str(e)}
+
+def notify_tournament_registration(cur, conn, tournament_id: int, team_id: int, status: str) -> dict:
+    """Отправляет уведомление о статусе регистрации команды на турнир"""
+    try:
+        # Получаем информацию о турнире и команде
+        cur.execute(f"""
+            SELECT t.name as tournament_name, team.name as team_name
+            FROM t_p4831367_esport_gta_disaster.tournaments t
+            CROSS JOIN t_p4831367_esport_gta_disaster.teams team
+            WHERE t.id = {tournament_id} AND team.id = {team_id}
+        """)
+        info = cur.fetchone()
+        
+        if not info:
+            return {'success': False, 'error': 'Турнир или команда не найдены'}
+        
+        tournament_name = info['tournament_name']
+        team_name = info['team_name']
+        
+        # Получаем всех игроков команды
+        cur.execute(f"""
+            SELECT user_id FROM t_p4831367_esport_gta_disaster.team_members
+            WHERE team_id = {team_id} AND status = 'active'
+        """)
+        members = [row['user_id'] for row in cur.fetchall()]
+        
+        # Определяем сообщение в зависимости от статуса
+        if status == 'approved':
+            title = 'Регистрация одобрена!'
+            message = f'Ваша команда "{escape_sql(team_name)}" одобрена для участия в турнире "{escape_sql(tournament_name)}"'
+        elif status == 'rejected':
+            title = 'Регистрация отклонена'
+            message = f'Регистрация команды "{escape_sql(team_name)}" на турнир "{escape_sql(tournament_name)}" отклонена'
+        else:
+            title = 'Статус регистрации изменен'
+            message = f'Статус регистрации команды "{escape_sql(team_name)}" на турнир "{escape_sql(tournament_name)}": {status}'
+        
+        # Отправляем уведомления всем игрокам
+        for user_id in members:
+            cur.execute(f"""
+                INSERT INTO t_p4831367_esport_gta_disaster.notifications 
+                (user_id, type, title, message, link, read, created_at)
+                VALUES (
+                    {user_id},
+                    'tournament_update',
+                    '{escape_sql(title)}',
+                    '{escape_sql(message)}',
+                    '/tournaments/{tournament_id}',
+                    false,
+                    NOW()
+                )
+            """)
+        
+        conn.commit()
+        return {'success': True, 'notified': len(members)}
+    except Exception as e:
+        conn.rollback()
+        return {'success': False, 'error': str(e)}
@@ -0,0 +1,398 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from app_logging import get_logger
+from responses import dumps, json_response
+
+DEFAULT_MATCH_MINUTES = 60
+DEFAULT_REST_MINUTES = 0
+HORIZON_DAYS = 60
+FINISHED_STATUSES = ('completed', 'walkover')
+
+log = get_logger('admin-actions.scheduling')
+
+
+class Timeline:
+    """Непересекающиеся интервалы занятости ресурса в минутах от начала расписания"""
+
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for start, end in merge_intervals(intervals):
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def conflict(self, start: int, end: int):
+        """Конец интервала, пересекающего [start, end), или None"""
+        index = bisect_left(self.starts, end) - 1
+        if index >= 0 and self.ends[index] > start:
+            return self.ends[index]
+        return None
+
+    def add(self, start: int, end: int):
+        """Добавляет интервал, сливая его с пересекающимися (закрепленные матчи могут накладываться)"""
+        index = bisect_left(self.starts, start)
+        if index > 0 and self.ends[index - 1] >= start:
+            index -= 1
+            start = self.starts[index]
+            end = max(end, self.ends[index])
+            del self.starts[index], self.ends[index]
+        while index < len(self.starts) and self.starts[index] <= end:
+            end = max(end, self.ends[index])
+            del self.starts[index], self.ends[index]
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+
+
+class Referee:
+    """Судья: окна доступности, занятость и число назначенных матчей"""
+
+    __slots__ = ('referee_id', 'windows', 'busy', 'load')
+
+    def __init__(self, referee_id: int, windows):
+        self.referee_id = referee_id
+        self.windows = merge_intervals(windows) if windows is not None else None
+        self.busy = Timeline()
+        self.load = 0
+
+    def next_start(self, start: int, duration: int, rest: int):
+        """Ближайшее время >= start, когда судья может провести матч, или None"""
+        while True:
+            if self.windows is not None:
+                window = next((w for w in self.windows if w[1] >= max(start, w[0]) + duration), None)
+                if window is None:
+                    return None
+                start = max(start, window[0])
+            busy_until = self.busy.conflict(start - rest, start + duration + rest)
+            if busy_until is None:
+                return start
+            start = busy_until + rest
+
+
+def merge_intervals(intervals) -> list:
+    merged = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def build_schedule(matches: list, match_minutes, rest_minutes: int = DEFAULT_REST_MINUTES,
+                   referees: dict = None, blackouts: dict = None, rosters: dict = None,
+                   max_parallel: int = None, horizon: int = HORIZON_DAYS * 24 * 60) -> list:
+    """
+    Назначает время начала матчам сетки (жадно, по раундам, в самое раннее допустимое время).
+
+    Время везде в минутах от начала расписания.
+
+    Args:
+        matches: [{'id', 'round', 'match_number', 'team1_id', 'team2_id', 'status',
+                   'start' (уже назначенное время для закрепленных матчей или None),
+                   'fixed' (True, если матч не переназначается)}]
+        match_minutes: длительность матча: число или функция раунд -> минуты
+        rest_minutes: перерыв между матчами одной команды, игрока или судьи
+        referees: {referee_id: [(начало, конец), ...] или None (доступен всегда)};
+                  если не задано, судьи не учитываются
+        blackouts: {team_id: [(начало, конец), ...]} периоды, когда команда не может играть
+        rosters: {team_id: [user_id, ...]} активные игроки (общие игроки разных команд)
+        max_parallel: не больше стольких матчей одновременно
+
+    Матч раунда N+1 начинается после окончания обоих матчей-источников раунда N
+    (match_number 2m-1 и 2m). Пока участник не определен, матч учитывает
+    ограничения всех команд, которые могут в него выйти.
+
+    Returns:
+        list: [{'id', 'start', 'referee_id'}] для незакрепленных матчей
+
+    Raises:
+        ValueError: если матч невозможно поставить в пределах horizon
+    """
+    duration_for = match_minutes if callable(match_minutes) else (lambda round_num: match_minutes)
+    blackouts = {team_id: Timeline(windows) for team_id, windows in (blackouts or {}).items()}
+    rosters = rosters or {}
+    pool = [Referee(referee_id, windows) for referee_id, windows in (referees or {}).items()]
+    referee_by_id = {referee.referee_id: referee for referee in pool}
+    streams = [Timeline() for _ in range(max_parallel)] if max_parallel else None
+    resources = {}
+
+    def resource(key):
+        timeline = resources.get(key)
+        if timeline is None:
+            timeline = resources[key] = Timeline()
+        return timeline
+
+    def occupy(match, start, end):
+        for team_id in match['candidates']:
+            resource(('team', team_id)).add(start, end)
+            for user_id in rosters.get(team_id, ()):
+                resource(('user', user_id)).add(start, end)
+
+    by_position = {(m['round'], m['match_number']): m for m in matches}
+    ordered = sorted(matches, key=lambda m: (m['round'], m['match_number']))
+
+    # Кандидаты в участники: известная команда или все команды, которые могут выйти из матча-источника
+    for match in ordered:
+        candidates = set()
+        for slot, feeder_number in (('team1_id', 2 * match['match_number'] - 1), ('team2_id', 2 * match['match_number'])):
+            if match.get(slot):
+                candidates.add(match[slot])
+            else:
+                feeder = by_position.get((match['round'] - 1, feeder_number))
+                if feeder:
+                    candidates |= feeder['candidates']
+        match['candidates'] = candidates
+        match['end'] = None
+
+    # Закрепленные матчи занимают команды и судей, но не переназначаются
+    for match in ordered:
+        if match['fixed'] and match['start'] is not None and match['status'] not in FINISHED_STATUSES:
+            end = match['start'] + duration_for(match['round'])
+            match['end'] = end
+            occupy(match, match['start'], end + rest_minutes)
+            referee = referee_by_id.get(match.get('referee_id'))
+            if referee:
+                referee.busy.add(match['start'], end)
+                referee.load += 1
+
+    schedule = []
+    for match in ordered:
+        # Пустой слот первого раунда (нет ни команд, ни источников) не играется
+        if match['fixed'] or not match['candidates']:
+            continue
+
+        duration = duration_for(match['round'])
+        start = 0
+        for feeder_number in (2 * match['match_number'] - 1, 2 * match['match_number']):
+            feeder = by_position.get((match['round'] - 1, feeder_number))
+            if not feeder or feeder['status'] in FINISHED_STATUSES or not feeder['candidates']:
+                continue
+            if feeder['end'] is None:
+                raise ValueError(f"Матч {feeder['round']}/{feeder['match_number']} не имеет времени, а от него зависит матч {match['round']}/{match['match_number']}")
+            start = max(start, feeder['end'] + rest_minutes)
+
+        keys = []
+        for team_id in match['candidates']:
+            keys.append(('team', team_id))
+            keys.extend(('user', user_id) for user_id in rosters.get(team_id, ()))
+        timelines = [resource(key) for key in keys]
+        team_blackouts = [blackouts[team_id] for team_id in match['candidates'] if team_id in blackouts]
+
+        while True:
+            if start > horizon:
+                raise ValueError(f"Не удалось найти время для матча {match['round']}/{match['match_number']}")
+            end = start + duration
+
+            # Занятость команд и игроков хранится вместе с перерывом после матча
+            shift = None
+            for timeline in timelines:
+                busy_until = timeline.conflict(start, end + rest_minutes)
+                if busy_until is not None:
+                    shift = max(shift or 0, busy_until)
+            for timeline in team_blackouts:
+                busy_until = timeline.conflict(start, end)
+                if busy_until is not None:
+                    shift = max(shift or 0, busy_until)
+            stream = None
+            if streams is not None:
+                free_at = []
+                for candidate in streams:
+                    busy_until = candidate.conflict(start, end)
+                    if busy_until is None:
+                        stream = candidate
+                        break
+                    free_at.append(busy_until)
+                if stream is None:
+                    shift = max(shift or 0, min(free_at))
+            if shift is not None:
+                start = max(start + 1, shift)
+                continue
+
+            referee = None
+            if pool:
+                next_starts = []
+                for candidate in pool:
+                    available_at = candidate.next_start(start, duration, rest_minutes)
+                    if available_at == start and (referee is None or (candidate.load, candidate.referee_id) < (referee.load, referee.referee_id)):
+                        referee = candidate
+                    elif available_at is not None:
+                        next_starts.append(available_at)
+                if referee is None:
+                    if not next_starts:
+                        raise ValueError(f"Нет свободных судей для матча {match['round']}/{match['match_number']}")
+                    start = min(next_starts)
+                    continue
+            break
+
+        match['start'] = start
+        match['end'] = end
+        occupy(match, start, end + rest_minutes)
+        if stream is not None:
+            stream.add(start, end)
+        if referee is not None:
+            referee.busy.add(start, end)
+            referee.load += 1
+        schedule.append({
+            'id': match['id'],
+            'start': start,
+            'referee_id': referee.referee_id if referee else None
+        })
+
+    return schedule
+
+
+def parse_time(value) -> datetime:
+    """ISO-время из запроса (наивное UTC, как scheduled_at в базе)"""
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo is None else parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_minutes(value, origin: datetime) -> int:
+    return int((parse_time(value) - origin).total_seconds() // 60)
+
+
+def parse_windows(windows, origin: datetime) -> list:
+    """[{'from', 'to'}, ...] -> [(начало, конец)] в минутах от origin"""
+    return [(to_minutes(window['from'], origin), to_minutes(window['to'], origin)) for window in windows or []]
+
+
+def schedule_tournament(cur, conn, admin_id: str, body: dict) -> dict:
+    """
+    Назначает scheduled_at (и судей) матчам сетки с учетом зависимостей раундов.
+
+    body: {
+        'tournament_id': 1,
+        'start_at': '2024-05-01T12:00:00',
+        'match_minutes': 60,
+        'round_minutes': {'3': 90},             # длительность по раундам
+        'rest_minutes': 15,                     # перерыв команды, игрока и судьи между матчами
+        'max_parallel': 4,                      # одновременных матчей (площадки, трансляции)
+        'rounds': [1, 2],                       # по умолчанию все несыгранные раунды
+        'referees': [{'referee_id': 5, 'available': [{'from': ..., 'to': ...}]}],
+        'blackouts': {'12': [{'from': ..., 'to': ...}]},
+        'dry_run': false
+    }
+
+    Все времена записываются одним UPDATE.
+    """
+    tournament_id = body.get('tournament_id')
+    start_at = body.get('start_at')
+
+    if not tournament_id or not start_at:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'tournament_id и start_at обязательны'}),
+            'isBase64Encoded': False
+        }
+
+    try:
+        origin = parse_time(start_at)
+        match_minutes = int(body.get('match_minutes') or DEFAULT_MATCH_MINUTES)
+        round_minutes = {int(round_num): int(minutes) for round_num, minutes in (body.get('round_minutes') or {}).items()}
+        rest_minutes = int(body.get('rest_minutes') or DEFAULT_REST_MINUTES)
+        max_parallel = int(body['max_parallel']) if body.get('max_parallel') else None
+        rounds = {int(round_num) for round_num in body['rounds']} if body.get('rounds') else None
+        referees = {
+            int(referee['referee_id']): parse_windows(referee['available'], origin) if referee.get('available') else None
+            for referee in body.get('referees') or []
+        }
+        blackouts = {int(team_id): parse_windows(windows, origin) for team_id, windows in (body.get('blackouts') or {}).items()}
+    except (ValueError, KeyError, TypeError) as e:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Некорректные параметры расписания: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+    cur.execute("""
+        SELECT bm.id, bm.bracket_id, bm.round, bm.match_number, bm.team1_id, bm.team2_id,
+               bm.status, bm.scheduled_at, bm.referee_id
+        FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+        JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+        WHERE tb.tournament_id = %s
+    """, (int(tournament_id),))
+    rows = cur.fetchall()
+
+    if not rows:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Сетка турнира не найдена'}),
+            'isBase64Encoded': False
+        }
+
+    cur.execute("""
+        SELECT tm.team_id, ARRAY_AGG(tm.user_id) as user_ids
+        FROM t_p4831367_esport_gta_disaster.team_members tm
+        WHERE tm.status = 'active'
+        AND tm.team_id IN (
+            SELECT team_id FROM t_p4831367_esport_gta_disaster.tournament_registrations
+            WHERE tournament_id = %s
+        )
+        GROUP BY tm.team_id
+    """, (int(tournament_id),))
+    rosters = {row['team_id']: row['user_ids'] for row in cur.fetchall()}
+
+    matches = []
+    for row in rows:
+        fixed = row['status'] in FINISHED_STATUSES or (rounds is not None and row['round'] not in rounds)
+        start = None
+        if row['scheduled_at'] is not None:
+            start = int((row['scheduled_at'].replace(tzinfo=None) - origin).total_seconds() // 60)
+        matches.append(dict(row, fixed=fixed, start=start))
+
+    try:
+        schedule = build_schedule(
+            matches,
+            lambda round_num: round_minutes.get(round_num, match_minutes),
+            rest_minutes=rest_minutes,
+            referees=referees or None,
+            blackouts=blackouts,
+            rosters=rosters,
+            max_parallel=max_parallel
+        )
+    except ValueError as e:
+        conn.rollback()
+        return {
+            'statusCode': 409,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': str(e)}),
+            'isBase64Encoded': False
+        }
+
+    for entry in schedule:
+        entry['scheduled_at'] = origin + timedelta(minutes=entry.pop('start'))
+
+    if schedule and not body.get('dry_run'):
+        cur.execute("""
+            UPDATE t_p4831367_esport_gta_disaster.bracket_matches bm
+            SET scheduled_at = s.scheduled_at,
+                referee_id = COALESCE(s.referee_id, bm.referee_id),
+                updated_at = NOW()
+            FROM unnest(%s::int[], %s::timestamp[], %s::int[]) AS s(id, scheduled_at, referee_id)
+            WHERE bm.id = s.id
+        """, (
+            [entry['id'] for entry in schedule],
+            [entry['scheduled_at'] for entry in schedule],
+            [entry['referee_id'] for entry in schedule]
+        ))
+        conn.commit()
+    else:
+        conn.rollback()
+
+    log.info('tournament %s: %s matches scheduled%s', tournament_id, len(schedule), ' (dry run)' if body.get('dry_run') else '')
+
+    return json_response({
+        'success': True,
+        'dry_run': bool(body.get('dry_run')),
+        'schedule': [
+            {'match_id': entry['id'], 'scheduled_at': entry['scheduled_at'], 'referee_id': entry['referee_id']}
+            for entry in schedule
+        ]
+    })
@@ -0,0 +1,86 @@
+import gzip
+import json
+import psycopg2
+from app_logging import get_logger
+from responses import dumps
+
+ARCHIVE_FORMAT_VERSION = 1
+ARCHIVE_CACHE_SIZE = 100
+
+# tournament_id -> (распакованный архив, archived_at)
+_cache = {}
+
+log = get_logger('admin-actions.archive')
+
+
+def archive_tournament(cur, tournament_id: int) -> int:
+    """
+    Замораживает состояние завершенного турнира в tournament_archives
+    (в транзакции вызывающего кода). Существующий архив не перезаписывается.
+
+    Returns:
+        int: Размер сжатого архива в байтах (0, если турнир не найден или архив уже есть)
+    """
+    from brackets import fetch_bracket, fetch_group_stage
+    from tournaments import fetch_registrations, fetch_tournament
+
+    tournament = fetch_tournament(cur, tournament_id)
+    if not tournament:
+        return 0
+
+    snapshot = {
+        'tournament': tournament,
+        'registrations': fetch_registrations(cur, tournament_id),
+        'bracket': fetch_bracket(cur, tournament_id),
+        'group_stage': fetch_group_stage(cur, tournament_id)
+    }
+    data = gzip.compress(dumps(snapshot).encode('utf-8'), 9)
+
+    cur.execute("""
+        INSERT INTO t_p4831367_esport_gta_disaster.tournament_archives (tournament_id, format_version, encoding, data)
+        VALUES (%s, %s, 'gzip', %s)
+        ON CONFLICT (tournament_id) DO NOTHING
+        RETURNING tournament_id
+    """, (tournament_id, ARCHIVE_FORMAT_VERSION, psycopg2.Binary(data)))
+    if not cur.fetchone():
+        return 0
+
+    log.info('tournament %s archived: %s bytes', tournament_id, len(data))
+    return len(data)
+
+
+def load_tournament_archive(cur, tournament_id: int):
+    """
+    Архив турнира одной строкой по первичному ключу.
+
+    archived_at проверяется при каждом чтении: сжатые данные передаются и
+    распаковываются, только если архив появился или пересоздан после записи
+    в кэш, а удаленный архив (турнир вернули из завершенных) сразу перестает
+    отдаваться на всех инстансах.
+
+    Returns:
+        dict | None: {'tournament', 'registrations', 'bracket', 'group_stage'}
+        или None, если турнир не архивирован
+    """
+    cached = _cache.get(tournament_id)
+    cached_at = cached[1] if cached else None
+
+    cur.execute("""
+        SELECT archived_at,
+               CASE WHEN archived_at IS DISTINCT FROM %s THEN data END as data
+        FROM t_p4831367_esport_gta_disaster.tournament_archives
+        WHERE tournament_id = %s
+    """, (cached_at, tournament_id))
+    row = cur.fetchone()
+    if not row:
+        _cache.pop(tournament_id, None)
+        return None
+
+    if row['data'] is None:
+        return cached[0]
+
+    archive = json.loads(gzip.decompress(bytes(row['data'])))
+    if tournament_id not in _cache and len(_cache) >= ARCHIVE_CACHE_SIZE:
+        _cache.pop(next(iter(_cache)))
+    _cache[tournament_id] = (archive, row['archived_at'])
+    return archive
@@ -0,0 +1,119 @@
+import time
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from brackets import fetch_bracket, fetch_group_stage
+from bracket_snapshots import fetch_bracket_snapshot
+from responses import dumps
+from tournament_archive import load_tournament_archive
+from tournaments import fetch_registrations, fetch_tournament
+
+PAGE_CACHE_TTL_SECONDS = 10
+PAGE_CACHE_SIZE = 200
+PAGE_PARTS = ('registrations', 'bracket', 'groups')
+
+# (tournament_id, части) -> (готовое JSON-тело страницы, время записи)
+_cache = {}
+
+
+def parse_include(value) -> tuple:
+    """Список частей страницы из include (список или строка через запятую); по умолчанию все"""
+    if not value:
+        return PAGE_PARTS
+    if isinstance(value, str):
+        value = value.split(',')
+    requested = {str(part).strip() for part in value}
+    return tuple(part for part in PAGE_PARTS if part in requested)
+
+
+def build_tournament_page(cur, conn, tournament_id: int, include: tuple):
+    """
+    Турнир и запрошенные части страницы в одной транзакции
+    (REPEATABLE READ: все части видят один снимок данных).
+
+    Если транзакция уже открыта вызывающим кодом, чтение идет в ней.
+    Завершенный турнир целиком берется из архива.
+
+    Returns:
+        dict | None: Данные страницы или None, если турнир не найден
+    """
+    own_transaction = conn.info.transaction_status == TRANSACTION_STATUS_IDLE
+    if own_transaction:
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+    try:
+        archive = load_tournament_archive(cur, tournament_id)
+        if archive:
+            page = {'tournament': archive['tournament']}
+            if 'registrations' in include:
+                page['registrations'] = archive['registrations']
+            if 'bracket' in include:
+                page['bracket'] = archive['bracket']
+                page['bracket_snapshot'] = fetch_bracket_snapshot(cur, tournament_id)
+            if 'groups' in include:
+                page['groups'] = archive['group_stage']
+            return page
+
+        tournament = fetch_tournament(cur, tournament_id)
+        if not tournament:
+            return None
+
+        page = {'tournament': tournament}
+        if 'registrations' in include:
+            page['registrations'] = fetch_registrations(cur, tournament_id)
+        if 'bracket' in include:
+            page['bracket'] = fetch_bracket(cur, tournament_id)
+            page['bracket_snapshot'] = fetch_bracket_snapshot(cur, tournament_id)
+        if 'groups' in include:
+            page['groups'] = fetch_group_stage(cur, tournament_id)
+        return page
+    finally:
+        if own_transaction:
+            conn.commit()
+
+
+def get_tournament_page(cur, conn, body: dict) -> dict:
+    """
+    Страница турнира одним вызовом: турнир, заявки, сетка и групповая стадия.
+
+    Части выбираются параметром include (registrations, bracket, groups).
+    Готовое тело ответа кэшируется на PAGE_CACHE_TTL_SECONDS целиком.
+    """
+    tournament_id = body.get('tournament_id')
+
+    if not tournament_id:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'tournament_id обязателен'}),
+            'isBase64Encoded': False
+        }
+
+    tournament_id = int(tournament_id)
+    include = parse_include(body.get('include'))
+    key = (tournament_id, include)
+    now = time.monotonic()
+
+    cached = _cache.get(key)
+    if cached and now - cached[1] <= PAGE_CACHE_TTL_SECONDS:
+        payload = cached[0]
+    else:
+        page = build_tournament_page(cur, conn, tournament_id, include)
+        if page is None:
+            _cache.pop(key, None)
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Турнир не найден'}),
+                'isBase64Encoded': False
+            }
+
+        payload = dumps(page)
+        if len(_cache) >= PAGE_CACHE_SIZE:
+            oldest = min(_cache, key=lambda item: _cache[item][1])
+            del _cache[oldest]
+        _cache[key] = (payload, now)
+
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': payload,
+        'isBase64Encoded': False
+    }
@@ -0,0 +1,635 @@
+import json
+import psycopg2
+from app_logging import get_logger
+from common import escape_sql, log_admin_action
+from notifications import notify_tournament_registration
+from responses import dumps, json_response
+from tournament_archive import archive_tournament, load_tournament_archive
+
+log = get_logger('admin-actions.tournaments')
+
+def create_tournament(cur, conn, admin_id: str, body: dict) -> dict:
+    """Создает турнир"""
+    
+    name = body.get('name')
+    description = body.get('description')
+    game = body.get('game_project', 'GTA V')
+    game_mode = body.get('game_mode')
+    start_date = body.get('start_date')
+    end_date = body.get('end_date')
+    registration_start = body.get('registration_start')
+    registration_end = body.get('registration_end')
+    max_teams = body.get('max_participants', 16)
+    prize_pool = body.get('prize_pool')
+    rules = body.get('rules')
+    format_value = body.get('format', 'single-elimination')
+    location = body.get('location')
+    team_size = body.get('team_size')
+    best_of = body.get('best_of')
+    map_pool = body.get('map_pool')
+    bracket_style = body.get('bracket_style', 'esports')
+    starting_stage = body.get('starting_stage', 16)
+    
+    if not name or not start_date:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Название и дата начала обязательны'}),
+            'isBase64Encoded': False
+        }
+    
+    # Конвертируем map_pool в JSON строку
+    map_pool_json = None
+    if map_pool and isinstance(map_pool, list):
+        map_pool_json = json.dumps(map_pool)
+    
+    try:
+        cur.execute("""
+            INSERT INTO t_p4831367_esport_gta_disaster.tournaments 
+            (name, description, game, start_date, end_date, 
+             max_teams, prize_pool, rules, format, created_by, location, team_size, best_of, map_pool, 
+             bracket_style, starting_stage, status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'upcoming')
+            RETURNING id
+        """, (name, description, game, start_date, end_date,
+              max_teams, prize_pool, rules, format_value, admin_id, location, team_size, best_of, map_pool_json,
+              bracket_style, starting_stage))
+        
+        tournament_id = cur.fetchone()['id']
+        conn.commit()
+        
+        # Логируем создание турнира
+        log_admin_action(cur, conn, admin_id, 'tournament_create', 
+                         f"Создал турнир '{name}'", 'tournament', tournament_id)
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'message': 'Турнир создан', 'tournament_id': tournament_id}),
+            'isBase64Encoded': False
+        }
+    except psycopg2.IntegrityError as e:
+        conn.rollback()
+        error_msg = str(e)
+        if 'unique constraint' in error_msg.lower() or 'duplicate key' in error_msg.lower():
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Турнир с таким названием уже существует'}),
+                'isBase64Encoded': False
+            }
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка базы данных: {error_msg}'}),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Неожиданная ошибка: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def toggle_tournament_visibility(cur, conn, admin_id, body: dict) -> dict:
+    """Скрывает или показывает турнир"""
+    try:
+        tournament_id = body.get('tournament_id')
+        is_hidden = body.get('is_hidden', True)
+        
+        if not tournament_id:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Не указан ID турнира'}),
+                'isBase64Encoded': False
+            }
+        
+        cur.execute("""
+            UPDATE t_p4831367_esport_gta_disaster.tournaments 
+            SET is_hidden = %s, updated_at = NOW() 
+            WHERE id = %s
+        """, (is_hidden, int(tournament_id)))
+        
+        conn.commit()
+        
+        action_text = 'скрыт' if is_hidden else 'показан'
+        
+        # Логируем изменение видимости
+        log_admin_action(cur, conn, admin_id, 'tournament_visibility', 
+                         f"{'Скрыл' if is_hidden else 'Показал'} турнир", 'tournament', int(tournament_id))
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({
+                'success': True,
+                'message': f'Турнир успешно {action_text}'
+            }),
+            'isBase64Encoded': False
+        }
+        
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка при изменении видимости: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def delete_tournament(cur, conn, admin_id: str, body: dict) -> dict:
+    """Удаляет турнир"""
+    
+    tournament_id = body.get('tournament_id')
+    
+    cur.execute(f"""
+        DELETE FROM t_p4831367_esport_gta_disaster.tournaments WHERE id = {int(tournament_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Турнир удален'}),
+        'isBase64Encoded': False
+    }
+
+def get_tournaments(cur, conn, body: dict = None) -> dict:
+    """Получает список всех турниров (скрытые только для админов)"""
+    
+    show_hidden = body.get('show_hidden', False) if body else False
+    
+    if show_hidden:
+        cur.execute("""
+            SELECT id, name, description, game, start_date, end_date, max_teams, prize_pool, 
+                   rules, format, status, created_by, created_at, registration_open, is_hidden
+            FROM t_p4831367_esport_gta_disaster.tournaments
+            WHERE removed = 0 OR removed IS NULL
+            ORDER BY start_date DESC
+        """)
+    else:
+        cur.execute("""
+            SELECT id, name, description, game, start_date, end_date, max_teams, prize_pool, 
+                   rules, format, status, created_by, created_at, registration_open, is_hidden
+            FROM t_p4831367_esport_gta_disaster.tournaments
+            WHERE (is_hidden = FALSE OR is_hidden IS NULL) AND (removed = 0 OR removed IS NULL)
+            ORDER BY start_date DESC
+        """)
+    
+    tournaments = []
+    for row in cur.fetchall():
+        tournaments.append({
+            'id': row['id'],
+            'name': row['name'],
+            'description': row['description'],
+            'game': row['game'],
+            'start_date': row['start_date'].isoformat() if row['start_date'] else None,
+            'end_date': row['end_date'].isoformat() if row['end_date'] else None,
+            'max_teams': row['max_teams'],
+            'prize_pool': row['prize_pool'],
+            'rules': row['rules'],
+            'format': row['format'],
+            'status': row['status'],
+            'created_by': row['created_by'],
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+            'registration_open': row['registration_open'],
+            'is_hidden': row.get('is_hidden', False)
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'tournaments': tournaments}),
+        'isBase64Encoded': False
+    }
+
+def fetch_tournament(cur, tournament_id: int):
+    """Строка турнира (без регистраций) или None"""
+    cur.execute("""
+        SELECT id, name, description, game, start_date, end_date, max_teams, prize_pool,
+               rules, format, status, created_by, created_at, registration_open
+        FROM t_p4831367_esport_gta_disaster.tournaments
+        WHERE id = %s
+    """, (tournament_id,))
+    return cur.fetchone()
+
+def fetch_registrations(cur, tournament_id: int) -> list:
+    """Заявки команд на турнир в порядке регистрации"""
+    cur.execute("""
+        SELECT tr.id, tr.team_id, t.name AS team_name, t.tag AS team_tag, t.logo_url AS team_logo,
+               t.rating AS team_rating, tr.status, tr.registered_at
+        FROM t_p4831367_esport_gta_disaster.tournament_registrations tr
+        JOIN t_p4831367_esport_gta_disaster.teams t ON tr.team_id = t.id
+        WHERE tr.tournament_id = %s
+        ORDER BY tr.registered_at
+    """, (tournament_id,))
+    return cur.fetchall()
+
+def get_tournament(cur, conn, body: dict) -> dict:
+    """Получает информацию о турнире"""
+    
+    tournament_id = body.get('tournament_id')
+    
+    archive = load_tournament_archive(cur, int(tournament_id))
+    if archive:
+        return json_response({
+            'tournament': dict(archive['tournament'], registered_teams=archive['registrations']),
+            'id': archive['tournament']['id'],
+            'name': archive['tournament']['name'],
+            'registrations': archive['registrations']
+        })
+    
+    tournament = fetch_tournament(cur, int(tournament_id))
+    
+    if not tournament:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Турнир не найден'}),
+            'isBase64Encoded': False
+        }
+    
+    registered_teams = fetch_registrations(cur, tournament['id'])
+    tournament['registered_teams'] = registered_teams
+    
+    return json_response({
+        'tournament': tournament,
+        'id': tournament['id'],
+        'name': tournament['name'],
+        'registrations': registered_teams
+    })
+
+def register_team(cur, conn, body: dict) -> dict:
+    """Регистрирует команду на турнир"""
+    
+    tournament_id = body.get('tournament_id')
+    team_id = body.get('team_id')
+    user_id = body.get('user_id')
+    
+    if not all([tournament_id, team_id]):
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Необходимо указать tournament_id и team_id'}),
+            'isBase64Encoded': False
+        }
+    
+    try:
+        # Проверка, что команда существует
+        cur.execute("""
+            SELECT id, name, tag, logo_url, rating, captain_id 
+            FROM t_p4831367_esport_gta_disaster.teams 
+            WHERE id = %s
+        """, (int(team_id),))
+        
+        team = cur.fetchone()
+        
+        if not team:
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Команда не найдена'}),
+                'isBase64Encoded': False
+            }
+        
+        # Проверка, что пользователь - капитан команды (если передан user_id)
+        if user_id and team['captain_id'] != int(user_id):
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Только капитан может регистрировать команду'}),
+                'isBase64Encoded': False
+            }
+        
+        # Резервируем место: строка турнира блокируется до конца транзакции,
+        # одновременные регистрации перепроверяют условие после блокировки
+        cur.execute("""
+            UPDATE t_p4831367_esport_gta_disaster.tournaments
+            SET registered_count = registered_count + 1
+            WHERE id = %s
+              AND registration_open
+              AND (max_teams IS NULL OR registered_count < max_teams)
+            RETURNING id, name, max_teams, registered_count
+        """, (int(tournament_id),))
+        
+        tournament = cur.fetchone()
+        
+        if not tournament:
+            conn.rollback()
+            return registration_rejected(cur, int(tournament_id))
+        
+        # Регистрация команды (повторная заявка отменяет резерв)
+        cur.execute("""
+            INSERT INTO t_p4831367_esport_gta_disaster.tournament_registrations 
+            (tournament_id, tournament_name, team_id, status, registered_at) 
+            VALUES (%s, %s, %s, 'pending', NOW())
+            ON CONFLICT (tournament_id, team_id) DO NOTHING
+            RETURNING id, status, registered_at
+        """, (int(tournament_id), tournament['name'], int(team_id)))
+        
+        registration = cur.fetchone()
+        
+        if not registration:
+            conn.rollback()
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Команда уже зарегистрирована на этот турнир'}),
+                'isBase64Encoded': False
+            }
+        
+        conn.commit()
+        
+        # Ответ содержит только новую заявку (в формате get_tournament) и счетчик
+        return json_response({
+            'success': True,
+            'message': f'Команда "{team["name"]}" успешно зарегистрирована на турнир',
+            'registration': {
+                'id': registration['id'],
+                'team_id': team['id'],
+                'team_name': team['name'],
+                'team_tag': team['tag'],
+                'team_logo': team['logo_url'],
+                'team_rating': team['rating'],
+                'status': registration['status'],
+                'registered_at': registration['registered_at']
+            },
+            'registered_count': tournament['registered_count'],
+            'max_teams': tournament['max_teams']
+        })
+        
+    except Exception as e:
+        conn.rollback()
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка регистрации: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def registration_rejected(cur, tournament_id: int) -> dict:
+    """Причина отказа, когда место на турнире зарезервировать не удалось"""
+    cur.execute("""
+        SELECT registration_open 
+        FROM t_p4831367_esport_gta_disaster.tournaments 
+        WHERE id = %s
+    """, (tournament_id,))
+    
+    tournament = cur.fetchone()
+    
+    if not tournament:
+        status, error = 404, 'Турнир не найден'
+    elif not tournament['registration_open']:
+        status, error = 400, 'Регистрация на турнир закрыта'
+    else:
+        status, error = 400, 'Достигнуто максимальное количество команд'
+    
+    return {
+        'statusCode': status,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'error': error}),
+        'isBase64Encoded': False
+    }
+
+def update_tournament_status(cur, conn, admin_id: str, body: dict) -> dict:
+    """Обновляет статус турнира"""
+    
+    tournament_id = body.get('tournament_id')
+    status = body.get('status')
+    
+    # Если турнир становится активным или завершенным, закрываем регистрацию
+    registration_open = True if status == 'upcoming' else False
+    
+    cur.execute(f"""
+        UPDATE tournaments
+        SET status = '{escape_sql(status)}', registration_open = {registration_open}
+        WHERE id = {int(tournament_id)}
+    """)
+    
+    # Завершенный турнир больше не меняется: замораживаем его в архив
+    # (при любом другом статусе архив удаляет триггер trg_tournaments_drop_archive)
+    if status == 'completed':
+        archive_tournament(cur, int(tournament_id))
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Статус турнира обновлен'}),
+        'isBase64Encoded': False
+    }
+
+def hide_tournament(cur, conn, admin_id: str, body: dict) -> dict:
+    """Скрывает турнир"""
+    
+    tournament_id = body.get('tournament_id')
+    hidden = body.get('hidden', True)
+    
+    cur.execute(f"""
+        UPDATE tournaments
+        SET hidden = {str(hidden).upper()}
+        WHERE id = {int(tournament_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Статус видимости турнира обновлен'}),
+        'isBase64Encoded': False
+    }
+
+def start_tournament(cur, conn, admin_id: str, body: dict) -> dict:
+    """Запускает турнир"""
+    
+    tournament_id = body.get('tournament_id')
+    
+    cur.execute(f"""
+        UPDATE tournaments
+        SET status = 'active'
+        WHERE id = {int(tournament_id)}
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'message': 'Турнир запущен'}),
+        'isBase64Encoded': False
+    }
+
+def get_admin_tournaments(cur, conn) -> dict:
+    """Получает турниры для администрирования"""
+    
+    cur.execute("""
+        SELECT t.id, t.name, t.game, t.status, t.start_date, t.max_teams,
+               COUNT(DISTINCT tr.id) as registered_teams
+        FROM t_p4831367_esport_gta_disaster.tournaments t
+        LEFT JOIN tournament_registrations tr ON t.id = tr.tournament_id
+        GROUP BY t.id, t.name, t.game, t.status, t.start_date, t.max_teams
+        ORDER BY t.start_date DESC
+    """)
+    
+    tournaments = []
+    for row in cur.fetchall():
+        tournaments.append({
+            'id': row[0],
+            'name': row[1],
+            'game': row[2],
+            'status': row[3],
+            'start_date': row[4].isoformat() if row[4] else None,
+            'max_teams': row[5],
+            'registered_teams': row[6]
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'tournaments': tournaments}),
+        'isBase64Encoded': False
+    }
+
+def approve_registration(cur, conn, admin_id: str, body: dict) -> dict:
+    """Одобряет регистрацию команды на турнир"""
+    
+    registration_id = body.get('registration_id') or body.get('application_id')
+    approved = body.get('approved', True)
+    
+    if approved is None or approved == 'pending':
+        status = 'pending'
+    else:
+        status = 'approved' if approved else 'rejected'
+    
+    # Получаем информацию о регистрации
+    cur.execute(f"""
+        SELECT team_id, tournament_id
+        FROM t_p4831367_esport_gta_disaster.tournament_registrations
+        WHERE id = {int(registration_id)}
+    """)
+    reg_info = cur.fetchone()
+    
+    if reg_info:
+        team_id = reg_info['team_id']
+        tournament_id = reg_info['tournament_id']
+        
+        # Обновляем статус
+        cur.execute(f"""
+            UPDATE t_p4831367_esport_gta_disaster.tournament_registrations
+            SET status = '{escape_sql(status)}'
+            WHERE id = {int(registration_id)}
+        """)
+        
+        # Отправляем уведомления игрокам команды
+        try:
+            notify_tournament_registration(cur, conn, tournament_id, team_id, status)
+        except Exception as e:
+            log.warning('failed to send notifications: %s', e)
+    
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': f'Регистрация {status}'}),
+        'isBase64Encoded': False
+    }
+
+def reject_registration(cur, conn, admin_id: str, body: dict) -> dict:
+    """Отклоняет регистрацию команды на турнир"""
+    
+    registration_id = body.get('registration_id') or body.get('application_id')
+    
+    # Получаем информацию о регистрации
+    cur.execute(f"""
+        SELECT team_id, tournament_id
+        FROM t_p4831367_esport_gta_disaster.tournament_registrations
+        WHERE id = {int(registration_id)}
+    """)
+    reg_info = cur.fetchone()
+    
+    if reg_info:
+        team_id = reg_info['team_id']
+        tournament_id = reg_info['tournament_id']
+        
+        # Обновляем статус
+        cur.execute(f"""
+            UPDATE t_p4831367_esport_gta_disaster.tournament_registrations
+            SET status = 'rejected'
+            WHERE id = {int(registration_id)}
+        """)
+        
+        # Отправляем уведомления игрокам команды
+        try:
+            notify_tournament_registration(cur, conn, tournament_id, team_id, 'rejected')
+        except Exception as e:
+            log.warning('failed to send notifications: %s', e)
+    
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Регистрация отклонена'}),
+        'isBase64Encoded': False
+    }
+
+def delete_all_tournaments(cur, conn, admin_id: str) -> dict:
+    """Удаление всех турниров и связанных данных"""
+    try:
+        # Проверка прав доступа
+        cur.execute("SELECT role FROM t_p4831367_esport_gta_disaster.users WHERE id = %s", (int(admin_id),))
+        admin = cur.fetchone()
+        
+        if not admin or admin['role'] not in ['admin', 'founder']:
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Недостаточно прав для удаления турниров'}),
+                'isBase64Encoded': False
+            }
+        
+        # Подсчитываем количество турниров
+        cur.execute("SELECT COUNT(*) as count FROM t_p4831367_esport_gta_disaster.tournaments")
+        count_result = cur.fetchone()
+        total_tournaments = count_result['count']
+        
+        # Удаляем связанные данные
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.bracket_matches")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.tournament_brackets")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.tournament_registrations")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.tournament_exclusions")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.tournament_suspensions")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.group_stage_matches")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.bracket_stages")
+        
+        # Удаляем все турниры
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.tournaments")
+        
+        conn.commit()
+        
+        # Логирование
+        log_admin_action(cur, conn, admin_id, 'delete_all_tournaments', 
+                        f'Удалено {total_tournaments} турниров и все связанные данные', 
+                        'tournaments', None)
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'message': f'Удалено турниров: {total_tournaments}'}),
+            'isBase64Encoded': False
+        }
+        
+    except Exception as e:
+        conn.rollback()
+        import traceback
+        error_msg = traceback.format_exc()
+        log.error('delete_all_tournaments failed: %s', error_msg)
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка при удалении турниров: {str(e)}'}),
+            'isBase64Encoded': False
+        }
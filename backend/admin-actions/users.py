@@ -0,0 +1,562 @@
+from app_logging import get_logger
+from common import escape_sql, log_admin_action
+from responses import dumps, json_response
+
+log = get_logger('admin-actions.users')
+
+def get_all_users(cur, conn) -> dict:
+    """Получить всех пользователей для выбора в админке"""
+    try:
+        cur.execute("""
+            SELECT 
+                id,
+                nickname,
+                email,
+                role,
+                created_at
+            FROM t_p4831367_esport_gta_disaster.users
+            ORDER BY created_at DESC
+        """)
+        return json_response({'users': cur.fetchall()})
+    except Exception as e:
+        import traceback
+        error_msg = traceback.format_exc()
+        log.error('get_all_users failed: %s', error_msg)
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': str(e), 'traceback': error_msg}),
+            'isBase64Encoded': False
+        }
+
+def get_dashboard_stats(cur, conn) -> dict:
+    """Получает статистику для дашборда"""
+    
+    try:
+        cur.execute("SELECT COUNT(*) as cnt FROM t_p4831367_esport_gta_disaster.users")
+        result = cur.fetchone()
+        total_users = result['cnt'] if result else 0
+        
+        cur.execute("SELECT COUNT(*) as cnt FROM t_p4831367_esport_gta_disaster.tournaments WHERE status = 'active'")
+        result = cur.fetchone()
+        active_tournaments = result['cnt'] if result else 0
+        
+        cur.execute("SELECT COUNT(*) as cnt FROM t_p4831367_esport_gta_disaster.news")
+        result = cur.fetchone()
+        published_news = result['cnt'] if result else 0
+        
+        cur.execute("SELECT COUNT(*) as cnt FROM t_p4831367_esport_gta_disaster.bans")
+        result = cur.fetchone()
+        active_bans = result['cnt'] if result else 0
+        
+        cur.execute("SELECT COUNT(*) as cnt FROM t_p4831367_esport_gta_disaster.mutes")
+        result = cur.fetchone()
+        active_mutes = result['cnt'] if result else 0
+        
+        cur.execute("SELECT COUNT(*) as cnt FROM t_p4831367_esport_gta_disaster.teams")
+        result = cur.fetchone()
+        total_teams = result['cnt'] if result else 0
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({
+                'stats': {
+                    'total_users': total_users,
+                    'active_tournaments': active_tournaments,
+                    'published_news': published_news,
+                    'active_bans': active_bans,
+                    'active_mutes': active_mutes,
+                    'total_teams': total_teams
+                }
+            }),
+            'isBase64Encoded': False
+        }
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка получения статистики: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def assign_role(cur, conn, admin_id: str, admin_role: str, body: dict) -> dict:
+    """Назначает роль пользователю"""
+    
+    if admin_role != 'founder':
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Только основатель может назначать роли'}),
+            'isBase64Encoded': False
+        }
+    
+    user_id = body.get('user_id')
+    role = body.get('role')
+    
+    if role not in ['admin', 'organizer', 'referee', 'manager', 'user']:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Недопустимая роль'}),
+            'isBase64Encoded': False
+        }
+    
+    # Получаем информацию о пользователе
+    cur.execute(f"SELECT nickname FROM t_p4831367_esport_gta_disaster.users WHERE id = {int(user_id)}")
+    target_user = cur.fetchone()
+    target_nickname = target_user['nickname'] if target_user else 'Unknown'
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.users
+        SET role = '{escape_sql(role)}'
+        WHERE id = '{escape_sql(user_id)}'
+    """)
+    
+    cur.execute(f"""
+        INSERT INTO t_p4831367_esport_gta_disaster.role_history (user_id, assigned_by, role, action)
+        VALUES ('{escape_sql(user_id)}', '{escape_sql(admin_id)}', '{escape_sql(role)}', 'assigned')
+    """)
+    
+    # Логируем действие
+    role_names = {'admin': 'Администратор', 'organizer': 'Организатор', 'referee': 'Судья', 'manager': 'Руководитель', 'user': 'Пользователь'}
+    log_admin_action(cur, conn, admin_id, 'role_change', 
+                     f"Назначил роль '{role_names.get(role, role)}' пользователю {target_nickname}", 
+                     'user', int(user_id))
+    
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Роль назначена'}),
+        'isBase64Encoded': False
+    }
+
+def revoke_role(cur, conn, admin_id: str, admin_role: str, body: dict) -> dict:
+    """Отзывает роль у пользователя"""
+    
+    if admin_role != 'founder':
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Только основатель может отзывать роли'}),
+            'isBase64Encoded': False
+        }
+    
+    user_id = body.get('user_id')
+    
+    cur.execute(f"""
+        SELECT role, nickname FROM t_p4831367_esport_gta_disaster.users WHERE id = '{escape_sql(user_id)}'
+    """)
+    
+    current_user = cur.fetchone()
+    
+    if not current_user:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Пользователь не найден'}),
+            'isBase64Encoded': False
+        }
+    
+    old_role = current_user['role']
+    user_nickname = current_user['nickname']
+    
+    cur.execute(f"""
+        UPDATE t_p4831367_esport_gta_disaster.users
+        SET role = 'user'
+        WHERE id = '{escape_sql(user_id)}'
+    """)
+    
+    cur.execute(f"""
+        INSERT INTO t_p4831367_esport_gta_disaster.role_history (user_id, assigned_by, role, action)
+        VALUES ('{escape_sql(user_id)}', '{escape_sql(admin_id)}', '{escape_sql(old_role)}', 'revoked')
+    """)
+    
+    # Логируем снятие роли
+    role_names = {'admin': 'Администратор', 'organizer': 'Организатор', 'referee': 'Судья', 'manager': 'Руководитель'}
+    log_admin_action(cur, conn, admin_id, 'role_change', 
+                     f"Снял роль '{role_names.get(old_role, old_role)}' у пользователя {user_nickname}", 
+                     'user', int(user_id))
+    
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Роль отозвана'}),
+        'isBase64Encoded': False
+    }
+
+def get_staff(cur, conn) -> dict:
+    """Получает список сотрудников"""
+    
+    cur.execute("""
+        SELECT id, nickname, email, role, avatar_url, created_at
+        FROM t_p4831367_esport_gta_disaster.users
+        WHERE role IN ('admin', 'founder', 'organizer', 'referee', 'manager')
+        ORDER BY 
+            CASE role
+                WHEN 'founder' THEN 1
+                WHEN 'admin' THEN 2
+                WHEN 'organizer' THEN 3
+                WHEN 'referee' THEN 4
+                WHEN 'manager' THEN 5
+            END,
+            nickname
+    """)
+    
+    staff = []
+    for row in cur.fetchall():
+        staff.append({
+            'id': row['id'],
+            'nickname': row['nickname'],
+            'email': row['email'],
+            'role': row['role'],
+            'avatar_url': row['avatar_url'],
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'staff': staff}),
+        'isBase64Encoded': False
+    }
+
+def get_role_history(cur, conn, body: dict) -> dict:
+    """Получает историю изменения ролей пользователя"""
+    
+    user_id = body.get('user_id')
+    
+    cur.execute(f"""
+        SELECT rh.id, rh.user_id, u1.username, rh.assigned_by, u2.username, rh.role, rh.action, rh.created_at
+        FROM t_p4831367_esport_gta_disaster.role_history rh
+        JOIN t_p4831367_esport_gta_disaster.users u1 ON rh.user_id = u1.id
+        JOIN t_p4831367_esport_gta_disaster.users u2 ON rh.assigned_by = u2.id
+        WHERE rh.user_id = '{escape_sql(user_id)}'
+        ORDER BY rh.created_at DESC
+    """)
+    
+    history = []
+    for row in cur.fetchall():
+        history.append({
+            'id': row[0],
+            'user_id': row[1],
+            'username': row[2],
+            'assigned_by': row[3],
+            'assigned_by_username': row[4],
+            'role': row[5],
+            'action': row[6],
+            'created_at': row[7].isoformat() if row[7] else None
+        })
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'history': history}),
+        'isBase64Encoded': False
+    }
+
+def get_settings(cur, conn):
+    """Получение всех настроек сайта"""
+    cur.execute("""
+        SELECT key, value, description, updated_at
+        FROM site_settings
+        ORDER BY key
+    """)
+    settings = cur.fetchall()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({
+            'settings': [{
+                'key': s[0],
+                'value': s[1],
+                'description': s[2],
+                'updated_at': s[3].isoformat() if s[3] else None
+            } for s in settings]
+        }),
+        'isBase64Encoded': False
+    }
+
+def update_setting(cur, conn, admin_id: str, body: dict, admin_role: str):
+    """Обновление настройки сайта"""
+    if admin_role not in ['founder', 'organizer']:
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': 'Только основатель или организатор может изменять настройки'}),
+            'isBase64Encoded': False
+        }
+    
+    key = escape_sql(body.get('key', ''))
+    value = escape_sql(body.get('value', ''))
+    
+    cur.execute(f"""
+        UPDATE site_settings 
+        SET value = '{value}', updated_at = CURRENT_TIMESTAMP, updated_by = '{escape_sql(admin_id)}'
+        WHERE key = '{key}'
+    """)
+    conn.commit()
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'message': 'Настройка обновлена'}),
+        'isBase64Encoded': False
+    }
+
+def get_admin_logs(cur, conn, body: dict) -> dict:
+    """Получить последние действия администраторов и судей"""
+    try:
+        limit = body.get('limit', 20)
+        
+        # Пробуем получить логи из admin_action_logs
+        cur.execute(f"""
+            SELECT 
+                al.id,
+                u.nickname as admin_name,
+                u.role as admin_role,
+                al.action_description as action,
+                al.created_at as timestamp,
+                al.action_type,
+                al.target_type
+            FROM t_p4831367_esport_gta_disaster.admin_action_logs al
+            JOIN t_p4831367_esport_gta_disaster.users u ON al.admin_id = u.id
+            WHERE u.role IN ('admin', 'founder', 'organizer', 'referee')
+            ORDER BY al.created_at DESC
+            LIMIT {limit}
+        """)
+        
+        logs_from_table = cur.fetchall()
+        
+        # Если таблица пустая, получаем логи из истории ролей как fallback
+        if not logs_from_table:
+            cur.execute(f"""
+                SELECT 
+                    rh.id,
+                    u_admin.nickname as admin_name,
+                    u_admin.role as admin_role,
+                    CASE 
+                        WHEN rh.action = 'assigned' THEN 'Назначил роль ' || rh.role
+                        WHEN rh.action = 'revoked' THEN 'Снял роль с пользователя'
+                        ELSE rh.action
+                    END as action,
+                    rh.created_at as timestamp
+                FROM t_p4831367_esport_gta_disaster.role_history rh
+                JOIN t_p4831367_esport_gta_disaster.users u_admin ON rh.assigned_by = u_admin.id
+                WHERE u_admin.role IN ('admin', 'founder', 'organizer', 'referee')
+                ORDER BY rh.created_at DESC
+                LIMIT {limit}
+            """)
+            logs = cur.fetchall()
+        else:
+            logs = logs_from_table
+        
+        return json_response({'logs': logs})
+    except Exception as e:
+        import traceback
+        error_msg = traceback.format_exc()
+        log.error('get_admin_logs failed: %s', error_msg)
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': str(e), 'traceback': error_msg}),
+            'isBase64Encoded': False
+        }
+
+def delete_user_by_id(cur, conn, admin_id: str, body: dict) -> dict:
+    """Удаление конкретного пользователя по ID и всех связанных данных"""
+    try:
+        user_id = body.get('user_id')
+        
+        if not user_id:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Не указан ID пользователя'}),
+                'isBase64Encoded': False
+            }
+        
+        user_id_int = int(user_id)
+        
+        # Проверка прав доступа
+        cur.execute("SELECT role FROM t_p4831367_esport_gta_disaster.users WHERE id = %s", (int(admin_id),))
+        admin = cur.fetchone()
+        
+        if not admin or admin['role'] not in ['admin', 'founder']:
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Недостаточно прав для удаления пользователей'}),
+                'isBase64Encoded': False
+            }
+        
+        # Запрет на удаление founder
+        if user_id_int == 2:
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Нельзя удалить founder аккаунт'}),
+                'isBase64Encoded': False
+            }
+        
+        # Получаем информацию о пользователе
+        cur.execute("SELECT email, nickname FROM t_p4831367_esport_gta_disaster.users WHERE id = %s", (user_id_int,))
+        user_info = cur.fetchone()
+        
+        if not user_info:
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Пользователь не найден'}),
+                'isBase64Encoded': False
+            }
+        
+        user_email = user_info['email']
+        user_nickname = user_info['nickname']
+        
+        # Удаляем связанные данные пользователя
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.sessions WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_sessions WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_activity WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_activity_sessions WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.login_logs WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.password_reset_tokens WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.notifications WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_notifications WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_achievements WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.bans WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_bans WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.mutes WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_mutes WHERE user_id = %s", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.tournament_exclusions WHERE user_id = %s", (user_id_int,))
+        
+        # Удаляем участие в командах
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.team_members WHERE user_id = %s", (user_id_int,))
+        
+        # Удаляем команды, где пользователь капитан (сначала все зависимые таблицы)
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.match_screenshots WHERE team_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s)", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.match_history WHERE team_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s)", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.bracket_matches WHERE team1_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s) OR team2_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s) OR winner_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s)", (user_id_int, user_id_int, user_id_int))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.group_stage_matches WHERE team1_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s) OR team2_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s)", (user_id_int, user_id_int))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.matches WHERE team1_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s) OR team2_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s) OR winner_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s)", (user_id_int, user_id_int, user_id_int))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.team_invitations WHERE team_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s)", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.tournament_registrations WHERE team_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s)", (user_id_int,))
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s", (user_id_int,))
+        
+        # Удаляем приглашения для пользователя
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.team_invitations WHERE invited_user_id = %s", (user_id_int,))
+        
+        # Удаляем самого пользователя
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.users WHERE id = %s", (user_id_int,))
+        
+        conn.commit()
+        
+        # Логирование
+        log_admin_action(cur, conn, admin_id, 'delete_user', 
+                        f'Удалён пользователь {user_nickname} ({user_email}) и все связанные данные', 
+                        'user', user_id_int)
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'message': f'Пользователь {user_nickname} ({user_email}) удалён'}),
+            'isBase64Encoded': False
+        }
+        
+    except Exception as e:
+        conn.rollback()
+        import traceback
+        error_msg = traceback.format_exc()
+        log.error('delete_user_by_id failed: %s', error_msg)
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка при удалении пользователя: {str(e)}'}),
+            'isBase64Encoded': False
+        }
+
+def delete_all_users_except_founder(cur, conn, admin_id: str) -> dict:
+    """Удаление всех пользователей кроме ID 2 (founder) и связанных данных"""
+    try:
+        # Проверка прав доступа
+        cur.execute("SELECT role FROM t_p4831367_esport_gta_disaster.users WHERE id = %s", (int(admin_id),))
+        admin = cur.fetchone()
+        
+        if not admin or admin['role'] not in ['admin', 'founder']:
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': dumps({'error': 'Недостаточно прав для удаления пользователей'}),
+                'isBase64Encoded': False
+            }
+        
+        # Подсчитываем количество пользователей (кроме ID 2)
+        cur.execute("SELECT COUNT(*) as count FROM t_p4831367_esport_gta_disaster.users WHERE id != 2")
+        count_result = cur.fetchone()
+        total_users = count_result['count']
+        
+        # Удаляем связанные данные для пользователей кроме ID 2
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.sessions WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_sessions WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_activity WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_activity_sessions WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.login_logs WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.password_reset_tokens WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.notifications WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_notifications WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_achievements WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.bans WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_bans WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.mutes WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.user_mutes WHERE user_id != 2")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.tournament_exclusions WHERE user_id != 2")
+        
+        # Удаляем участников команд кроме ID 2
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.team_members WHERE user_id != 2")
+        
+        # Удаляем команды, где капитан не ID 2 (сначала все зависимые таблицы)
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.match_screenshots WHERE team_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2)")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.match_history WHERE team_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2)")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.bracket_matches WHERE team1_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2) OR team2_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2) OR winner_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2)")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.group_stage_matches WHERE team1_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2) OR team2_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2)")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.matches WHERE team1_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2) OR team2_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2) OR winner_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2)")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.team_invitations WHERE team_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2)")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.tournament_registrations WHERE team_id IN (SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2)")
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id != 2")
+        
+        # Удаляем приглашения для пользователей кроме ID 2
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.team_invitations WHERE invited_user_id != 2")
+        
+        # Удаляем всех пользователей кроме ID 2
+        cur.execute("DELETE FROM t_p4831367_esport_gta_disaster.users WHERE id != 2")
+        
+        conn.commit()
+        
+        # Логирование
+        log_admin_action(cur, conn, admin_id, 'delete_all_users', 
+                        f'Удалено {total_users} пользователей (кроме founder ID 2) и все связанные данные', 
+                        'users', None)
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'success': True, 'message': f'Удалено пользователей: {total_users}. Founder (ID 2) сохранен.'}),
+            'isBase64Encoded': False
+        }
+        
+    except Exception as e:
+        conn.rollback()
+        import traceback
+        error_msg = traceback.format_exc()
+        log.error('delete_all_users_except_founder failed: %s', error_msg)
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({'error': f'Ошибка при удалении пользователей: {str(e)}'}),
+            'isBase64Encoded': False
+        }
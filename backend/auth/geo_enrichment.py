@@ -0,0 +1,126 @@
+import os
+import ipaddress
+from functools import lru_cache
+from psycopg2.extras import execute_values
+from app_logging import get_logger
+
+GEO_BATCH_SIZE = 500
+UNKNOWN = ('Unknown', 'Unknown')
+
+log = get_logger('geo')
+
+_reader = None
+
+
+def get_geo_reader():
+    """
+    Возвращает reader локальной базы IP→гео (MaxMind GeoLite2 City).
+
+    Путь к файлу .mmdb задаётся переменной окружения GEOIP_DB_PATH.
+    Если пакет geoip2 или файл базы недоступны, возвращает None; открыть
+    базу пробуем при каждом вызове, пока это не удастся (файл могут
+    выложить позже, без перезапуска инстанса).
+    """
+    global _reader
+
+    if _reader is not None:
+        return _reader
+
+    db_path = os.environ.get('GEOIP_DB_PATH')
+    if not db_path or not os.path.exists(db_path):
+        return None
+
+    try:
+        import geoip2.database
+        _reader = geoip2.database.Reader(db_path)
+    except Exception as e:
+        log.error('geoip reader failed to load: %s', e)
+        return None
+
+    # Результаты, закэшированные без базы, больше не нужны
+    lookup_ip.cache_clear()
+    return _reader
+
+
+@lru_cache(maxsize=4096)
+def lookup_ip(ip_address: str) -> tuple:
+    """
+    Определяет страну и город по IP через локальную базу.
+
+    Returns:
+        tuple: (страна, город), либо ('Unknown', 'Unknown')
+    """
+    try:
+        ip = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return UNKNOWN
+
+    if ip.is_private or ip.is_loopback or ip.is_reserved:
+        return UNKNOWN
+
+    reader = get_geo_reader()
+    if not reader:
+        return UNKNOWN
+
+    try:
+        response = reader.city(ip_address)
+        country = response.country.names.get('ru') or response.country.name or 'Unknown'
+        city = response.city.names.get('ru') or response.city.name or 'Unknown'
+        return country, city
+    except Exception:
+        return UNKNOWN
+
+
+def enrich_pending_logins(cur, conn, batch_size: int = GEO_BATCH_SIZE) -> dict:
+    """
+    Заполняет страну и город у записей login_logs со статусом 'pending'.
+
+    Записи обрабатываются пачками: одна выборка с SKIP LOCKED (можно
+    запускать несколько обработчиков параллельно) и одно пакетное обновление.
+
+    Args:
+        cur: Database cursor (RealDictCursor)
+        conn: Database connection
+        batch_size: Максимальное количество записей за проход
+
+    Без базы геолокации записи не трогаются и остаются 'pending'.
+
+    Returns:
+        dict: {'processed': число записей, 'resolved': с найденной геолокацией}
+    """
+    if not get_geo_reader():
+        return {'processed': 0, 'resolved': 0}
+
+    cur.execute("""
+        SELECT id, ip_address
+        FROM t_p4831367_esport_gta_disaster.login_logs
+        WHERE geo_status = 'pending'
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    """, (batch_size,))
+
+    rows = cur.fetchall()
+    if not rows:
+        conn.commit()
+        return {'processed': 0, 'resolved': 0}
+
+    updates = []
+    resolved = 0
+    for row in rows:
+        country, city = lookup_ip(row['ip_address'] or '')
+        status = 'done' if country != 'Unknown' else 'failed'
+        if status == 'done':
+            resolved += 1
+        updates.append((row['id'], country, city, status))
+
+    execute_values(cur, """
+        UPDATE t_p4831367_esport_gta_disaster.login_logs AS l
+        SET country = v.country, city = v.city, geo_status = v.geo_status
+        FROM (VALUES %s) AS v(id, country, city, geo_status)
+        WHERE l.id = v.id
+    """, updates)
+
+    conn.commit()
+
+    return {'processed': len(rows), 'resolved': resolved}
@@ -5,23 +5,13 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 import hashlib
 import secrets
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
+from geo_enrichment import enrich_pending_logins, get_geo_reader
+from query_stats import instrumented, track_queries
+from app_logging import get_logger, request_logging
+from responses import dumps, compress_responses
 
-def get_geolocation(ip_address: str) -> tuple:
-    """Получение геолокации по IP (базовая реализация)"""
-    try:
-        import requests
-        response = requests.get(f'http://ip-api.com/json/{ip_address}', timeout=2)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('status') == 'success':
-                return data.get('country', 'Unknown'), data.get('city', 'Unknown')
-    except:
-        pass
-    return 'Unknown', 'Unknown'
+log = get_logger('auth')
 
 def format_user(user_data):
     """Форматирование данных пользователя для JSON ответа"""
@@ -45,6 +35,9 @@ def format_user(user_data):
         'losses': user_data.get('losses', 0)
     }
 
+@request_logging('auth')
+@compress_responses
+@track_queries('auth')
 def handler(event: dict, context) -> dict:
     """API для регистрации и авторизации пользователей с подтверждением email"""
     
@@ -64,7 +57,7 @@ def handler(event: dict, context) -> dict:
     
     try:
         conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=instrumented(RealDictCursor))
         
         if method == 'POST':
             body = json.loads(event.get('body', '{}'))
@@ -94,6 +87,8 @@ def handler(event: dict, context) -> dict:
                 return admin_get_users(cur, conn, event)
             elif action == 'admin_update_user':
                 return admin_update_user(cur, conn, body, event)
+            elif action == 'enrich_login_geo':
+                return enrich_login_geo(cur, conn, body, event)
             else:
                 return error_response('Неизвестное действие', 400)
         
@@ -109,6 +104,25 @@ def handler(event: dict, context) -> dict:
     except Exception as e:
         return error_response(str(e), 500)
 
+def find_user_by_login(cur, login_identifier: str):
+    """Поиск пользователя по email или никнейму через индекс нужного поля"""
+    if '@' in login_identifier:
+        cur.execute("""
+            SELECT id, password_hash, email_verified, is_banned FROM t_p4831367_esport_gta_disaster.users 
+            WHERE LOWER(email) = LOWER(%s)
+        """, (login_identifier,))
+        user = cur.fetchone()
+        if user:
+            return user
+    
+    # Никнейм тоже может содержать '@', поэтому при промахе по email проверяем его
+    cur.execute("""
+        SELECT id, password_hash, email_verified, is_banned FROM t_p4831367_esport_gta_disaster.users 
+        WHERE LOWER(nickname) = LOWER(%s)
+    """, (login_identifier,))
+    
+    return cur.fetchone()
+
 def check_nickname(cur, conn, body: dict) -> dict:
     """Проверка уникальности никнейма"""
     nickname = body.get('nickname', '').strip()
@@ -122,7 +136,7 @@ def check_nickname(cur, conn, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'available': not exists}),
+        'body': dumps({'available': not exists}),
         'isBase64Encoded': False
     }
 
@@ -133,13 +147,13 @@ def check_email(cur, conn, body: dict) -> dict:
     if not email:
         return error_response('Укажите email', 400)
     
-    cur.execute("SELECT id FROM t_p4831367_esport_gta_disaster.users WHERE email = %s", (email,))
+    cur.execute("SELECT id FROM t_p4831367_esport_gta_disaster.users WHERE LOWER(email) = %s", (email,))
     exists = cur.fetchone()
     
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'available': not exists}),
+        'body': dumps({'available': not exists}),
         'isBase64Encoded': False
     }
 
@@ -175,11 +189,11 @@ def register(cur, conn, body: dict) -> dict:
     try:
         send_verification_email(email, nickname, verification_token)
     except Exception as e:
-        print(f'EMAIL ERROR: {str(e)}')  # Логируем для отладки
+        log.error('email send failed: %s', e)
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({
+            'body': dumps({
                 'success': True,
                 'message': f'Регистрация успешна, но не удалось отправить письмо: {str(e)}',
                 'user_id': user_id,
@@ -192,7 +206,7 @@ def register(cur, conn, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({
+        'body': dumps({
             'success': True,
             'message': 'Письмо с подтверждением отправлено на вашу почту',
             'user_id': user_id,
@@ -244,7 +258,7 @@ def verify_email(cur, conn, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({
+        'body': dumps({
             'success': True,
             'message': 'Email подтвержден! Вы вошли в систему',
             'session_token': session_token,
@@ -280,7 +294,7 @@ def resend_verification(cur, conn, body: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'success': True, 'message': 'Письмо отправлено повторно'}),
+            'body': dumps({'success': True, 'message': 'Письмо отправлено повторно'}),
             'isBase64Encoded': False
         }
     except Exception as e:
@@ -301,26 +315,16 @@ def login(cur, conn, body: dict, event: dict = None) -> dict:
     
     password_hash = hashlib.sha256(password.encode()).hexdigest()
     
-    cur.execute("""
-        SELECT id, email_verified, is_banned FROM t_p4831367_esport_gta_disaster.users 
-        WHERE (LOWER(email) = LOWER(%s) OR LOWER(nickname) = LOWER(%s)) AND password_hash = %s
-    """, (login_identifier, login_identifier, password_hash))
-    
-    user = cur.fetchone()
+    user = find_user_by_login(cur, login_identifier)
     
-    if not user:
+    if not user or user['password_hash'] != password_hash:
         # Логируем неудачную попытку входа
-        cur.execute("""
-            SELECT id FROM t_p4831367_esport_gta_disaster.users 
-            WHERE LOWER(email) = LOWER(%s) OR LOWER(nickname) = LOWER(%s)
-        """, (login_identifier, login_identifier))
-        user_exists = cur.fetchone()
-        if user_exists:
+        if user:
             cur.execute("""
                 INSERT INTO t_p4831367_esport_gta_disaster.login_logs 
                 (user_id, ip_address, user_agent, login_successful, login_method)
                 VALUES (%s, %s, %s, FALSE, 'password')
-            """, (user_exists['id'], ip_address, user_agent))
+            """, (user['id'], ip_address, user_agent))
             conn.commit()
         return error_response('Неверный email или пароль', 401)
     
@@ -345,15 +349,12 @@ def login(cur, conn, body: dict, event: dict = None) -> dict:
     
     session_id = cur.fetchone()['id']
     
-    # Получаем геолокацию по IP (базовая реализация)
-    country, city = get_geolocation(ip_address)
-    
-    # Логируем успешный вход
+    # Логируем успешный вход, геолокация заполняется позже (enrich_login_geo)
     cur.execute("""
         INSERT INTO t_p4831367_esport_gta_disaster.login_logs 
-        (user_id, ip_address, user_agent, country, city, login_successful, login_method, session_id)
-        VALUES (%s, %s, %s, %s, %s, TRUE, 'password', %s)
-    """, (user_id, ip_address, user_agent, country, city, session_id))
+        (user_id, ip_address, user_agent, login_successful, login_method, session_id, geo_status)
+        VALUES (%s, %s, %s, TRUE, 'password', %s, 'pending')
+    """, (user_id, ip_address, user_agent, session_id))
     
     conn.commit()
     
@@ -363,7 +364,7 @@ def login(cur, conn, body: dict, event: dict = None) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({
+        'body': dumps({
             'session_token': session_token,
             'user': format_user(user_data)
         }),
@@ -381,7 +382,7 @@ def logout(cur, conn, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True}),
+        'body': dumps({'success': True}),
         'isBase64Encoded': False
     }
 
@@ -401,12 +402,15 @@ def get_profile(cur, conn, session_token: str) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'user': format_user(user_data)}),
+        'body': dumps({'user': format_user(user_data)}),
         'isBase64Encoded': False
     }
 
 def send_verification_email(to_email: str, nickname: str, token: str):
     """Отправка письма с подтверждением"""
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
     smtp_email = os.environ.get('SMTP_EMAIL')
     smtp_password = os.environ.get('SMTP_PASSWORD')
     
@@ -521,7 +525,7 @@ def reset_password_request(cur, conn, body: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({
+            'body': dumps({
                 'success': True,
                 'message': 'Код восстановления создан (SMTP не настроен)',
                 'token': token,
@@ -536,7 +540,7 @@ def reset_password_request(cur, conn, body: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({
+            'body': dumps({
                 'success': True,
                 'message': 'Код восстановления отправлен на ваш email',
                 'token': token,
@@ -545,11 +549,11 @@ def reset_password_request(cur, conn, body: dict) -> dict:
             'isBase64Encoded': False
         }
     except Exception as e:
-        print(f'EMAIL ERROR: {str(e)}')
+        log.error('email send failed: %s', e)
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({
+            'body': dumps({
                 'success': True,
                 'message': f'Код создан, но не отправлен: {str(e)}',
                 'token': token,
@@ -591,7 +595,7 @@ def reset_password_verify(cur, conn, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'valid': True, 'user_id': user_id}),
+        'body': dumps({'valid': True, 'user_id': user_id}),
         'isBase64Encoded': False
     }
 
@@ -645,7 +649,7 @@ def reset_password(cur, conn, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'message': 'Пароль успешно изменен'}),
+        'body': dumps({'success': True, 'message': 'Пароль успешно изменен'}),
         'isBase64Encoded': False
     }
 
@@ -690,7 +694,7 @@ def admin_get_users(cur, conn, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'users': users_list}),
+        'body': dumps({'users': users_list}),
         'isBase64Encoded': False
     }
 
@@ -745,12 +749,48 @@ def admin_update_user(cur, conn, body: dict, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True}),
+        'body': dumps({'success': True}),
+        'isBase64Encoded': False
+    }
+
+def enrich_login_geo(cur, conn, body: dict, event: dict) -> dict:
+    '''Фоновое заполнение геолокации в логах входа (вызывается по расписанию)'''
+    headers = event.get('headers', {})
+    cron_secret = headers.get('X-Cron-Secret') or headers.get('x-cron-secret')
+    expected_secret = os.environ.get('CRON_SECRET')
+    
+    if not expected_secret or cron_secret != expected_secret:
+        return error_response('Доступ запрещен', 403)
+    
+    # Без локальной базы IP→гео записи остаются 'pending' до ее появления
+    if not get_geo_reader():
+        log.error('enrich_login_geo: GEOIP_DB_PATH is not set or the database file is missing')
+        return error_response('База геолокации недоступна', 503)
+    
+    batch_size = min(int(body.get('batch_size', 500)), 5000)
+    max_batches = min(int(body.get('max_batches', 10)), 100)
+    
+    processed = 0
+    resolved = 0
+    for _ in range(max_batches):
+        result = enrich_pending_logins(cur, conn, batch_size)
+        processed += result['processed']
+        resolved += result['resolved']
+        if result['processed'] < batch_size:
+            break
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': dumps({'success': True, 'processed': processed, 'resolved': resolved}),
         'isBase64Encoded': False
     }
 
 def send_reset_email(to_email: str, nickname: str, token: str, smtp_email: str, smtp_password: str):
     '''Отправка email с кодом восстановления'''
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
     subject = "Восстановление пароля DISASTER ESPORTS"
     reset_url = f"https://disasteresports.ru/forgot-password?token={token}"
     
@@ -821,6 +861,6 @@ def error_response(message: str, status: int) -> dict:
     return {
         'statusCode': status,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'error': message}),
+        'body': dumps({'error': message}),
         'isBase64Encoded': False
     }
\ No newline at end of file
@@ -0,0 +1,168 @@
+import os
+import re
+import json
+import time
+import logging
+from functools import wraps
+from psycopg2.extensions import cursor as BaseCursor
+from app_logging import get_logger
+
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '200'))
+SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN') == '1'
+TOP_STATEMENTS = 5
+
+log = get_logger('db')
+
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\s+'), ' '),
+]
+
+# Статистика текущего вызова функции (один вызов на инстанс за раз)
+_current = None
+_cursor_classes = {}
+
+
+def normalize_sql(query) -> str:
+    """Текст запроса без литералов и лишних пробелов (для группировки)"""
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    text = str(query)
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+class QueryStats:
+    """Счетчики запросов одного вызова функции"""
+
+    def __init__(self, function_name: str):
+        self.function_name = function_name
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.rows = 0
+        self.statements = {}
+        self.slow = []
+
+    def record(self, cur, query, params, elapsed_ms: float):
+        rows = cur.rowcount if cur.rowcount and cur.rowcount > 0 else 0
+        sql = normalize_sql(query)
+
+        self.queries += 1
+        self.db_ms += elapsed_ms
+        self.rows += rows
+
+        stat = self.statements.setdefault(sql, {'count': 0, 'ms': 0.0, 'rows': 0})
+        stat['count'] += 1
+        stat['ms'] += elapsed_ms
+        stat['rows'] += rows
+
+        if elapsed_ms >= SLOW_QUERY_MS:
+            entry = {'sql': sql, 'ms': round(elapsed_ms, 2), 'rows': rows}
+            if SLOW_QUERY_EXPLAIN and sql.upper().startswith(('SELECT', 'WITH')):
+                entry['plan'] = explain(cur, query, params)
+            self.slow.append(entry)
+            log.warning('slow query %.1f ms: %s', elapsed_ms, sql[:300])
+
+    def summary(self, action, status) -> dict:
+        top = sorted(self.statements.items(), key=lambda item: item[1]['ms'], reverse=True)[:TOP_STATEMENTS]
+        return {
+            'function': self.function_name,
+            'action': action,
+            'status': status,
+            'queries': self.queries,
+            'db_ms': round(self.db_ms, 2),
+            'rows': self.rows,
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'statements': [{
+                'sql': sql[:300],
+                'count': stat['count'],
+                'ms': round(stat['ms'], 2),
+                'rows': stat['rows']
+            } for sql, stat in top],
+            'slow': self.slow
+        }
+
+
+def explain(cur, query, params) -> list:
+    """EXPLAIN медленного запроса отдельным (неинструментированным) курсором"""
+    try:
+        plain = cur.connection.cursor(cursor_factory=BaseCursor)
+        plain.execute(b'EXPLAIN ' + (query if isinstance(query, bytes) else str(query).encode('utf-8')), params)
+        plan = [row[0] for row in plain.fetchall()]
+        plain.close()
+        return plan
+    except Exception as e:
+        return [f'EXPLAIN failed: {str(e)}']
+
+
+def instrumented(base=BaseCursor):
+    """
+    Возвращает подкласс курсора base, который учитывает каждый execute
+    (количество, время, строки) в статистике текущего вызова.
+
+    Использование: conn.cursor(cursor_factory=instrumented(RealDictCursor))
+    """
+    cls = _cursor_classes.get(base)
+    if cls:
+        return cls
+
+    class InstrumentedCursor(base):
+        def execute(self, query, vars=None):
+            started = time.perf_counter()
+            try:
+                return super().execute(query, vars)
+            finally:
+                if _current is not None:
+                    _current.record(self, query, vars, (time.perf_counter() - started) * 1000)
+
+        def executemany(self, query, vars_list):
+            started = time.perf_counter()
+            try:
+                return super().executemany(query, vars_list)
+            finally:
+                if _current is not None:
+                    _current.record(self, query, None, (time.perf_counter() - started) * 1000)
+
+    InstrumentedCursor.__name__ = f'Instrumented{base.__name__}'
+    _cursor_classes[base] = InstrumentedCursor
+    return InstrumentedCursor
+
+
+def get_action(event: dict):
+    """Название действия из тела POST или параметров GET (для сводки)"""
+    try:
+        body = event.get('body')
+        if body:
+            return json.loads(body).get('action')
+    except Exception:
+        pass
+    params = event.get('queryStringParameters') or {}
+    return params.get('action') or params.get('resource')
+
+
+def track_queries(function_name: str):
+    """
+    Декоратор handler(): собирает статистику запросов вызова и пишет
+    одну запись db_summary (уровень INFO) после ответа.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(event: dict, context) -> dict:
+            global _current
+            _current = QueryStats(function_name)
+            status = 500
+            try:
+                response = handler(event, context)
+                if isinstance(response, dict):
+                    status = response.get('statusCode')
+                return response
+            finally:
+                stats = _current
+                _current = None
+                if stats.queries and log.isEnabledFor(logging.INFO):
+                    log.info('db_summary', extra={'fields': stats.summary(get_action(event), status)})
+        return wrapper
+    return decorator
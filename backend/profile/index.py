@@ -2,11 +2,30 @@
 import json
 import os
 import psycopg2
-import boto3
 import base64
 import secrets
 from datetime import datetime
+from query_stats import instrumented, track_queries
+from app_logging import request_logging
+from responses import dumps, compress_responses
 
+_s3_client = None
+
+def get_s3_client():
+    """Клиент S3: boto3 импортируется при первой загрузке файла, клиент переиспользуется"""
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+        _s3_client = boto3.client('s3',
+            endpoint_url='https://bucket.poehali.dev',
+            aws_access_key_id=os.environ['AWS_ACCESS_KEY_ID'],
+            aws_secret_access_key=os.environ['AWS_SECRET_ACCESS_KEY']
+        )
+    return _s3_client
+
+@request_logging('profile')
+@compress_responses
+@track_queries('profile')
 def handler(event: dict, context) -> dict:
     """API для управления профилем пользователя с загрузкой аватара"""
     
@@ -26,7 +45,7 @@ def handler(event: dict, context) -> dict:
     
     try:
         conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        cur = conn.cursor()
+        cur = conn.cursor(cursor_factory=instrumented())
         
         session_token = event.get('headers', {}).get('x-session-token') or event.get('headers', {}).get('X-Session-Token')
         
@@ -96,7 +115,7 @@ def get_profile(cur, user_id: int) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({
+        'body': dumps({
             'id': user[0],
             'nickname': user[1],
             'email': user[2],
@@ -173,7 +192,7 @@ def update_profile(cur, conn, user_id: int, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'message': 'Профиль обновлен'}),
+        'body': dumps({'success': True, 'message': 'Профиль обновлен'}),
         'isBase64Encoded': False
     }
 
@@ -194,11 +213,7 @@ def upload_avatar(cur, conn, user_id: int, body: dict) -> dict:
         filename = f"avatars/{user_id}_{secrets.token_hex(8)}.{file_extension}"
         
         # Загрузка в S3
-        s3 = boto3.client('s3',
-            endpoint_url='https://bucket.poehali.dev',
-            aws_access_key_id=os.environ['AWS_ACCESS_KEY_ID'],
-            aws_secret_access_key=os.environ['AWS_SECRET_ACCESS_KEY']
-        )
+        s3 = get_s3_client()
         
         s3.put_object(
             Bucket='files',
@@ -226,7 +241,7 @@ def upload_avatar(cur, conn, user_id: int, body: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({
+            'body': dumps({
                 'success': True,
                 'avatar_url': cdn_url,
                 'message': 'Аватар загружен',
@@ -300,7 +315,7 @@ def track_activity(cur, conn, user_id: int, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({
+        'body': dumps({
             'success': True,
             'total_time_seconds': total_seconds,
             'total_time_hours': round(total_hours, 1),
@@ -322,11 +337,7 @@ def upload_banner(cur, conn, user_id: int, body: dict) -> dict:
         file_extension = file_type.split('/')[-1]
         filename = f"banners/{user_id}_{secrets.token_hex(8)}.{file_extension}"
         
-        s3 = boto3.client('s3',
-            endpoint_url='https://bucket.poehali.dev',
-            aws_access_key_id=os.environ['AWS_ACCESS_KEY_ID'],
-            aws_secret_access_key=os.environ['AWS_SECRET_ACCESS_KEY']
-        )
+        s3 = get_s3_client()
         
         s3.put_object(
             Bucket='files',
@@ -352,7 +363,7 @@ def upload_banner(cur, conn, user_id: int, body: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({
+            'body': dumps({
                 'success': True,
                 'banner_url': cdn_url,
                 'message': 'Баннер загружен',
@@ -417,7 +428,7 @@ def change_password(cur, conn, user_id: int, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({
+        'body': dumps({
             'success': True,
             'message': 'Пароль успешно изменен'
         }),
@@ -450,8 +461,8 @@ def get_login_history(cur, user_id: int, body: dict) -> dict:
             'id': row[0],
             'ip_address': row[1],
             'user_agent': row[2],
-            'country': row[3],
-            'city': row[4],
+            'country': row[3] or 'Unknown',
+            'city': row[4] or 'Unknown',
             'login_successful': row[5],
             'login_method': row[6],
             'created_at': row[7].isoformat() if row[7] else None
@@ -460,7 +471,7 @@ def get_login_history(cur, user_id: int, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({
+        'body': dumps({
             'login_history': logs
         }),
         'isBase64Encoded': False
@@ -470,6 +481,6 @@ def error_response(message: str, status_code: int) -> dict:
     return {
         'statusCode': status_code,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'error': message}),
+        'body': dumps({'error': message}),
         'isBase64Encoded': False
     }
\ No newline at end of file
@@ -3,7 +3,13 @@ import json
 import os
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from query_stats import instrumented, track_queries
+from app_logging import request_logging
+from responses import dumps, compress_responses
 
+@request_logging('register-team')
+@compress_responses
+@track_queries('register-team')
 def handler(event: dict, context) -> dict:
     '''API для регистрации новой команды пользователем'''
     method = event.get('httpMethod', 'GET')
@@ -28,7 +34,7 @@ def handler(event: dict, context) -> dict:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({'error': 'Method not allowed'})
+        'body': dumps({'error': 'Method not allowed'})
     }
 
 
@@ -47,7 +53,7 @@ def register_team(event: dict) -> dict:
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*'
                 },
-                'body': json.dumps({'error': 'Необходима авторизация'})
+                'body': dumps({'error': 'Необходима авторизация'})
             }
         
         # Парсим данные команды
@@ -65,7 +71,7 @@ def register_team(event: dict) -> dict:
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*'
                 },
-                'body': json.dumps({'error': 'Название команды должно содержать минимум 3 символа'})
+                'body': dumps({'error': 'Название команды должно содержать минимум 3 символа'})
             }
         
         if not team_tag or len(team_tag) < 2 or len(team_tag) > 10:
@@ -75,13 +81,13 @@ def register_team(event: dict) -> dict:
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*'
                 },
-                'body': json.dumps({'error': 'Тег команды должен содержать от 2 до 10 символов'})
+                'body': dumps({'error': 'Тег команды должен содержать от 2 до 10 символов'})
             }
         
         dsn = os.environ.get('DATABASE_URL')
         conn = psycopg2.connect(dsn)
         
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        with conn.cursor(cursor_factory=instrumented(RealDictCursor)) as cursor:
             # Проверяем, не является ли пользователь уже капитаном команды
             cursor.execute("""
                 SELECT id FROM t_p4831367_esport_gta_disaster.teams WHERE captain_id = %s
@@ -94,7 +100,7 @@ def register_team(event: dict) -> dict:
                         'Content-Type': 'application/json',
                         'Access-Control-Allow-Origin': '*'
                     },
-                    'body': json.dumps({'error': 'Вы уже являетесь капитаном команды'})
+                    'body': dumps({'error': 'Вы уже являетесь капитаном команды'})
                 }
             
             # Проверяем уникальность тега
@@ -109,7 +115,7 @@ def register_team(event: dict) -> dict:
                         'Content-Type': 'application/json',
                         'Access-Control-Allow-Origin': '*'
                     },
-                    'body': json.dumps({'error': 'Команда с таким тегом уже существует'})
+                    'body': dumps({'error': 'Команда с таким тегом уже существует'})
                 }
             
             # Создаем команду (verified по умолчанию FALSE, level=2, points=200)
@@ -135,7 +141,7 @@ def register_team(event: dict) -> dict:
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps({
+            'body': dumps({
                 'message': 'Команда создана! Ожидайте проверки администратором для активации.',
                 'team': {
                     'id': new_team['id'],
@@ -157,7 +163,7 @@ def register_team(event: dict) -> dict:
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps({'error': 'Неверный формат данных'})
+            'body': dumps({'error': 'Неверный формат данных'})
         }
     except Exception as e:
         if conn:
@@ -168,7 +174,7 @@ def register_team(event: dict) -> dict:
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps({'error': str(e)})
+            'body': dumps({'error': str(e)})
         }
     finally:
         if conn:
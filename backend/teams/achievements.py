@@ -0,0 +1,187 @@
+from app_logging import get_logger
+
+# Правила достижений: код из achievements -> (показатель игрока, цель).
+# Показатели считаются в PROGRESS_QUERY (CASE по rule.stat)
+ACHIEVEMENT_RULES = {
+    'first_blood': ('wins', 1),
+    'win_streak_5': ('best_streak', 5),
+    'win_streak_10': ('best_streak', 10),
+    'perfect_game': ('perfect_wins', 1),
+    'comeback_king': ('comebacks', 1),
+    'team_player': ('matches', 5),
+    'first_tournament': ('tournaments', 1),
+    'tournament_veteran': ('tournaments', 10),
+}
+
+log = get_logger('teams.achievements')
+
+# Матчи игрока — матчи его команд (team_match_history) после вступления в команду.
+# Серия побед — острова подряд идущих побед (разность ROW_NUMBER), камбэк —
+# победа после проигранных первых двух карт (bracket_match_maps, итог судьи).
+# Прогресс только растет; unlocked_at здесь не меняется (см. UNLOCK_QUERY)
+PROGRESS_QUERY = """
+    WITH games AS (
+        SELECT tm.user_id, h.match_id, h.team_id, h.tournament_id, h.result,
+               h.team_score, h.opponent_score, h.completed_at
+        FROM t_p4831367_esport_gta_disaster.team_members tm
+        JOIN t_p4831367_esport_gta_disaster.team_match_history h
+            ON h.team_id = tm.team_id
+            AND h.completed_at >= COALESCE(tm.joined_at, '-infinity'::timestamp)
+        WHERE tm.user_id = ANY(%(user_ids)s)
+        AND tm.status = 'active'
+    ), ordered AS (
+        SELECT user_id, result,
+               ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY completed_at, match_id)
+               - ROW_NUMBER() OVER (PARTITION BY user_id, result ORDER BY completed_at, match_id) as island
+        FROM games
+    ), streaks AS (
+        SELECT user_id, MAX(length) as best_streak
+        FROM (
+            SELECT user_id, COUNT(*) as length
+            FROM ordered
+            WHERE result = 'win'
+            GROUP BY user_id, island
+        ) runs
+        GROUP BY user_id
+    ), comebacks AS (
+        SELECT user_id, COUNT(*) as comebacks
+        FROM (
+            SELECT g.user_id, g.match_id
+            FROM games g
+            JOIN t_p4831367_esport_gta_disaster.bracket_match_maps mm
+                ON mm.match_id = g.match_id
+                AND mm.source = 'final'
+                AND mm.map_number IN (1, 2)
+                AND mm.winner_id <> g.team_id
+            WHERE g.result = 'win'
+            GROUP BY g.user_id, g.match_id
+            HAVING COUNT(*) = 2
+        ) won_after_0_2
+        GROUP BY user_id
+    ), stats AS (
+        SELECT g.user_id,
+               COUNT(*) as matches,
+               COUNT(*) FILTER (WHERE g.result = 'win') as wins,
+               COUNT(*) FILTER (WHERE g.result = 'win' AND g.team_score >= 3 AND g.opponent_score = 0) as perfect_wins,
+               COUNT(DISTINCT g.tournament_id) as tournaments
+        FROM games g
+        GROUP BY g.user_id
+    ), progress AS (
+        SELECT s.user_id, a.id as achievement_id, rule.target,
+               LEAST(CASE rule.stat
+                   WHEN 'matches' THEN s.matches
+                   WHEN 'wins' THEN s.wins
+                   WHEN 'perfect_wins' THEN s.perfect_wins
+                   WHEN 'tournaments' THEN s.tournaments
+                   WHEN 'best_streak' THEN COALESCE(st.best_streak, 0)
+                   WHEN 'comebacks' THEN COALESCE(cb.comebacks, 0)
+               END, rule.target) as progress
+        FROM stats s
+        LEFT JOIN streaks st ON st.user_id = s.user_id
+        LEFT JOIN comebacks cb ON cb.user_id = s.user_id
+        CROSS JOIN unnest(%(codes)s::text[], %(stats)s::text[], %(targets)s::int[]) rule(code, stat, target)
+        JOIN t_p4831367_esport_gta_disaster.achievements a ON a.code = rule.code
+    )
+    INSERT INTO t_p4831367_esport_gta_disaster.user_achievements
+    (user_id, achievement_id, progress, max_progress, unlocked_at)
+    SELECT user_id, achievement_id, progress, target, NULL
+    FROM progress
+    WHERE progress > 0
+    ON CONFLICT (user_id, achievement_id) DO UPDATE
+    SET progress = GREATEST(user_achievements.progress, EXCLUDED.progress),
+        max_progress = EXCLUDED.max_progress
+"""
+
+# Открытие достигнутых: условие unlocked_at IS NULL перепроверяется после
+# блокировки строки, поэтому каждое достижение открывается (и начисляет очки,
+# и шлет уведомление) ровно один раз — и при повторной оценке в той же
+# транзакции (пакет atomic), и при параллельных подтверждениях
+UNLOCK_QUERY = """
+    WITH unlocked AS (
+        UPDATE t_p4831367_esport_gta_disaster.user_achievements ua
+        SET unlocked_at = NOW()
+        FROM t_p4831367_esport_gta_disaster.achievements a
+        WHERE a.id = ua.achievement_id
+        AND a.code = ANY(%(codes)s)
+        AND ua.user_id = ANY(%(user_ids)s)
+        AND ua.unlocked_at IS NULL
+        AND ua.progress >= ua.max_progress
+        RETURNING ua.user_id, a.code, a.name, a.points
+    ), awarded AS (
+        UPDATE t_p4831367_esport_gta_disaster.users usr
+        SET achievement_points = COALESCE(usr.achievement_points, 0) + gained.points
+        FROM (SELECT user_id, SUM(points) as points FROM unlocked GROUP BY user_id) gained
+        WHERE usr.id = gained.user_id
+    ), notified AS (
+        INSERT INTO t_p4831367_esport_gta_disaster.notifications
+        (user_id, type, title, message, link, read, created_at)
+        SELECT user_id, 'achievement', 'Новое достижение!', 'Получено достижение "' || name || '"', '/profile', false, NOW()
+        FROM unlocked
+        WHERE %(notify)s
+    )
+    SELECT user_id, code, name, points
+    FROM unlocked
+    ORDER BY user_id, code
+"""
+
+
+def evaluate_achievements(cur, user_ids: list, notify: bool = True) -> list:
+    """
+    Пересчитывает прогресс достижений игроков (один upsert) и открывает
+    достигнутые (один UPDATE): очки в users.achievement_points,
+    уведомления (если notify).
+
+    Returns:
+        list: Открытые сейчас достижения [{'user_id', 'code', 'name', 'points'}]
+    """
+    if not user_ids:
+        return []
+    codes = list(ACHIEVEMENT_RULES)
+    params = {
+        'user_ids': list(user_ids),
+        'codes': codes,
+        'stats': [ACHIEVEMENT_RULES[code][0] for code in codes],
+        'targets': [ACHIEVEMENT_RULES[code][1] for code in codes],
+        'notify': notify
+    }
+    cur.execute(PROGRESS_QUERY, params)
+    cur.execute(UNLOCK_QUERY, params)
+    return [
+        {'user_id': row['user_id'], 'code': row['code'], 'name': row['name'], 'points': row['points']}
+        for row in cur.fetchall()
+    ]
+
+
+def award_match_achievements(cur, conn, match_id: int) -> list:
+    """
+    Достижения игроков обеих команд подтвержденного матча.
+
+    Оценка идет под точкой сохранения: ошибка откатывает только изменения
+    достижений, а не подтверждение матча (в том числе внутри пакета atomic,
+    где conn.rollback() отменил бы весь пакет).
+    """
+    try:
+        cur.execute("SAVEPOINT match_achievements")
+    except Exception as e:
+        log.warning('achievements for match %s skipped: %s', match_id, e)
+        return []
+
+    try:
+        cur.execute("""
+            SELECT DISTINCT tm.user_id
+            FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+            JOIN t_p4831367_esport_gta_disaster.team_members tm
+                ON tm.team_id IN (bm.team1_id, bm.team2_id) AND tm.status = 'active'
+            WHERE bm.id = %s
+        """, (match_id,))
+        unlocked = evaluate_achievements(cur, [row['user_id'] for row in cur.fetchall()])
+        cur.execute("RELEASE SAVEPOINT match_achievements")
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT match_achievements")
+        log.warning('achievements for match %s failed: %s', match_id, e)
+        return []
+
+    conn.commit()
+    if unlocked:
+        log.info('match %s: %s achievements unlocked', match_id, len(unlocked))
+    return unlocked
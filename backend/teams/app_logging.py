@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import random
+import logging
+from functools import wraps
+
+LOG_LEVEL = getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO)
+DEBUG_SAMPLE_RATE = float(os.environ.get('DEBUG_SAMPLE_RATE', '0'))
+DEBUG_HEADER = 'x-debug-log'
+BUFFER_CAPACITY = 500
+
+# Контекст текущего вызова, добавляется в каждую запись
+_request = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна строка JSON на запись: уровень, логгер, сообщение, контекст вызова"""
+
+    def format(self, record) -> str:
+        entry = {
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        entry.update(_request)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['traceback'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class BufferedHandler(logging.Handler):
+    """
+    Копит отформатированные строки и пишет их одним write() в конце вызова,
+    без принудительного flush после каждой записи.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.lines = []
+
+    def emit(self, record):
+        try:
+            self.lines.append(self.format(record) + '\n')
+            if len(self.lines) >= BUFFER_CAPACITY:
+                self.write_buffer()
+        except Exception:
+            self.handleError(record)
+
+    def write_buffer(self):
+        if self.lines:
+            self.stream.write(''.join(self.lines))
+            self.lines = []
+
+
+_root = logging.getLogger('app')
+_root.setLevel(LOG_LEVEL)
+_root.propagate = False
+_handler = BufferedHandler()
+_handler.setFormatter(JsonFormatter())
+_root.addHandler(_handler)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Логгер функции: сообщения форматируются лениво (log.debug('x=%s', x))"""
+    return _root.getChild(name)
+
+
+def debug_requested(event: dict) -> bool:
+    """DEBUG для вызова: заголовок X-Debug-Log или выборка DEBUG_SAMPLE_RATE"""
+    headers = event.get('headers') or {}
+    for key, value in headers.items():
+        if key.lower() == DEBUG_HEADER and str(value).lower() in ('1', 'true', 'yes'):
+            return True
+    return DEBUG_SAMPLE_RATE > 0 and random.random() < DEBUG_SAMPLE_RATE
+
+
+def request_logging(function_name: str):
+    """
+    Декоратор handler(): задает контекст и уровень логирования вызова
+    и выводит накопленные записи после ответа.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(event: dict, context) -> dict:
+            _request.clear()
+            _request['function'] = function_name
+            request_id = getattr(context, 'request_id', None)
+            if request_id:
+                _request['request_id'] = request_id
+
+            if debug_requested(event):
+                _root.setLevel(logging.DEBUG)
+            try:
+                return handler(event, context)
+            finally:
+                _root.setLevel(LOG_LEVEL)
+                _handler.write_buffer()
+                _request.clear()
+        return wrapper
+    return decorator
@@ -5,9 +5,21 @@ import base64
 import random
 import math
 from datetime import datetime
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from rating_system import update_team_rating_after_match
+from achievements import award_match_achievements
+from user_search import search_users_by_nickname
+from roster_validation import validate_roster
+from match_history import fetch_team_history, fetch_head_to_head, page_limit
+from referee_assignment import assign_round_referees, load_referee_workload, plan_referees, DEFAULT_MATCH_MINUTES
+from match_details import fetch_match_details
+from query_stats import instrumented, track_queries
+from app_logging import request_logging
+from responses import dumps, json_response, compress_responses
 
+@request_logging('teams')
+@compress_responses
+@track_queries('teams')
 def handler(event: dict, context) -> dict:
     '''API для работы с командами, турнирами, новостями и матчами'''
     method = event.get('httpMethod', 'GET')
@@ -26,7 +38,7 @@ def handler(event: dict, context) -> dict:
 
     try:
         conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=instrumented(RealDictCursor))
         
         if method == 'GET':
             path = event.get('queryStringParameters', {})
@@ -65,6 +77,10 @@ def handler(event: dict, context) -> dict:
                 return get_user_teams(cur, conn, event)
             elif action == 'get_team_by_id':
                 return get_team_by_id(cur, conn, body)
+            elif action == 'get_team_history':
+                return get_team_history(cur, conn, body)
+            elif action == 'get_head_to_head':
+                return get_head_to_head(cur, conn, body)
             elif action == 'search_users':
                 return search_users(cur, conn, body)
             elif action == 'remove_member':
@@ -99,6 +115,33 @@ def handler(event: dict, context) -> dict:
     except Exception as e:
         return error_response(str(e), 500)
 
+def get_team_history(cur, conn, body: dict) -> dict:
+    '''История завершенных матчей команды (пагинация по cursor)'''
+    team_id = body.get('team_id')
+    if not team_id:
+        return error_response('team_id обязателен', 400)
+    
+    try:
+        page = fetch_team_history(cur, int(team_id), page_limit(body.get('limit')), body.get('cursor'))
+    except ValueError:
+        return error_response('Некорректный cursor или limit', 400)
+    
+    return json_response(page)
+
+def get_head_to_head(cur, conn, body: dict) -> dict:
+    '''Личные встречи двух команд с итогом (пагинация по cursor)'''
+    team_id = body.get('team_id')
+    opponent_id = body.get('opponent_id')
+    if not team_id or not opponent_id:
+        return error_response('team_id и opponent_id обязательны', 400)
+    
+    try:
+        page = fetch_head_to_head(cur, int(team_id), int(opponent_id), page_limit(body.get('limit')), body.get('cursor'))
+    except ValueError:
+        return error_response('Некорректный cursor или limit', 400)
+    
+    return json_response(page)
+
 def get_team_by_id(cur, conn, body) -> dict:
     '''Получение одной команды по ID'''
     try:
@@ -173,7 +216,7 @@ def get_team_by_id(cur, conn, body) -> dict:
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps({'team': team}),
+            'body': dumps({'team': team}),
             'isBase64Encoded': False
         }
     except Exception as e:
@@ -182,7 +225,8 @@ def get_team_by_id(cur, conn, body) -> dict:
 def get_verified_teams(cur, conn) -> dict:
     '''Получение всех верифицированных команд с их составами'''
     try:
-        # Простой запрос без сложных вычислений
+        # Значения по умолчанию и процент побед считаются в запросе,
+        # строки курсора отдаются в ответ без пересборки
         cur.execute("""
             SELECT 
                 id,
@@ -190,47 +234,26 @@ def get_verified_teams(cur, conn) -> dict:
                 tag,
                 logo_url,
                 captain_id,
-                wins,
-                losses,
-                draws,
-                rating,
-                verified,
+                COALESCE(wins, 0) AS wins,
+                COALESCE(losses, 0) AS losses,
+                COALESCE(draws, 0) AS draws,
+                COALESCE(rating, 1000) AS rating,
+                COALESCE(verified, FALSE) AS verified,
                 description,
                 created_at,
-                level,
-                points,
-                team_color
+                COALESCE(level, 2) AS level,
+                COALESCE(points, 200) AS points,
+                COALESCE(team_color, '#FFFFFF') AS team_color,
+                CASE WHEN COALESCE(wins, 0) + COALESCE(losses, 0) > 0
+                     THEN ROUND(COALESCE(wins, 0) * 100.0 / (COALESCE(wins, 0) + COALESCE(losses, 0)))::int
+                     ELSE 0
+                END AS win_rate
             FROM t_p4831367_esport_gta_disaster.teams
-            ORDER BY rating DESC, level DESC NULLS LAST
+            ORDER BY teams.rating DESC, teams.level DESC NULLS LAST
         """)
-        team_rows = cur.fetchall()
-        
-        teams = []
-        for row in team_rows:
-            # Безопасное получение значений с дефолтами
-            wins = row.get('wins') or 0
-            losses = row.get('losses') or 0
-            win_rate = round((wins / (wins + losses) * 100)) if (wins + losses) > 0 else 0
-            
-            team = {
-                'id': row.get('id'),
-                'name': row.get('name'),
-                'tag': row.get('tag'),
-                'logo_url': row.get('logo_url'),
-                'captain_id': row.get('captain_id'),
-                'wins': wins,
-                'losses': losses,
-                'draws': row.get('draws') or 0,
-                'rating': row.get('rating') or 1000,
-                'verified': row.get('verified') or False,
-                'description': row.get('description'),
-                'created_at': row['created_at'].isoformat() if row.get('created_at') else None,
-                'level': row.get('level') or 2,
-                'points': row.get('points') or 200,
-                'team_color': row.get('team_color') or '#FFFFFF',
-                'win_rate': win_rate
-            }
-            
+        teams = cur.fetchall()
+        
+        for team in teams:
             # Получаем членов команды
             try:
                 cur.execute("""
@@ -247,38 +270,17 @@ def get_verified_teams(cur, conn) -> dict:
                     ORDER BY tm.is_captain DESC, tm.joined_at ASC
                 """, (team['id'],))
                 
-                members = []
-                for m_row in cur.fetchall():
-                    members.append({
-                        'id': m_row.get('id'),
-                        'user_id': m_row.get('user_id'),
-                        'member_role': m_row.get('member_role'),
-                        'joined_at': m_row['joined_at'].isoformat() if m_row.get('joined_at') else None,
-                        'nickname': m_row.get('nickname'),
-                        'avatar_url': m_row.get('avatar_url')
-                    })
-                
-                team['members'] = members
-                team['member_count'] = len(members)
+                team['members'] = cur.fetchall()
+                team['member_count'] = len(team['members'])
             except Exception as member_error:
                 # Если ошибка при получении членов, просто ставим пустой список
                 team['members'] = []
                 team['member_count'] = 0
-            
-            teams.append(team)
         
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'teams': teams,
-                'total': len(teams)
-            }),
-            'isBase64Encoded': False
-        }
+        return json_response({
+            'teams': teams,
+            'total': len(teams)
+        })
     
     except Exception as e:
         return error_response(f'Error in get_verified_teams: {str(e)}', 500)
@@ -290,67 +292,37 @@ def get_match_details(cur, conn, event: dict) -> dict:
     if not match_id:
         return error_response('Укажите ID матча', 400)
     
-    cur.execute("""
-        SELECT 
-            bm.id, bm.team1_id, bm.team2_id, bm.round, bm.match_order,
-            bm.team1_score, bm.team2_score, bm.status, bm.match_details,
-            bm.team1_captain_confirmed, bm.team2_captain_confirmed,
-            bm.moderator_verified, bm.completed_at, bm.referee_id,
-            t1.name as team1_name, t1.logo_url as team1_logo, t1.captain_id as team1_captain, t1.team_color as team1_color,
-            t2.name as team2_name, t2.logo_url as team2_logo, t2.captain_id as team2_captain, t2.team_color as team2_color,
-            u.nickname as referee_name
-        FROM t_p4831367_esport_gta_disaster.bracket_matches bm
-        LEFT JOIN t_p4831367_esport_gta_disaster.teams t1 ON bm.team1_id = t1.id
-        LEFT JOIN t_p4831367_esport_gta_disaster.teams t2 ON bm.team2_id = t2.id
-        LEFT JOIN t_p4831367_esport_gta_disaster.users u ON bm.referee_id = u.id
-        WHERE bm.id = %s
-    """, (match_id,))
-    
-    match = cur.fetchone()
+    match = fetch_match_details(cur, match_id)
     
     if not match:
         return error_response('Матч не найден', 404)
     
-    cur.execute("""
-        SELECT 
-            ms.id, ms.team_id, ms.screenshot_url, ms.description, 
-            ms.uploaded_at, u.nickname as uploaded_by_name,
-            t.name as team_name
-        FROM t_p4831367_esport_gta_disaster.match_screenshots ms
-        JOIN t_p4831367_esport_gta_disaster.users u ON ms.uploaded_by = u.id
-        JOIN t_p4831367_esport_gta_disaster.teams t ON ms.team_id = t.id
-        WHERE ms.match_id = %s
-        ORDER BY ms.uploaded_at DESC
-    """, (match_id,))
-    
-    screenshots = cur.fetchall()
-    
-    cur.execute("""
-        SELECT tm.user_id, u.nickname, u.avatar_url, tm.player_role
-        FROM t_p4831367_esport_gta_disaster.team_members tm
-        JOIN t_p4831367_esport_gta_disaster.users u ON tm.user_id = u.id
-        WHERE tm.team_id = %s
-    """, (match['team1_id'],))
-    team1_members = cur.fetchall()
-    
-    cur.execute("""
-        SELECT tm.user_id, u.nickname, u.avatar_url, tm.player_role
-        FROM t_p4831367_esport_gta_disaster.team_members tm
-        JOIN t_p4831367_esport_gta_disaster.users u ON tm.user_id = u.id
-        WHERE tm.team_id = %s
-    """, (match['team2_id'],))
-    team2_members = cur.fetchall()
+    def format_team(team):
+        if not team:
+            return {'name': None, 'logo_url': None, 'captain_id': None, 'color': generate_random_color(), 'members': []}
+        return {
+            'name': team['name'],
+            'logo_url': team['logo_url'],
+            'captain_id': team['captain_id'],
+            'color': team['team_color'] or generate_random_color(),
+            'members': [{
+                'id': m['user_id'],
+                'nickname': m['nickname'],
+                'avatar_url': m['avatar_url'],
+                'role': m['player_role']
+            } for m in team['members']]
+        }
     
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({
+        'body': dumps({
             'match': {
                 'id': match['id'],
                 'team1_id': match['team1_id'],
                 'team2_id': match['team2_id'],
                 'round': match['round'],
-                'match_order': match['match_order'],
+                'match_order': match['match_number'],
                 'team1_score': match['team1_score'],
                 'team2_score': match['team2_score'],
                 'status': match['status'],
@@ -358,46 +330,14 @@ def get_match_details(cur, conn, event: dict) -> dict:
                 'team1_captain_confirmed': match['team1_captain_confirmed'],
                 'team2_captain_confirmed': match['team2_captain_confirmed'],
                 'moderator_verified': match['moderator_verified'],
-                'completed_at': match['completed_at'].isoformat() if match['completed_at'] else None,
-                'referee_id': match['referee_id'],
-                'team1': {
-                    'name': match['team1_name'],
-                    'logo_url': match['team1_logo'],
-                    'captain_id': match['team1_captain'],
-                    'color': match['team1_color'] or generate_random_color(),
-                    'members': [{
-                        'id': m['user_id'],
-                        'nickname': m['nickname'],
-                        'avatar_url': m['avatar_url'],
-                        'role': m['player_role']
-                    } for m in team1_members]
-                },
-                'team2': {
-                    'name': match['team2_name'],
-                    'logo_url': match['team2_logo'],
-                    'captain_id': match['team2_captain'],
-                    'color': match['team2_color'] or generate_random_color(),
-                    'members': [{
-                        'id': m['user_id'],
-                        'nickname': m['nickname'],
-                        'avatar_url': m['avatar_url'],
-                        'role': m['player_role']
-                    } for m in team2_members]
-                },
-                'referee': {
-                    'id': match['referee_id'],
-                    'nickname': match['referee_name']
-                } if match['referee_id'] else None
+                'completed_at': match['completed_at'],
+                'referee_id': match['referee']['id'] if match['referee'] else None,
+                'team1': format_team(match['team1']),
+                'team2': format_team(match['team2']),
+                'referee': match['referee'],
+                'map_scores': match['map_scores']
             },
-            'screenshots': [{
-                'id': s['id'],
-                'team_id': s['team_id'],
-                'screenshot_url': s['screenshot_url'],
-                'description': s['description'],
-                'uploaded_at': s['uploaded_at'].isoformat() if s['uploaded_at'] else None,
-                'uploaded_by_name': s['uploaded_by_name'],
-                'team_name': s['team_name']
-            } for s in screenshots]
+            'screenshots': match['screenshots']
         }),
         'isBase64Encoded': False
     }
@@ -488,7 +428,7 @@ def upload_screenshot(cur, conn, body: dict, event: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({
+            'body': dumps({
                 'success': True,
                 'screenshot_id': screenshot_id,
                 'screenshot_url': cdn_url
@@ -583,16 +523,26 @@ def confirm_result(cur, conn, body: dict, event: dict) -> dict:
     
     conn.commit()
     
+    if team1_confirmed and team2_confirmed:
+        award_match_achievements(cur, conn, int(match_id))
+    
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({
+        'body': dumps({
             'success': True,
             'both_confirmed': team1_confirmed and team2_confirmed
         }),
         'isBase64Encoded': False
     }
 
+def clear_final_maps(cur, match_id):
+    '''Удаляет итоговые карты судьи (source = 'final'), когда счет или победитель матча перезаписаны вручную'''
+    cur.execute("""
+        DELETE FROM t_p4831367_esport_gta_disaster.bracket_match_maps
+        WHERE match_id = %s AND source = 'final'
+    """, (match_id,))
+
 def update_score(cur, conn, body: dict, event: dict) -> dict:
     '''Обновление счета матча (капитаны или модераторы)'''
     session_token = event.get('headers', {}).get('X-Session-Token')
@@ -647,13 +597,14 @@ def update_score(cur, conn, body: dict, event: dict) -> dict:
         SET team1_score = %s, team2_score = %s
         WHERE id = %s
     """, (team1_score, team2_score, match_id))
+    clear_final_maps(cur, match_id)
     
     conn.commit()
     
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True}),
+        'body': dumps({'success': True}),
         'isBase64Encoded': False
     }
 
@@ -723,6 +674,7 @@ def moderate_match(cur, conn, body: dict, event: dict) -> dict:
             SET winner_id = %s, status = 'completed', moderator_verified = TRUE, completed_at = NOW()
             WHERE id = %s
         """, (winner_id, match_id))
+        clear_final_maps(cur, match_id)
         
         # Обновляем рейтинг команд
         try:
@@ -735,15 +687,18 @@ def moderate_match(cur, conn, body: dict, event: dict) -> dict:
     
     conn.commit()
     
+    if action == 'force_complete':
+        award_match_achievements(cur, conn, int(match_id))
+    
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True}),
+        'body': dumps({'success': True}),
         'isBase64Encoded': False
     }
 
 def assign_referee(cur, conn, body: dict, event: dict) -> dict:
-    '''Назначение судьи на матч (автоматически или вручную)'''
+    '''Назначение судьи на матч или на все ожидающие матчи раунда (автоматически или вручную)'''
     session_token = event.get('headers', {}).get('X-Session-Token')
     
     if not session_token:
@@ -767,9 +722,21 @@ def assign_referee(cur, conn, body: dict, event: dict) -> dict:
     
     match_id = body.get('match_id')
     referee_id = body.get('referee_id')
+    match_minutes = int(body.get('match_minutes') or DEFAULT_MATCH_MINUTES)
+    
+    if body.get('tournament_id') and body.get('round'):
+        result = assign_round_referees(
+            cur, int(body['tournament_id']), int(body['round']), match_minutes, bool(body.get('reassign'))
+        )
+        conn.commit()
+        return json_response({
+            'success': True,
+            'assigned': [{'match_id': m_id, 'referee_id': r_id} for m_id, r_id in result['assigned'].items()],
+            'unassigned': result['unassigned']
+        })
     
     if not match_id:
-        return error_response('Укажите match_id', 400)
+        return error_response('Укажите match_id или tournament_id и round', 400)
     
     if referee_id:
         cur.execute("""
@@ -778,27 +745,30 @@ def assign_referee(cur, conn, body: dict, event: dict) -> dict:
             WHERE id = %s
         """, (referee_id, match_id))
     else:
+        # Наименее загруженный судья без пересечения по времени
         cur.execute("""
-            SELECT id FROM t_p4831367_esport_gta_disaster.users 
-            WHERE role = 'referee'
-            ORDER BY RANDOM()
-            LIMIT 1
-        """)
-        referee = cur.fetchone()
+            SELECT id, scheduled_at FROM t_p4831367_esport_gta_disaster.bracket_matches
+            WHERE id = %s
+        """, (match_id,))
+        match = cur.fetchone()
+        if not match:
+            return error_response('Матч не найден', 404)
         
-        if referee:
+        referee_id = plan_referees([match], load_referee_workload(cur), match_minutes).get(match['id'])
+        
+        if referee_id:
             cur.execute("""
                 UPDATE bracket_matches
                 SET referee_id = %s
                 WHERE id = %s
-            """, (referee['id'], match_id))
+            """, (referee_id, match_id))
     
     conn.commit()
     
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True}),
+        'body': dumps({'success': True}),
         'isBase64Encoded': False
     }
 
@@ -859,7 +829,7 @@ def nullify_match(cur, conn, body: dict, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'message': 'Результат матча аннулирован'}),
+        'body': dumps({'success': True, 'message': 'Результат матча аннулирован'}),
         'isBase64Encoded': False
     }
 
@@ -921,7 +891,7 @@ def get_tournaments(cur, conn, params: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(tournament),
+            'body': dumps(tournament),
             'isBase64Encoded': False
         }
     
@@ -954,7 +924,7 @@ def get_tournaments(cur, conn, params: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'tournaments': tournaments}),
+            'body': dumps({'tournaments': tournaments}),
             'isBase64Encoded': False
         }
 
@@ -987,7 +957,7 @@ def get_news(cur, conn, params: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(news_item),
+            'body': dumps(news_item),
             'isBase64Encoded': False
         }
     
@@ -1020,7 +990,7 @@ def get_news(cur, conn, params: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({
+            'body': dumps({
                 'news': news_list,
                 'total': total,
                 'limit': limit,
@@ -1073,7 +1043,7 @@ def get_tournament_matches(cur, conn, params: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'matches': matches}),
+        'body': dumps({'matches': matches}),
         'isBase64Encoded': False
     }
 
@@ -1124,7 +1094,7 @@ def accept_invitation(cur, conn, body: dict, event: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'success': True, 'message': 'Вы вступили в команду'}),
+            'body': dumps({'success': True, 'message': 'Вы вступили в команду'}),
             'isBase64Encoded': False
         }
     except Exception as e:
@@ -1166,7 +1136,7 @@ def reject_invitation(cur, conn, body: dict, event: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'success': True, 'message': 'Приглашение отклонено'}),
+            'body': dumps({'success': True, 'message': 'Приглашение отклонено'}),
             'isBase64Encoded': False
         }
     except Exception as e:
@@ -1209,7 +1179,7 @@ def leave_team(cur, conn, body: dict, event: dict) -> dict:
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'success': True, 'message': 'Вы покинули команду'}),
+            'body': dumps({'success': True, 'message': 'Вы покинули команду'}),
             'isBase64Encoded': False
         }
     except Exception as e:
@@ -1221,7 +1191,7 @@ def error_response(message: str, status: int) -> dict:
     return {
         'statusCode': status,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'error': message}),
+        'body': dumps({'error': message}),
         'isBase64Encoded': False
     }
 
@@ -1282,29 +1252,29 @@ def create_team(cur, conn, body: dict, event: dict) -> dict:
         VALUES (%s, %s, 'main', TRUE, 'active', NOW())
     """, (team_id, user_id))
     
-    for idx, player in enumerate(players[:7]):
-        if player.get('user_id') and player['user_id'] != int(user_id):
-            role = player.get('role', 'main')
-            
-            cur.execute("""
-                SELECT nickname FROM t_p4831367_esport_gta_disaster.users WHERE id = %s
-            """, (player['user_id'],))
-            
-            user_exists = cur.fetchone()
-            if user_exists:
-                cur.execute("""
-                    INSERT INTO t_p4831367_esport_gta_disaster.team_members 
-                    (team_id, user_id, player_role, is_captain, status, joined_at)
-                    VALUES (%s, %s, %s, FALSE, 'active', NOW())
-                    ON CONFLICT (team_id, user_id) DO NOTHING
-                """, (team_id, player['user_id'], role))
+    player_roles = {}
+    for player in players[:7]:
+        if player.get('user_id') and int(player['user_id']) != int(user_id):
+            player_roles.setdefault(int(player['user_id']), player.get('role', 'main'))
+    
+    roster = validate_roster(cur, list(player_roles.keys()))
+    unknown = set(roster['unknown'])
+    members = [(team_id, pid, player_roles[pid]) for pid in roster['player_ids'] if pid not in unknown]
+    
+    if members:
+        execute_values(cur, """
+            INSERT INTO t_p4831367_esport_gta_disaster.team_members 
+            (team_id, user_id, player_role, is_captain, status, joined_at)
+            VALUES %s
+            ON CONFLICT (team_id, user_id) DO NOTHING
+        """, members, template="(%s, %s, %s, FALSE, 'active', NOW())")
     
     conn.commit()
     
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'team_id': team_id, 'message': f'Команда "{name}" создана'}),
+        'body': dumps({'success': True, 'team_id': team_id, 'message': f'Команда "{name}" создана'}),
         'isBase64Encoded': False
     }
 
@@ -1334,10 +1304,16 @@ def invite_player(cur, conn, body: dict, event: dict) -> dict:
     if team['captain_id'] != int(user_id):
         return error_response('Только капитан может приглашать игроков', 403)
     
-    cur.execute("SELECT COUNT(*) FROM t_p4831367_esport_gta_disaster.team_members WHERE user_id = %s AND status = 'active'", (invited_user_id,))
-    team_count = cur.fetchone()[0]
+    roster = validate_roster(cur, [invited_user_id], team_id)
+    invited_user_id = roster['player_ids'][0]
     
-    if team_count >= 3:
+    if roster['unknown']:
+        return error_response('Пользователь не найден', 404)
+    
+    if invited_user_id not in roster['not_in_team']:
+        return error_response('Игрок уже состоит в команде', 400)
+    
+    if roster['team_counts'][invited_user_id] >= 3:
         return error_response('Этот игрок уже состоит в 3 командах', 403)
     
     cur.execute("""
@@ -1353,7 +1329,7 @@ def invite_player(cur, conn, body: dict, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'message': 'Приглашение отправлено'}),
+        'body': dumps({'success': True, 'message': 'Приглашение отправлено'}),
         'isBase64Encoded': False
     }
 
@@ -1418,7 +1394,7 @@ def respond_invitation(cur, conn, body: dict, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'message': message}),
+        'body': dumps({'success': True, 'message': message}),
         'isBase64Encoded': False
     }
 
@@ -1465,7 +1441,7 @@ def get_invitations(cur, conn, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'invitations': invitations}),
+        'body': dumps({'invitations': invitations}),
         'isBase64Encoded': False
     }
 
@@ -1514,7 +1490,7 @@ def get_user_teams(cur, conn, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'teams': teams}),
+        'body': dumps({'teams': teams}),
         'isBase64Encoded': False
     }
 
@@ -1562,7 +1538,7 @@ def remove_member(cur, conn, body: dict, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'message': 'Участник исключён из команды'}),
+        'body': dumps({'success': True, 'message': 'Участник исключён из команды'}),
         'isBase64Encoded': False
     }
 
@@ -1627,7 +1603,7 @@ def transfer_captaincy(cur, conn, body: dict, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'message': 'Капитанство успешно передано'}),
+        'body': dumps({'success': True, 'message': 'Капитанство успешно передано'}),
         'isBase64Encoded': False
     }
 
@@ -1638,27 +1614,12 @@ def search_users(cur, conn, body: dict) -> dict:
     if len(query) < 2:
         return error_response('Минимум 2 символа для поиска', 400)
     
-    cur.execute("""
-        SELECT id, nickname, avatar_url, rating
-        FROM t_p4831367_esport_gta_disaster.users
-        WHERE nickname ILIKE %s
-        ORDER BY rating DESC
-        LIMIT 20
-    """, (f'%{query}%',))
-    
-    users = []
-    for row in cur.fetchall():
-        users.append({
-            'id': row['id'],
-            'nickname': row['nickname'],
-            'avatar_url': row['avatar_url'],
-            'rating': row['rating'] or 1000
-        })
+    users = search_users_by_nickname(cur, query)
     
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'users': users}),
+        'body': dumps({'users': users}),
         'isBase64Encoded': False
     }
 
@@ -1707,15 +1668,13 @@ def register_tournament(cur, conn, body: dict, event: dict) -> dict:
     if tournament['is_started']:
         return error_response('Регистрация на турнир закрыта (турнир начат)', 403)
     
-    for player_id in main_players + reserve_players:
-        cur.execute("""
-            SELECT COUNT(*) as count FROM t_p4831367_esport_gta_disaster.team_members 
-            WHERE team_id = %s AND user_id = %s AND status = 'active'
-        """, (team_id, player_id))
-        
-        player_check = cur.fetchone()
-        if not player_check or player_check['count'] == 0:
-            return error_response(f'Игрок {player_id} не состоит в команде', 400)
+    roster = validate_roster(cur, main_players + reserve_players, team_id)
+    missing = roster['not_in_team']
+    
+    if len(missing) == 1:
+        return error_response(f'Игрок {missing[0]} не состоит в команде', 400)
+    if missing:
+        return error_response(f'Игроки {", ".join(str(p) for p in missing)} не состоят в команде', 400)
     
     cur.execute("""
         INSERT INTO t_p4831367_esport_gta_disaster.tournament_registrations 
@@ -1725,19 +1684,33 @@ def register_tournament(cur, conn, body: dict, event: dict) -> dict:
         SET main_players = EXCLUDED.main_players,
             reserve_players = EXCLUDED.reserve_players,
             registered_at = NOW()
-        RETURNING id
+        RETURNING id, (xmax = 0) AS inserted
     """, (tournament_id, team_id, json.dumps(main_players), json.dumps(reserve_players)))
     
     result = cur.fetchone()
     if not result:
         return error_response('Ошибка регистрации', 500)
     
+    # Новая заявка занимает место на турнире (условный UPDATE под блокировкой
+    # строки турнира); изменение состава существующей заявки места не требует
+    if result['inserted']:
+        cur.execute("""
+            UPDATE t_p4831367_esport_gta_disaster.tournaments
+            SET registered_count = registered_count + 1
+            WHERE id = %s AND (max_teams IS NULL OR registered_count < max_teams)
+            RETURNING registered_count
+        """, (tournament_id,))
+        
+        if not cur.fetchone():
+            conn.rollback()
+            return error_response('Достигнуто максимальное количество команд', 400)
+    
     conn.commit()
     
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'message': 'Заявка на участие отправлена'}),
+        'body': dumps({'success': True, 'message': 'Заявка на участие отправлена'}),
         'isBase64Encoded': False
     }
 
@@ -1800,7 +1773,7 @@ def get_bracket(cur, conn, body: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'matches': matches}),
+        'body': dumps({'matches': matches}),
         'isBase64Encoded': False
     }
 
@@ -1907,6 +1880,6 @@ def generate_bracket(cur, conn, body: dict, event: dict) -> dict:
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-        'body': json.dumps({'success': True, 'message': 'Турнирная сетка сгенерирована', 'teams_count': len([t for t in teams if t])}),
+        'body': dumps({'success': True, 'message': 'Турнирная сетка сгенерирована', 'teams_count': len([t for t in teams if t])}),
         'isBase64Encoded': False
     }
\ No newline at end of file
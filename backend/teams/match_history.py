@@ -0,0 +1,101 @@
+from datetime import datetime
+
+HISTORY_PAGE_SIZE = 20
+HISTORY_MAX_PAGE_SIZE = 100
+
+HISTORY_COLUMNS = """
+    h.match_id, h.tournament_id, tr.name as tournament_name,
+    h.opponent_id, o.name as opponent_name, o.logo_url as opponent_logo,
+    h.result, h.team_score, h.opponent_score, h.completed_at
+"""
+
+
+def parse_cursor(cursor):
+    """
+    Курсор пагинации '<completed_at ISO>|<match_id>' -> (datetime, int).
+
+    Raises:
+        ValueError: если курсор некорректен
+    """
+    if not cursor:
+        return None, None
+    completed_at, _, match_id = str(cursor).rpartition('|')
+    return datetime.fromisoformat(completed_at), int(match_id)
+
+
+def page_limit(value) -> int:
+    return max(1, min(int(value or HISTORY_PAGE_SIZE), HISTORY_MAX_PAGE_SIZE))
+
+
+def build_page(rows: list, limit: int) -> dict:
+    """Страница истории и курсор следующей (лишняя строка показывает, что она есть)"""
+    matches = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = matches[-1]
+        next_cursor = f"{last['completed_at'].isoformat()}|{last['match_id']}"
+    return {'matches': matches, 'next_cursor': next_cursor}
+
+
+def fetch_team_history(cur, team_id: int, limit: int = HISTORY_PAGE_SIZE, cursor=None) -> dict:
+    """
+    Завершенные матчи команды от новых к старым: одно сканирование индекса
+    (team_id, completed_at DESC, match_id DESC) с пагинацией по ключу.
+
+    Returns:
+        dict: {'matches': [...], 'next_cursor': str | None}
+    """
+    before_at, before_id = parse_cursor(cursor)
+    cur.execute(f"""
+        SELECT {HISTORY_COLUMNS}
+        FROM t_p4831367_esport_gta_disaster.team_match_history h
+        LEFT JOIN t_p4831367_esport_gta_disaster.teams o ON h.opponent_id = o.id
+        LEFT JOIN t_p4831367_esport_gta_disaster.tournaments tr ON h.tournament_id = tr.id
+        WHERE h.team_id = %s
+        AND (%s::timestamp IS NULL OR (h.completed_at, h.match_id) < (%s::timestamp, %s))
+        ORDER BY h.completed_at DESC, h.match_id DESC
+        LIMIT %s
+    """, (team_id, before_at, before_at, before_id, limit + 1))
+    return build_page(cur.fetchall(), limit)
+
+
+def fetch_head_to_head(cur, team_id: int, opponent_id: int, limit: int = HISTORY_PAGE_SIZE, cursor=None) -> dict:
+    """
+    Личные встречи двух команд с точки зрения team_id по индексу
+    (team_id, opponent_id, completed_at DESC, match_id DESC).
+
+    Итог встреч (победы, поражения, ничьи) считается оконными функциями в
+    том же запросе и возвращается на первой странице.
+
+    Returns:
+        dict: {'matches': [...], 'next_cursor': str | None, 'summary': dict | None}
+    """
+    before_at, before_id = parse_cursor(cursor)
+    cur.execute(f"""
+        SELECT {HISTORY_COLUMNS},
+               COUNT(*) OVER () as total,
+               COUNT(*) FILTER (WHERE h.result = 'win') OVER () as wins,
+               COUNT(*) FILTER (WHERE h.result = 'loss') OVER () as losses,
+               COUNT(*) FILTER (WHERE h.result = 'draw') OVER () as draws
+        FROM t_p4831367_esport_gta_disaster.team_match_history h
+        LEFT JOIN t_p4831367_esport_gta_disaster.teams o ON h.opponent_id = o.id
+        LEFT JOIN t_p4831367_esport_gta_disaster.tournaments tr ON h.tournament_id = tr.id
+        WHERE h.team_id = %s
+        AND h.opponent_id = %s
+        AND (%s::timestamp IS NULL OR (h.completed_at, h.match_id) < (%s::timestamp, %s))
+        ORDER BY h.completed_at DESC, h.match_id DESC
+        LIMIT %s
+    """, (team_id, opponent_id, before_at, before_at, before_id, limit + 1))
+    rows = cur.fetchall()
+
+    summary = None
+    if cursor is None:
+        first = rows[0] if rows else {}
+        summary = {key: first.get(key, 0) for key in ('total', 'wins', 'losses', 'draws')}
+    for row in rows:
+        for key in ('total', 'wins', 'losses', 'draws'):
+            del row[key]
+
+    page = build_page(rows, limit)
+    page['summary'] = summary
+    return page
@@ -0,0 +1,121 @@
+import heapq
+from datetime import timedelta
+from psycopg2.extras import execute_values
+
+DEFAULT_MATCH_MINUTES = 60
+
+
+def load_referee_workload(cur) -> dict:
+    """
+    Нагрузка всех судей одним запросом к представлению referee_workload (V0069).
+
+    Returns:
+        dict: {referee_id: {'active_matches': int, 'scheduled': [datetime, ...]}}
+    """
+    cur.execute("""
+        SELECT referee_id, active_matches, scheduled
+        FROM t_p4831367_esport_gta_disaster.referee_workload
+    """)
+    return {
+        row['referee_id']: {'active_matches': row['active_matches'], 'scheduled': list(row['scheduled'])}
+        for row in cur.fetchall()
+    }
+
+
+def has_conflict(scheduled: list, at, match_minutes: int) -> bool:
+    """Пересекается ли матч в момент at с уже назначенными судье матчами"""
+    if at is None:
+        return False
+    window = timedelta(minutes=match_minutes)
+    return any(abs(other - at) < window for other in scheduled)
+
+
+def plan_referees(matches: list, workload: dict, match_minutes: int = DEFAULT_MATCH_MINUTES) -> dict:
+    """
+    Распределяет судей по матчам: каждому матчу — наименее загруженный судья
+    без пересечения по времени (куча по числу активных матчей).
+
+    Args:
+        matches: [{'id', 'scheduled_at'}] в порядке назначения
+        workload: результат load_referee_workload
+
+    Returns:
+        dict: {match_id: referee_id}; матчи без свободного судьи не попадают в результат
+    """
+    heap = [(load['active_matches'], referee_id) for referee_id, load in workload.items()]
+    heapq.heapify(heap)
+    assignments = {}
+
+    for match in matches:
+        skipped = []
+        chosen = None
+        while heap:
+            load, referee_id = heapq.heappop(heap)
+            if has_conflict(workload[referee_id]['scheduled'], match['scheduled_at'], match_minutes):
+                skipped.append((load, referee_id))
+                continue
+            chosen = (load, referee_id)
+            break
+
+        if chosen:
+            load, referee_id = chosen
+            assignments[match['id']] = referee_id
+            if match['scheduled_at'] is not None:
+                workload[referee_id]['scheduled'].append(match['scheduled_at'])
+            heapq.heappush(heap, (load + 1, referee_id))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+
+    return assignments
+
+
+def assign_round_referees(cur, tournament_id: int, round_num: int, match_minutes: int = DEFAULT_MATCH_MINUTES,
+                          reassign: bool = False) -> dict:
+    """
+    Назначает судей всем ожидающим матчам раунда: нагрузка одним запросом,
+    распределение в памяти, запись одним UPDATE ... FROM (VALUES ...).
+
+    reassign: перераспределить и матчи, у которых судья уже есть.
+
+    Returns:
+        dict: {'assigned': {match_id: referee_id}, 'unassigned': [match_id, ...]}
+    """
+    cur.execute("""
+        SELECT bm.id, bm.scheduled_at, bm.referee_id
+        FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+        JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+        WHERE tb.tournament_id = %s
+        AND bm.round = %s
+        AND bm.status = 'pending'
+        AND (%s OR bm.referee_id IS NULL)
+        ORDER BY bm.scheduled_at NULLS LAST, bm.match_number
+    """, (tournament_id, round_num, reassign))
+    matches = cur.fetchall()
+
+    if not matches:
+        return {'assigned': {}, 'unassigned': []}
+
+    workload = load_referee_workload(cur)
+
+    # Перераспределяемые матчи не должны считаться нагрузкой прежних судей
+    for match in matches:
+        load = workload.get(match['referee_id'])
+        if load:
+            load['active_matches'] -= 1
+            if match['scheduled_at'] in load['scheduled']:
+                load['scheduled'].remove(match['scheduled_at'])
+
+    assignments = plan_referees(matches, workload, match_minutes)
+
+    if assignments:
+        execute_values(cur, """
+            UPDATE t_p4831367_esport_gta_disaster.bracket_matches bm
+            SET referee_id = v.referee_id, updated_at = NOW()
+            FROM (VALUES %s) AS v(match_id, referee_id)
+            WHERE bm.id = v.match_id
+        """, list(assignments.items()), page_size=len(assignments))
+
+    return {
+        'assigned': assignments,
+        'unassigned': [match['id'] for match in matches if match['id'] not in assignments]
+    }
@@ -0,0 +1,149 @@
+import os
+import gzip
+import json
+import base64
+import hashlib
+from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import wraps
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_HEADERS = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', '2048'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSED_CACHE_SIZE = 32
+
+# (кодировка, хэш тела) -> сжатое тело в base64. Одинаковое тело (та же
+# версия данных) сжимается один раз на инстанс
+_compressed = OrderedDict()
+
+
+def _default(value):
+    """Типы, которые не сериализуются напрямую (datetime у orjson встроен)"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, memoryview):
+        return value.tobytes().decode('utf-8', 'replace')
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(payload) -> str:
+    """
+    Сериализует ответ в JSON: orjson, если установлен, иначе stdlib json.
+
+    Строки курсора (RealDictRow), datetime и Decimal передаются как есть,
+    без предварительного пересоздания словарей и .isoformat().
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(',', ':'))
+
+
+def json_response(payload, status: int = 200, headers: dict = None) -> dict:
+    """Ответ функции с JSON-телом"""
+    response_headers = dict(JSON_HEADERS)
+    if headers:
+        response_headers.update(headers)
+    return {
+        'statusCode': status,
+        'headers': response_headers,
+        'body': dumps(payload),
+        'isBase64Encoded': False
+    }
+
+
+def accepted_encoding(event: dict):
+    """Лучшая поддерживаемая кодировка из Accept-Encoding: br, gzip или None"""
+    headers = event.get('headers') or {}
+    header = ''
+    for key, value in headers.items():
+        if key.lower() == 'accept-encoding':
+            header = str(value).lower()
+            break
+
+    offered = set()
+    for part in header.split(','):
+        name, _, params = part.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            offered.add(name.strip())
+
+    if brotli is not None and 'br' in offered:
+        return 'br'
+    if 'gzip' in offered or '*' in offered:
+        return 'gzip'
+    return None
+
+
+def compress_body(body: str, encoding: str) -> str:
+    """Сжатое тело в base64 (с кэшем по содержимому)"""
+    raw = body.encode('utf-8')
+    key = (encoding, hashlib.blake2b(raw, digest_size=16).digest())
+    cached = _compressed.get(key)
+    if cached is not None:
+        _compressed.move_to_end(key)
+        return cached
+
+    if encoding == 'br':
+        data = brotli.compress(raw, quality=BROTLI_QUALITY)
+    else:
+        data = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    encoded = base64.b64encode(data).decode('ascii')
+
+    _compressed[key] = encoded
+    if len(_compressed) > COMPRESSED_CACHE_SIZE:
+        _compressed.popitem(last=False)
+    return encoded
+
+
+def compress_response(response: dict, event: dict) -> dict:
+    """Сжимает текстовое тело ответа, если клиент это поддерживает и тело достаточно большое"""
+    if not isinstance(response, dict) or response.get('isBase64Encoded'):
+        return response
+    body = response.get('body')
+    if not isinstance(body, str) or len(body) < COMPRESS_MIN_BYTES:
+        return response
+    headers = response.get('headers') or {}
+    if any(key.lower() == 'content-encoding' for key in headers):
+        return response
+
+    encoding = accepted_encoding(event)
+    if not encoding:
+        return response
+
+    compressed = dict(response)
+    compressed['headers'] = dict(headers, **{'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'})
+    compressed['body'] = compress_body(body, encoding)
+    compressed['isBase64Encoded'] = True
+    return compressed
+
+
+def compress_responses(handler):
+    """Декоратор handler(): сжатие ответа по Accept-Encoding (gzip/brotli)"""
+    @wraps(handler)
+    def wrapper(event: dict, context) -> dict:
+        return compress_response(handler(event, context), event)
+    return wrapper
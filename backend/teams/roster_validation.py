@@ -0,0 +1,53 @@
+def validate_roster(cur, player_ids: list, team_id: int = None) -> dict:
+    """
+    Проверяет набор игроков одним запросом (WHERE id = ANY(...)).
+
+    Args:
+        cur: Database cursor (RealDictCursor)
+        player_ids: ID игроков (в любом количестве)
+        team_id: Команда, членство в которой нужно проверить (необязательно)
+
+    Returns:
+        dict: {
+            'player_ids': ID игроков без дубликатов в исходном порядке,
+            'unknown': ID, которых нет среди пользователей,
+            'not_in_team': ID, не состоящие в команде team_id (если указана),
+            'team_counts': {ID: количество активных команд игрока}
+        }
+    """
+    unique_ids = []
+    for player_id in player_ids:
+        player_id = int(player_id)
+        if player_id not in unique_ids:
+            unique_ids.append(player_id)
+
+    result = {'player_ids': unique_ids, 'unknown': [], 'not_in_team': [], 'team_counts': {}}
+    if not unique_ids:
+        return result
+
+    cur.execute("""
+        SELECT 
+            u.id as user_id,
+            COUNT(tm.id) FILTER (WHERE tm.status = 'active') as active_teams,
+            COALESCE(BOOL_OR(tm.team_id = %s AND tm.status = 'active'), FALSE) as in_team
+        FROM t_p4831367_esport_gta_disaster.users u
+        LEFT JOIN t_p4831367_esport_gta_disaster.team_members tm ON tm.user_id = u.id
+        WHERE u.id = ANY(%s)
+        GROUP BY u.id
+    """, (team_id, unique_ids))
+
+    rows = {row['user_id']: row for row in cur.fetchall()}
+
+    for player_id in unique_ids:
+        row = rows.get(player_id)
+        if not row:
+            result['unknown'].append(player_id)
+            if team_id is not None:
+                result['not_in_team'].append(player_id)
+            continue
+
+        result['team_counts'][player_id] = row['active_teams']
+        if team_id is not None and not row['in_team']:
+            result['not_in_team'].append(player_id)
+
+    return result
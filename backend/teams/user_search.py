@@ -0,0 +1,131 @@
+import time
+from collections import OrderedDict
+
+SEARCH_LIMIT = 20
+CACHE_SIZE = 256
+CACHE_TTL_SECONDS = 30
+MIN_SUBSTRING_LENGTH = 3
+
+# query -> (время записи, пользователи, полный ли результат)
+_cache = OrderedDict()
+
+
+def escape_like(value: str) -> str:
+    """Экранирование спецсимволов LIKE"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def rank_key(user: dict, query: str) -> tuple:
+    """
+    Ключ сортировки результатов: точное совпадение, затем префикс,
+    затем подстрока; внутри группы — по рейтингу. Совпадает с ORDER BY в SQL.
+    """
+    nickname = user['nickname'].lower()
+    if nickname == query:
+        match_rank = 0
+    elif nickname.startswith(query):
+        match_rank = 1
+    else:
+        match_rank = 2
+    return (match_rank, -user['rating'], user['id'])
+
+
+def format_user(row) -> dict:
+    return {
+        'id': row['id'],
+        'nickname': row['nickname'],
+        'avatar_url': row['avatar_url'],
+        'rating': row['rating'] if row['rating'] is not None else 1000
+    }
+
+
+def get_cached(query: str):
+    """
+    Поиск в кэше: точное совпадение запроса или полный результат
+    по более короткому префиксу, который фильтруется локально.
+    """
+    now = time.monotonic()
+
+    # Короткие запросы (меньше MIN_SUBSTRING_LENGTH) ищутся только по точному ключу
+    shortest = min(len(query), MIN_SUBSTRING_LENGTH)
+    for length in range(len(query), shortest - 1, -1):
+        key = query[:length]
+        entry = _cache.get(key)
+        if not entry:
+            continue
+
+        cached_at, users, complete = entry
+        if now - cached_at > CACHE_TTL_SECONDS:
+            del _cache[key]
+            continue
+
+        if length == len(query):
+            _cache.move_to_end(key)
+            return users
+
+        if complete:
+            # Все ники, содержащие query, содержат и key — они уже в кэше
+            matched = [u for u in users if query in u['nickname'].lower()]
+            matched.sort(key=lambda u: rank_key(u, query))
+            return matched
+
+    return None
+
+
+def put_cached(query: str, users: list, complete: bool):
+    _cache[query] = (time.monotonic(), users, complete)
+    _cache.move_to_end(query)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+def search_users_by_nickname(cur, query: str, limit: int = SEARCH_LIMIT) -> list:
+    """
+    Поиск пользователей по никнейму с ранжированием совпадений.
+
+    Сначала префиксный поиск по btree-индексу LOWER(nickname) text_pattern_ops
+    (точное совпадение — первым), затем, если мест не хватило и запрос
+    не короче 3 символов, поиск подстроки по триграммному GIN-индексу.
+
+    Args:
+        cur: Database cursor (RealDictCursor)
+        query: Строка поиска
+        limit: Максимум результатов
+
+    Returns:
+        list: Пользователи в порядке релевантности
+    """
+    query = query.lower()
+
+    cached = get_cached(query)
+    if cached is not None:
+        return cached[:limit]
+
+    pattern = escape_like(query)
+
+    cur.execute("""
+        SELECT id, nickname, avatar_url, rating
+        FROM t_p4831367_esport_gta_disaster.users
+        WHERE LOWER(nickname) LIKE %s
+        ORDER BY LOWER(nickname) = %s DESC, COALESCE(rating, 1000) DESC, id
+        LIMIT %s
+    """, (pattern + '%', query, limit))
+
+    users = [format_user(row) for row in cur.fetchall()]
+    complete = False
+
+    if len(users) < limit and len(query) >= MIN_SUBSTRING_LENGTH:
+        cur.execute("""
+            SELECT id, nickname, avatar_url, rating
+            FROM t_p4831367_esport_gta_disaster.users
+            WHERE LOWER(nickname) LIKE %s AND LOWER(nickname) NOT LIKE %s
+            ORDER BY COALESCE(rating, 1000) DESC, id
+            LIMIT %s
+        """, ('%' + pattern + '%', pattern + '%', limit - len(users)))
+
+        users.extend(format_user(row) for row in cur.fetchall())
+        complete = len(users) < limit
+
+    put_cached(query, users, complete)
+
+    return users
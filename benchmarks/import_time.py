@@ -0,0 +1,111 @@
+"""
+Бенчмарк холодного старта: время импорта index.py каждой функции.
+
+Каждый замер запускает отдельный интерпретатор с -X importtime и пустым
+pycache_prefix (байткод компилируется заново, как на новом инстансе).
+Для admin-actions дополнительно замеряется загрузка каждой группы действий.
+
+Запуск: python benchmarks/import_time.py [runs] [--json results.json]
+"""
+import os
+import re
+import sys
+import json
+import tempfile
+import statistics
+import subprocess
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+FUNCTIONS = ['admin-actions', 'auth', 'profile', 'register-team', 'teams']
+TOP_MODULES = 8
+
+# import time: self [us] | cumulative | imported package
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def admin_groups() -> list:
+    """Группы действий admin-actions из ACTION_MODULES (все модули, загружаемые лениво)"""
+    sys.path.insert(0, os.path.join(BACKEND, 'admin-actions'))
+    try:
+        from index import ACTION_MODULES
+    finally:
+        sys.path.pop(0)
+    return sorted(set(ACTION_MODULES.values()))
+
+
+def import_once(function: str, modules: list) -> tuple:
+    """
+    Один холодный импорт.
+
+    Returns:
+        tuple: (cumulative мкс запрошенных модулей, {модуль: self мкс})
+    """
+    code = '; '.join(f'import {m}' for m in modules)
+    with tempfile.TemporaryDirectory() as prefix:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-X', f'pycache_prefix={prefix}', '-c', code],
+            cwd=os.path.join(BACKEND, function),
+            capture_output=True, text=True
+        )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total = 0
+    self_us = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        self_us[name] = int(match.group(1))
+        if len(match.group(3)) == 1 and name in modules:
+            total += int(match.group(2))
+    return total, self_us
+
+
+def measure(function: str, modules: list, runs: int) -> dict:
+    """Медианы по runs запускам: общее время импорта и самые дорогие модули (self)"""
+    samples = [import_once(function, modules) for _ in range(runs)]
+    names = set().union(*(s[1] for s in samples))
+    medians = {name: statistics.median(s[1].get(name, 0) for s in samples) for name in names}
+    return {
+        'total_ms': round(statistics.median(s[0] for s in samples) / 1000, 2),
+        'top': [
+            {'module': name, 'ms': round(us / 1000, 2)}
+            for name, us in sorted(medians.items(), key=lambda item: item[1], reverse=True)[:TOP_MODULES]
+        ]
+    }
+
+
+def main():
+    args = sys.argv[1:]
+    output = None
+    if '--json' in args:
+        output = args[args.index('--json') + 1]
+        args = [a for a in args if a not in ('--json', output)]
+    runs = int(args[0]) if args else 5
+
+    results = {}
+    for function in FUNCTIONS:
+        try:
+            results[function] = measure(function, ['index'], runs)
+        except RuntimeError as e:
+            print(f'{function:<16} пропущено: {e}')
+            continue
+        print(f'{function:<16} {results[function]["total_ms"]:>8.2f} ms')
+        for entry in results[function]['top']:
+            print(f'    {entry["module"]:<28} {entry["ms"]:>8.2f} ms')
+
+    print('\nadmin-actions: index + группа действий')
+    for group in admin_groups():
+        key = f'admin-actions:{group}'
+        results[key] = measure('admin-actions', ['index', group], runs)
+        print(f'    {group:<28} {results[key]["total_ms"]:>8.2f} ms')
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Бенчмарк поиска пользователя при входе на таблице из 1M пользователей.
+
+Создает временную схему, заполняет ее через generate_series и сравнивает
+старый запрос (LOWER(email) OR LOWER(nickname) без индексов) с поиском
+по индексам LOWER(email) / LOWER(nickname) из V0060.
+
+Запуск: DATABASE_URL=postgres://... python benchmarks/login_lookup.py [users]
+"""
+import os
+import sys
+import time
+import psycopg2
+
+SCHEMA = 'bench_login_lookup'
+RUNS = 200
+
+OLD_QUERY = f"""
+    SELECT id FROM {SCHEMA}.users
+    WHERE LOWER(email) = LOWER(%s) OR LOWER(nickname) = LOWER(%s)
+"""
+
+EMAIL_QUERY = f"SELECT id FROM {SCHEMA}.users WHERE LOWER(email) = LOWER(%s)"
+NICKNAME_QUERY = f"SELECT id FROM {SCHEMA}.users WHERE LOWER(nickname) = LOWER(%s)"
+
+
+def setup(cur, users: int):
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SCHEMA}")
+    cur.execute(f"""
+        CREATE TABLE {SCHEMA}.users (
+            id SERIAL PRIMARY KEY,
+            email VARCHAR(255) NOT NULL,
+            nickname VARCHAR(50) NOT NULL,
+            password_hash VARCHAR(255) NOT NULL
+        )
+    """)
+    cur.execute(f"""
+        INSERT INTO {SCHEMA}.users (email, nickname, password_hash)
+        SELECT 'User' || g || '@Example.com', 'Player_' || g, md5(g::text)
+        FROM generate_series(1, %s) g
+    """, (users,))
+    cur.execute(f"CREATE INDEX ON {SCHEMA}.users(email)")
+    cur.execute(f"ANALYZE {SCHEMA}.users")
+
+
+def add_lower_indexes(cur):
+    cur.execute(f"CREATE INDEX ON {SCHEMA}.users (LOWER(email))")
+    cur.execute(f"CREATE INDEX ON {SCHEMA}.users (LOWER(nickname))")
+    cur.execute(f"ANALYZE {SCHEMA}.users")
+
+
+def measure(cur, query: str, params_for) -> float:
+    """Среднее время запроса в миллисекундах"""
+    started = time.perf_counter()
+    for i in range(RUNS):
+        cur.execute(query, params_for(i))
+        cur.fetchall()
+    return (time.perf_counter() - started) * 1000 / RUNS
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    conn.autocommit = True
+    cur = conn.cursor()
+
+    print(f'Заполнение {users} пользователей...')
+    setup(cur, users)
+
+    def email_of(i):
+        return f'user{(i * 7919) % users + 1}@example.com'
+
+    def nickname_of(i):
+        return f'player_{(i * 7919) % users + 1}'
+
+    old_email = measure(cur, OLD_QUERY, lambda i: (email_of(i), email_of(i)))
+    old_nickname = measure(cur, OLD_QUERY, lambda i: (nickname_of(i), nickname_of(i)))
+
+    add_lower_indexes(cur)
+
+    new_email = measure(cur, EMAIL_QUERY, lambda i: (email_of(i),))
+    new_nickname = measure(cur, NICKNAME_QUERY, lambda i: (nickname_of(i),))
+
+    cur.execute(f"EXPLAIN {EMAIL_QUERY}", ('user1@example.com',))
+    plan = '\n'.join(row[0] for row in cur.fetchall())
+
+    print(f'Старый запрос, email:    {old_email:.3f} ms')
+    print(f'Старый запрос, nickname: {old_nickname:.3f} ms')
+    print(f'Индекс LOWER(email):     {new_email:.3f} ms')
+    print(f'Индекс LOWER(nickname):  {new_nickname:.3f} ms')
+    print(f'План:\n{plan}')
+
+    cur.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    cur.close()
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Бенчмарк планировщика матчей (scheduling.build_schedule) без базы данных.
+
+Строит сетку на выбывание, составы с общими игроками, периоды недоступности
+команд и окна судей, затем замеряет построение расписания и проверяет,
+что ограничения соблюдены.
+
+Запуск: python benchmarks/schedule.py [teams] [runs]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'admin-actions'))
+
+from scheduling import build_schedule  # noqa: E402
+
+MATCH_MINUTES = 45
+REST_MINUTES = 15
+REFEREES = 12
+MAX_PARALLEL = 16
+
+
+def make_bracket(teams: int) -> list:
+    matches = []
+    match_id = 1
+    rounds = teams.bit_length() - 1
+    for round_num in range(1, rounds + 1):
+        for match_number in range(1, teams // (2 ** round_num) + 1):
+            first_round = round_num == 1
+            matches.append({
+                'id': match_id, 'round': round_num, 'match_number': match_number,
+                'team1_id': 2 * match_number - 1 if first_round else None,
+                'team2_id': 2 * match_number if first_round else None,
+                'status': 'pending', 'start': None, 'fixed': False
+            })
+            match_id += 1
+    return matches
+
+
+def make_constraints(teams: int, rng: random.Random) -> tuple:
+    # 5 игроков на команду, каждый десятый игрок заявлен еще в одну команду
+    rosters = {team_id: [team_id * 10 + slot for slot in range(5)] for team_id in range(1, teams + 1)}
+    for team_id in range(1, teams + 1, 10):
+        rosters[team_id].append(rng.randint(1, teams) * 10)
+    blackouts = {}
+    for team_id in rng.sample(range(1, teams + 1), teams // 8):
+        start = rng.randint(0, 600)
+        blackouts[team_id] = [(start, start + rng.randint(30, 180))]
+    referees = {referee_id: [(0, 720), (780, 20000)] for referee_id in range(1, REFEREES + 1)}
+    return rosters, blackouts, referees
+
+
+def check(matches: list, schedule: list, rosters: dict, blackouts: dict):
+    by_id = {m['id']: m for m in matches}
+    starts = {entry['id']: entry['start'] for entry in schedule}
+    for match in matches:
+        if match['id'] not in starts or match['round'] == 1:
+            continue
+        for feeder_number in (2 * match['match_number'] - 1, 2 * match['match_number']):
+            feeder = next(m for m in matches if m['round'] == match['round'] - 1 and m['match_number'] == feeder_number)
+            assert starts[match['id']] >= starts[feeder['id']] + MATCH_MINUTES + REST_MINUTES
+    for entry in schedule:
+        match = by_id[entry['id']]
+        for team_id in match['candidates']:
+            for start, end in blackouts.get(team_id, ()):
+                assert entry['start'] + MATCH_MINUTES <= start or entry['start'] >= end
+    referee_slots = {}
+    for entry in schedule:
+        referee_slots.setdefault(entry['referee_id'], []).append(entry['start'])
+    for slots in referee_slots.values():
+        slots.sort()
+        assert all(b - a >= MATCH_MINUTES + REST_MINUTES for a, b in zip(slots, slots[1:]))
+
+
+def main():
+    teams = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(42)
+    rosters, blackouts, referees = make_constraints(teams, rng)
+
+    timings = []
+    for _ in range(runs):
+        matches = make_bracket(teams)
+        started = time.perf_counter()
+        schedule = build_schedule(matches, MATCH_MINUTES, REST_MINUTES, referees, blackouts, rosters, MAX_PARALLEL)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    check(matches, schedule, rosters, blackouts)
+    last = max(entry['start'] for entry in schedule) + MATCH_MINUTES
+    print(f'{teams} teams, {len(schedule)} matches: median {statistics.median(timings):.1f} ms, '
+          f'max {max(timings):.1f} ms, event length {last // 60}h{last % 60:02d}m')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+-- Отложенное заполнение геолокации в логах входа
+ALTER TABLE t_p4831367_esport_gta_disaster.login_logs
+ADD COLUMN IF NOT EXISTS geo_status VARCHAR(20) DEFAULT 'pending';
+
+-- Существующие записи уже содержат геолокацию
+UPDATE t_p4831367_esport_gta_disaster.login_logs
+SET geo_status = 'done'
+WHERE geo_status = 'pending' AND country IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_login_logs_geo_pending
+ON t_p4831367_esport_gta_disaster.login_logs(id)
+WHERE geo_status = 'pending';
+
+COMMENT ON COLUMN t_p4831367_esport_gta_disaster.login_logs.geo_status IS 'Статус геолокации: pending, done, failed';
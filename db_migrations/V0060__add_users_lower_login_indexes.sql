@@ -0,0 +1,6 @@
+-- Индексы для входа и проверок уникальности без учета регистра
+CREATE INDEX IF NOT EXISTS idx_users_email_lower
+ON t_p4831367_esport_gta_disaster.users (LOWER(email));
+
+CREATE INDEX IF NOT EXISTS idx_users_nickname_lower
+ON t_p4831367_esport_gta_disaster.users (LOWER(nickname));
@@ -0,0 +1,10 @@
+-- Индексы для поиска пользователей по никнейму (приглашения в команду)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Поиск подстроки: LOWER(nickname) LIKE '%query%'
+CREATE INDEX IF NOT EXISTS idx_users_nickname_trgm
+ON t_p4831367_esport_gta_disaster.users USING GIN (LOWER(nickname) gin_trgm_ops);
+
+-- Поиск по префиксу: LOWER(nickname) LIKE 'query%'
+CREATE INDEX IF NOT EXISTS idx_users_nickname_lower_prefix
+ON t_p4831367_esport_gta_disaster.users (LOWER(nickname) text_pattern_ops);
@@ -0,0 +1,29 @@
+-- updated_at матча меняется при любом изменении матча или его скриншотов
+-- (используется как версия для кэша подробностей матча)
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.set_bracket_match_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_bracket_matches_updated_at ON t_p4831367_esport_gta_disaster.bracket_matches;
+CREATE TRIGGER trg_bracket_matches_updated_at
+BEFORE UPDATE ON t_p4831367_esport_gta_disaster.bracket_matches
+FOR EACH ROW EXECUTE FUNCTION t_p4831367_esport_gta_disaster.set_bracket_match_updated_at();
+
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.touch_match_on_screenshot()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE t_p4831367_esport_gta_disaster.bracket_matches
+    SET updated_at = NOW()
+    WHERE id = COALESCE(NEW.match_id, OLD.match_id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_match_screenshots_touch_match ON t_p4831367_esport_gta_disaster.match_screenshots;
+CREATE TRIGGER trg_match_screenshots_touch_match
+AFTER INSERT OR UPDATE OR DELETE ON t_p4831367_esport_gta_disaster.match_screenshots
+FOR EACH ROW EXECUTE FUNCTION t_p4831367_esport_gta_disaster.touch_match_on_screenshot();
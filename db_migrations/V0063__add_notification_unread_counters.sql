@@ -0,0 +1,81 @@
+-- Счетчик непрочитанных уведомлений на пользователя (для значка колокольчика)
+CREATE TABLE IF NOT EXISTS t_p4831367_esport_gta_disaster.notification_counters (
+    user_id INTEGER PRIMARY KEY,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Счетчик поддерживается триггерами уровня оператора, поэтому его обновляют
+-- все пути вставки (в т.ч. массовые) и отметки о прочтении в той же транзакции
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.apply_notification_unread_delta()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO t_p4831367_esport_gta_disaster.notification_counters (user_id, unread_count, updated_at)
+        SELECT user_id, COUNT(*), NOW()
+        FROM new_rows
+        WHERE NOT COALESCE(read, FALSE)
+        GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET unread_count = t_p4831367_esport_gta_disaster.notification_counters.unread_count + EXCLUDED.unread_count,
+            updated_at = NOW();
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO t_p4831367_esport_gta_disaster.notification_counters (user_id, unread_count, updated_at)
+        SELECT DISTINCT user_id, 0, NOW() FROM new_rows
+        ON CONFLICT (user_id) DO NOTHING;
+
+        UPDATE t_p4831367_esport_gta_disaster.notification_counters c
+        SET unread_count = GREATEST(c.unread_count + d.delta, 0),
+            updated_at = NOW()
+        FROM (
+            SELECT user_id, SUM(delta) as delta
+            FROM (
+                SELECT user_id, CASE WHEN NOT COALESCE(read, FALSE) THEN 1 ELSE 0 END as delta FROM new_rows
+                UNION ALL
+                SELECT user_id, CASE WHEN NOT COALESCE(read, FALSE) THEN -1 ELSE 0 END as delta FROM old_rows
+            ) changes
+            GROUP BY user_id
+            HAVING SUM(delta) <> 0
+        ) d
+        WHERE c.user_id = d.user_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE t_p4831367_esport_gta_disaster.notification_counters c
+        SET unread_count = GREATEST(c.unread_count - d.removed, 0),
+            updated_at = NOW()
+        FROM (
+            SELECT user_id, COUNT(*) as removed
+            FROM old_rows
+            WHERE NOT COALESCE(read, FALSE)
+            GROUP BY user_id
+        ) d
+        WHERE c.user_id = d.user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_notifications_unread_insert ON t_p4831367_esport_gta_disaster.notifications;
+CREATE TRIGGER trg_notifications_unread_insert
+AFTER INSERT ON t_p4831367_esport_gta_disaster.notifications
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.apply_notification_unread_delta();
+
+DROP TRIGGER IF EXISTS trg_notifications_unread_update ON t_p4831367_esport_gta_disaster.notifications;
+CREATE TRIGGER trg_notifications_unread_update
+AFTER UPDATE ON t_p4831367_esport_gta_disaster.notifications
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.apply_notification_unread_delta();
+
+DROP TRIGGER IF EXISTS trg_notifications_unread_delete ON t_p4831367_esport_gta_disaster.notifications;
+CREATE TRIGGER trg_notifications_unread_delete
+AFTER DELETE ON t_p4831367_esport_gta_disaster.notifications
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.apply_notification_unread_delta();
+
+-- Начальное заполнение по существующим уведомлениям
+INSERT INTO t_p4831367_esport_gta_disaster.notification_counters (user_id, unread_count, updated_at)
+SELECT user_id, COUNT(*) FILTER (WHERE NOT COALESCE(read, FALSE)), NOW()
+FROM t_p4831367_esport_gta_disaster.notifications
+GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE
+SET unread_count = EXCLUDED.unread_count, updated_at = NOW();
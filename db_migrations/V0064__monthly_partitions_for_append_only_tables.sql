@@ -0,0 +1,287 @@
+-- Помесячное секционирование append-only таблиц и управление хранением:
+-- notifications, login_logs, match_chat, admin_action_logs, user_activity_sessions
+
+-- Настройки хранения (сколько месяцев держать, архивировать или удалять)
+CREATE TABLE IF NOT EXISTS t_p4831367_esport_gta_disaster.partition_retention_settings (
+    table_name VARCHAR(100) PRIMARY KEY,
+    retention_months INTEGER NOT NULL,
+    archive BOOLEAN NOT NULL DEFAULT TRUE,
+    months_ahead INTEGER NOT NULL DEFAULT 3,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Журнал отсоединенных (архивных) секций
+CREATE TABLE IF NOT EXISTS t_p4831367_esport_gta_disaster.partition_archive_log (
+    id SERIAL PRIMARY KEY,
+    table_name VARCHAR(100) NOT NULL,
+    partition_name VARCHAR(100) NOT NULL,
+    action VARCHAR(20) NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+INSERT INTO t_p4831367_esport_gta_disaster.partition_retention_settings (table_name, retention_months, archive) VALUES
+('notifications', 6, FALSE),
+('login_logs', 12, TRUE),
+('match_chat', 12, TRUE),
+('admin_action_logs', 24, TRUE),
+('user_activity_sessions', 6, FALSE)
+ON CONFLICT (table_name) DO NOTHING;
+
+-- Создание месячной секции (если еще нет).
+-- Строки этого месяца, попавшие в DEFAULT-секцию (обслуживание не успело
+-- создать секцию заранее), переносятся в новую: иначе PostgreSQL не даст
+-- создать секцию, ограничение DEFAULT-секции было бы нарушено
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.create_monthly_partition(p_table TEXT, p_month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    v_schema TEXT := 't_p4831367_esport_gta_disaster';
+    v_start DATE := date_trunc('month', p_month)::date;
+    v_end DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    v_name TEXT := p_table || '_p' || to_char(date_trunc('month', p_month), 'YYYY_MM');
+    v_default TEXT := p_table || '_default';
+    v_stray BOOLEAN := FALSE;
+BEGIN
+    IF to_regclass(v_schema || '.' || v_name) IS NOT NULL THEN
+        RETURN v_name;
+    END IF;
+
+    IF to_regclass(v_schema || '.' || v_default) IS NOT NULL THEN
+        EXECUTE format(
+            'SELECT EXISTS (SELECT 1 FROM %I.%I WHERE created_at >= %L AND created_at < %L)',
+            v_schema, v_default, v_start, v_end
+        ) INTO v_stray;
+    END IF;
+
+    IF v_stray THEN
+        EXECUTE format('ALTER TABLE %I.%I DETACH PARTITION %I.%I', v_schema, p_table, v_schema, v_default);
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I.%I PARTITION OF %I.%I FOR VALUES FROM (%L) TO (%L)',
+        v_schema, v_name, v_schema, p_table, v_start, v_end
+    );
+
+    IF v_stray THEN
+        -- Вставка прямо в секцию: statement-триггеры родителя (счетчики V0063) не срабатывают,
+        -- строки переносятся, а не появляются заново
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM %I.%I WHERE created_at >= %L AND created_at < %L RETURNING *) '
+            'INSERT INTO %I.%I SELECT * FROM moved',
+            v_schema, v_default, v_start, v_end, v_schema, v_name
+        );
+        EXECUTE format('ALTER TABLE %I.%I ATTACH PARTITION %I.%I DEFAULT', v_schema, p_table, v_schema, v_default);
+    END IF;
+
+    RETURN v_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Перевод обычной таблицы в секционированную по created_at с переносом данных
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.convert_to_monthly_partitions(p_table TEXT)
+RETURNS VOID AS $$
+DECLARE
+    v_schema TEXT := 't_p4831367_esport_gta_disaster';
+    v_legacy TEXT := p_table || '_legacy';
+    v_seq TEXT;
+    v_fk_names TEXT[];
+    v_fk_defs TEXT[];
+    v_month DATE;
+    v_last DATE := (date_trunc('month', NOW()) + INTERVAL '3 months')::date;
+BEGIN
+    IF to_regclass(v_schema || '.' || p_table) IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM pg_partitioned_table pt
+        WHERE pt.partrelid = to_regclass(v_schema || '.' || p_table)
+    ) THEN
+        RETURN;
+    END IF;
+
+    v_seq := pg_get_serial_sequence(v_schema || '.' || p_table, 'id');
+
+    -- LIKE не копирует внешние ключи: запоминаем их, чтобы пересоздать на новой таблице
+    SELECT array_agg(c.conname ORDER BY c.conname), array_agg(pg_get_constraintdef(c.oid) ORDER BY c.conname)
+    INTO v_fk_names, v_fk_defs
+    FROM pg_constraint c
+    WHERE c.conrelid = to_regclass(v_schema || '.' || p_table)
+      AND c.contype = 'f';
+
+    EXECUTE format('UPDATE %I.%I SET created_at = NOW() WHERE created_at IS NULL', v_schema, p_table);
+    EXECUTE format('ALTER TABLE %I.%I RENAME TO %I', v_schema, p_table, v_legacy);
+
+    EXECUTE format(
+        'CREATE TABLE %I.%I (LIKE %I.%I INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (created_at)',
+        v_schema, p_table, v_schema, v_legacy
+    );
+    EXECUTE format(
+        'ALTER TABLE %I.%I ALTER COLUMN created_at SET DEFAULT NOW(), ALTER COLUMN created_at SET NOT NULL',
+        v_schema, p_table
+    );
+    EXECUTE format('ALTER TABLE %I.%I ADD PRIMARY KEY (id, created_at)', v_schema, p_table);
+
+    IF v_seq IS NOT NULL THEN
+        EXECUTE format('ALTER SEQUENCE %s OWNED BY %I.%I.id', v_seq, v_schema, p_table);
+    END IF;
+
+    EXECUTE format(
+        'SELECT date_trunc(''month'', COALESCE(MIN(created_at), NOW()))::date FROM %I.%I',
+        v_schema, v_legacy
+    ) INTO v_month;
+
+    WHILE v_month <= v_last LOOP
+        PERFORM t_p4831367_esport_gta_disaster.create_monthly_partition(p_table, v_month);
+        v_month := (v_month + INTERVAL '1 month')::date;
+    END LOOP;
+
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I.%I PARTITION OF %I.%I DEFAULT',
+        v_schema, p_table || '_default', v_schema, p_table
+    );
+
+    EXECUTE format('INSERT INTO %I.%I SELECT * FROM %I.%I', v_schema, p_table, v_schema, v_legacy);
+    EXECUTE format('DROP TABLE %I.%I', v_schema, v_legacy);
+
+    FOR i IN 1 .. COALESCE(array_length(v_fk_names, 1), 0) LOOP
+        EXECUTE format('ALTER TABLE %I.%I ADD CONSTRAINT %I %s', v_schema, p_table, v_fk_names[i], v_fk_defs[i]);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT t_p4831367_esport_gta_disaster.convert_to_monthly_partitions('notifications');
+SELECT t_p4831367_esport_gta_disaster.convert_to_monthly_partitions('login_logs');
+SELECT t_p4831367_esport_gta_disaster.convert_to_monthly_partitions('match_chat');
+SELECT t_p4831367_esport_gta_disaster.convert_to_monthly_partitions('admin_action_logs');
+SELECT t_p4831367_esport_gta_disaster.convert_to_monthly_partitions('user_activity_sessions');
+
+-- Индексы (создаются на каждой секции автоматически)
+CREATE INDEX IF NOT EXISTS idx_notifications_user_created
+ON t_p4831367_esport_gta_disaster.notifications(user_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_login_logs_user_created
+ON t_p4831367_esport_gta_disaster.login_logs(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_login_logs_ip_address
+ON t_p4831367_esport_gta_disaster.login_logs(ip_address);
+CREATE INDEX IF NOT EXISTS idx_login_logs_geo_pending_id
+ON t_p4831367_esport_gta_disaster.login_logs(id)
+WHERE geo_status = 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_match_chat_match_created
+ON t_p4831367_esport_gta_disaster.match_chat(match_id, created_at);
+
+-- admin_action_logs создается кодом приложения, а не миграциями: таблицы может не быть
+DO $$
+BEGIN
+    IF to_regclass('t_p4831367_esport_gta_disaster.admin_action_logs') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_admin_action_logs_created
+        ON t_p4831367_esport_gta_disaster.admin_action_logs(created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_admin_action_logs_admin_created
+        ON t_p4831367_esport_gta_disaster.admin_action_logs(admin_id, created_at DESC);
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_user_activity_sessions_user_created
+ON t_p4831367_esport_gta_disaster.user_activity_sessions(user_id, created_at DESC);
+
+-- Счетчики непрочитанных уведомлений (V0063): триггеры пересоздаются на новой таблице
+DROP TRIGGER IF EXISTS trg_notifications_unread_insert ON t_p4831367_esport_gta_disaster.notifications;
+CREATE TRIGGER trg_notifications_unread_insert
+AFTER INSERT ON t_p4831367_esport_gta_disaster.notifications
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.apply_notification_unread_delta();
+
+DROP TRIGGER IF EXISTS trg_notifications_unread_update ON t_p4831367_esport_gta_disaster.notifications;
+CREATE TRIGGER trg_notifications_unread_update
+AFTER UPDATE ON t_p4831367_esport_gta_disaster.notifications
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.apply_notification_unread_delta();
+
+DROP TRIGGER IF EXISTS trg_notifications_unread_delete ON t_p4831367_esport_gta_disaster.notifications;
+CREATE TRIGGER trg_notifications_unread_delete
+AFTER DELETE ON t_p4831367_esport_gta_disaster.notifications
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.apply_notification_unread_delta();
+
+-- Обслуживание: секции на months_ahead месяцев вперед, отсоединение
+-- (архив) или удаление секций старше retention_months
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.run_partition_maintenance()
+RETURNS TABLE (out_table TEXT, out_partition TEXT, out_action TEXT) AS $$
+DECLARE
+    v_schema TEXT := 't_p4831367_esport_gta_disaster';
+    v_setting RECORD;
+    v_partition RECORD;
+    v_month DATE;
+    v_name TEXT;
+    v_cutoff DATE;
+BEGIN
+    FOR v_setting IN
+        SELECT s.table_name, s.retention_months, s.archive, s.months_ahead
+        FROM t_p4831367_esport_gta_disaster.partition_retention_settings s
+    LOOP
+        -- Отсутствующая или не секционированная таблица не должна останавливать обслуживание остальных
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_partitioned_table pt
+            WHERE pt.partrelid = to_regclass(v_schema || '.' || v_setting.table_name)
+        ) THEN
+            CONTINUE;
+        END IF;
+
+        v_month := date_trunc('month', NOW())::date;
+        WHILE v_month <= (date_trunc('month', NOW()) + make_interval(months => v_setting.months_ahead))::date LOOP
+            v_name := v_setting.table_name || '_p' || to_char(v_month, 'YYYY_MM');
+            IF to_regclass(v_schema || '.' || v_name) IS NULL THEN
+                PERFORM t_p4831367_esport_gta_disaster.create_monthly_partition(v_setting.table_name, v_month);
+                out_table := v_setting.table_name;
+                out_partition := v_name;
+                out_action := 'created';
+                RETURN NEXT;
+            END IF;
+            v_month := (v_month + INTERVAL '1 month')::date;
+        END LOOP;
+
+        v_cutoff := (date_trunc('month', NOW()) - make_interval(months => v_setting.retention_months))::date;
+
+        FOR v_partition IN
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(v_schema || '.' || v_setting.table_name)
+              AND c.relname ~ '_p[0-9]{4}_[0-9]{2}$'
+              AND to_date(right(c.relname, 7), 'YYYY_MM') < v_cutoff
+            ORDER BY c.relname
+        LOOP
+            -- DETACH и DROP не вызывают триггеры удаления (V0063): непрочитанные
+            -- уведомления уходящей секции вычитаются из счетчиков заранее
+            IF v_setting.table_name = 'notifications' THEN
+                EXECUTE format(
+                    'UPDATE t_p4831367_esport_gta_disaster.notification_counters c '
+                    'SET unread_count = GREATEST(c.unread_count - d.removed, 0), updated_at = NOW() '
+                    'FROM (SELECT user_id, COUNT(*) as removed FROM %I.%I '
+                    'WHERE NOT COALESCE(read, FALSE) GROUP BY user_id) d '
+                    'WHERE c.user_id = d.user_id',
+                    v_schema, v_partition.relname
+                );
+            END IF;
+
+            EXECUTE format('ALTER TABLE %I.%I DETACH PARTITION %I.%I',
+                v_schema, v_setting.table_name, v_schema, v_partition.relname);
+
+            IF v_setting.archive THEN
+                out_action := 'archived';
+            ELSE
+                EXECUTE format('DROP TABLE %I.%I', v_schema, v_partition.relname);
+                out_action := 'dropped';
+            END IF;
+
+            INSERT INTO t_p4831367_esport_gta_disaster.partition_archive_log (table_name, partition_name, action)
+            VALUES (v_setting.table_name, v_partition.relname, out_action);
+
+            out_table := v_setting.table_name;
+            out_partition := v_partition.relname;
+            RETURN NEXT;
+        END LOOP;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
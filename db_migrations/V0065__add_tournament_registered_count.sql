@@ -0,0 +1,39 @@
+-- Счетчик заявок на турнир: место резервируется условным UPDATE
+-- (registered_count < max_teams) под блокировкой строки турнира,
+-- поэтому одновременные регистрации не превышают лимит и не считают COUNT(*)
+ALTER TABLE t_p4831367_esport_gta_disaster.tournaments
+ADD COLUMN IF NOT EXISTS registered_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE t_p4831367_esport_gta_disaster.tournaments t
+SET registered_count = r.cnt
+FROM (
+    SELECT tournament_id, COUNT(*) as cnt
+    FROM t_p4831367_esport_gta_disaster.tournament_registrations
+    GROUP BY tournament_id
+) r
+WHERE t.id = r.tournament_id;
+
+-- Вставки увеличивают счетчик в коде регистрации, а удаления (в том числе
+-- каскадные и массовые) уменьшают его триггером уровня оператора
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.release_tournament_slots()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE t_p4831367_esport_gta_disaster.tournaments t
+    SET registered_count = GREATEST(t.registered_count - d.removed, 0)
+    FROM (
+        SELECT tournament_id, COUNT(*) as removed
+        FROM old_rows
+        GROUP BY tournament_id
+    ) d
+    WHERE t.id = d.tournament_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tournament_registrations_release ON t_p4831367_esport_gta_disaster.tournament_registrations;
+CREATE TRIGGER trg_tournament_registrations_release
+AFTER DELETE ON t_p4831367_esport_gta_disaster.tournament_registrations
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.release_tournament_slots();
+
+COMMENT ON COLUMN t_p4831367_esport_gta_disaster.tournaments.registered_count IS 'Количество заявок (резервируется при регистрации, освобождается триггером при удалении)';
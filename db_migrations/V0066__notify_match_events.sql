@@ -0,0 +1,36 @@
+-- События счета (итогового и заявленного капитанами) и статуса матчей для трансляции зрителям (канал match_events).
+-- NOTIFY доставляется слушателям только после фиксации транзакции
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.notify_match_event()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('match_events', json_build_object(
+        'match_id', NEW.id,
+        'tournament_id', COALESCE(
+            NEW.tournament_id,
+            (SELECT tb.tournament_id FROM t_p4831367_esport_gta_disaster.tournament_brackets tb WHERE tb.id = NEW.bracket_id)
+        ),
+        'bracket_id', NEW.bracket_id,
+        'team1_score', NEW.team1_score,
+        'team2_score', NEW.team2_score,
+        'team1_reported_score', NEW.team1_reported_score,
+        'team2_reported_score', NEW.team2_reported_score,
+        'status', NEW.status,
+        'winner_id', NEW.winner_id
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_bracket_matches_notify ON t_p4831367_esport_gta_disaster.bracket_matches;
+CREATE TRIGGER trg_bracket_matches_notify
+AFTER UPDATE ON t_p4831367_esport_gta_disaster.bracket_matches
+FOR EACH ROW
+WHEN (
+    OLD.team1_score IS DISTINCT FROM NEW.team1_score
+    OR OLD.team2_score IS DISTINCT FROM NEW.team2_score
+    OR OLD.team1_reported_score IS DISTINCT FROM NEW.team1_reported_score
+    OR OLD.team2_reported_score IS DISTINCT FROM NEW.team2_reported_score
+    OR OLD.status IS DISTINCT FROM NEW.status
+    OR OLD.winner_id IS DISTINCT FROM NEW.winner_id
+)
+EXECUTE FUNCTION t_p4831367_esport_gta_disaster.notify_match_event();
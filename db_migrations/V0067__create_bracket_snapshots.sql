@@ -0,0 +1,90 @@
+-- Статические снимки турнирной сетки в бакете (CDN).
+-- Изменения сетки только увеличивают requested_version; публикация по расписанию
+-- выгружает снимок, когда изменения затихли, и объединяет серию правок в одну выгрузку
+CREATE TABLE IF NOT EXISTS t_p4831367_esport_gta_disaster.bracket_snapshots (
+    tournament_id INTEGER PRIMARY KEY REFERENCES t_p4831367_esport_gta_disaster.tournaments(id) ON DELETE CASCADE,
+    requested_version INTEGER NOT NULL DEFAULT 1,
+    requested_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    first_requested_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    published_version INTEGER NOT NULL DEFAULT 0,
+    published_at TIMESTAMP,
+    url TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_bracket_snapshots_pending
+ON t_p4831367_esport_gta_disaster.bracket_snapshots (first_requested_at)
+WHERE requested_version > published_version;
+
+COMMENT ON TABLE t_p4831367_esport_gta_disaster.bracket_snapshots IS 'Версии опубликованных в CDN снимков турнирной сетки';
+COMMENT ON COLUMN t_p4831367_esport_gta_disaster.bracket_snapshots.requested_version IS 'Версия, запрошенная последним изменением сетки';
+COMMENT ON COLUMN t_p4831367_esport_gta_disaster.bracket_snapshots.published_version IS 'Последняя выгруженная версия';
+COMMENT ON COLUMN t_p4831367_esport_gta_disaster.bracket_snapshots.first_requested_at IS 'Первое неопубликованное изменение: ограничивает ожидание при непрерывных правках';
+
+-- Любое изменение матчей сетки или групповой стадии (из админки, подтверждение
+-- капитанами, модерация) запрашивает новую версию снимка: один upsert на турнир за оператор.
+-- first_requested_at сдвигается, только когда снимок перестает быть актуальным
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.request_bracket_snapshots()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_tournaments INTEGER[];
+BEGIN
+    IF TG_TABLE_NAME = 'group_stage_matches' THEN
+        SELECT array_agg(DISTINCT g.tournament_id) INTO v_tournaments
+        FROM changed_rows g;
+    ELSE
+        SELECT array_agg(DISTINCT tb.tournament_id) INTO v_tournaments
+        FROM changed_rows m
+        JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON tb.id = m.bracket_id;
+    END IF;
+
+    INSERT INTO t_p4831367_esport_gta_disaster.bracket_snapshots (tournament_id, requested_version, requested_at, first_requested_at)
+    SELECT t.id, 1, NOW(), NOW()
+    FROM t_p4831367_esport_gta_disaster.tournaments t
+    WHERE t.id = ANY(v_tournaments)
+    ON CONFLICT (tournament_id) DO UPDATE
+    SET requested_version = bracket_snapshots.requested_version + 1,
+        requested_at = NOW(),
+        first_requested_at = CASE
+            WHEN bracket_snapshots.requested_version > bracket_snapshots.published_version
+            THEN bracket_snapshots.first_requested_at
+            ELSE NOW()
+        END;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_bracket_matches_snapshot_insert ON t_p4831367_esport_gta_disaster.bracket_matches;
+CREATE TRIGGER trg_bracket_matches_snapshot_insert
+AFTER INSERT ON t_p4831367_esport_gta_disaster.bracket_matches
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.request_bracket_snapshots();
+
+DROP TRIGGER IF EXISTS trg_bracket_matches_snapshot_update ON t_p4831367_esport_gta_disaster.bracket_matches;
+CREATE TRIGGER trg_bracket_matches_snapshot_update
+AFTER UPDATE ON t_p4831367_esport_gta_disaster.bracket_matches
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.request_bracket_snapshots();
+
+DROP TRIGGER IF EXISTS trg_bracket_matches_snapshot_delete ON t_p4831367_esport_gta_disaster.bracket_matches;
+CREATE TRIGGER trg_bracket_matches_snapshot_delete
+AFTER DELETE ON t_p4831367_esport_gta_disaster.bracket_matches
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.request_bracket_snapshots();
+
+DROP TRIGGER IF EXISTS trg_group_stage_matches_snapshot_insert ON t_p4831367_esport_gta_disaster.group_stage_matches;
+CREATE TRIGGER trg_group_stage_matches_snapshot_insert
+AFTER INSERT ON t_p4831367_esport_gta_disaster.group_stage_matches
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.request_bracket_snapshots();
+
+DROP TRIGGER IF EXISTS trg_group_stage_matches_snapshot_update ON t_p4831367_esport_gta_disaster.group_stage_matches;
+CREATE TRIGGER trg_group_stage_matches_snapshot_update
+AFTER UPDATE ON t_p4831367_esport_gta_disaster.group_stage_matches
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.request_bracket_snapshots();
+
+DROP TRIGGER IF EXISTS trg_group_stage_matches_snapshot_delete ON t_p4831367_esport_gta_disaster.group_stage_matches;
+CREATE TRIGGER trg_group_stage_matches_snapshot_delete
+AFTER DELETE ON t_p4831367_esport_gta_disaster.group_stage_matches
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION t_p4831367_esport_gta_disaster.request_bracket_snapshots();
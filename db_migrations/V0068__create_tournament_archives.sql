@@ -0,0 +1,34 @@
+-- Архив завершенного турнира: полное состояние (турнир, заявки, сетка,
+-- групповая стадия) одним сжатым JSON. Завершенные турниры отдаются из архива
+-- без соединений таблиц, имена команд сохраняются на момент завершения
+CREATE TABLE IF NOT EXISTS t_p4831367_esport_gta_disaster.tournament_archives (
+    tournament_id INTEGER PRIMARY KEY REFERENCES t_p4831367_esport_gta_disaster.tournaments(id) ON DELETE CASCADE,
+    format_version SMALLINT NOT NULL DEFAULT 1,
+    encoding VARCHAR(16) NOT NULL DEFAULT 'gzip',
+    data BYTEA NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Данные уже сжаты: повторное сжатие TOAST только тратит CPU
+ALTER TABLE t_p4831367_esport_gta_disaster.tournament_archives ALTER COLUMN data SET STORAGE EXTERNAL;
+
+COMMENT ON TABLE t_p4831367_esport_gta_disaster.tournament_archives IS 'Неизменяемые снимки завершенных турниров';
+COMMENT ON COLUMN t_p4831367_esport_gta_disaster.tournament_archives.data IS 'Сжатый JSON: tournament, registrations, bracket, group_stage';
+
+-- Турнир вернули из завершенных любым путем (админка, start_tournament, прямой UPDATE):
+-- архив удаляется, и чтения снова идут по живым таблицам
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.drop_tournament_archive()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM t_p4831367_esport_gta_disaster.tournament_archives
+    WHERE tournament_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tournaments_drop_archive ON t_p4831367_esport_gta_disaster.tournaments;
+CREATE TRIGGER trg_tournaments_drop_archive
+AFTER UPDATE OF status ON t_p4831367_esport_gta_disaster.tournaments
+FOR EACH ROW
+WHEN (NEW.status IS DISTINCT FROM 'completed')
+EXECUTE FUNCTION t_p4831367_esport_gta_disaster.drop_tournament_archive();
@@ -0,0 +1,18 @@
+-- Нагрузка судей: число незавершенных матчей и их время начала.
+-- Используется автоназначением судей (наименее загруженный без пересечений по времени)
+CREATE OR REPLACE VIEW t_p4831367_esport_gta_disaster.referee_workload AS
+SELECT
+    u.id AS referee_id,
+    COUNT(bm.id) AS active_matches,
+    COALESCE(
+        ARRAY_AGG(bm.scheduled_at ORDER BY bm.scheduled_at) FILTER (WHERE bm.scheduled_at IS NOT NULL),
+        '{}'
+    ) AS scheduled
+FROM t_p4831367_esport_gta_disaster.users u
+LEFT JOIN t_p4831367_esport_gta_disaster.bracket_matches bm
+    ON bm.referee_id = u.id
+    AND bm.status NOT IN ('completed', 'walkover')
+WHERE u.role = 'referee'
+GROUP BY u.id;
+
+COMMENT ON VIEW t_p4831367_esport_gta_disaster.referee_workload IS 'Активные матчи судей и время их начала';
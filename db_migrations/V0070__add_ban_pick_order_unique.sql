@@ -0,0 +1,16 @@
+-- Бан-пик карт: один шаг драфта на порядковый номер матча.
+-- Вставка идет под advisory-блокировкой матча, уникальность — страховка от гонок
+DELETE FROM t_p4831367_esport_gta_disaster.match_ban_pick a
+USING t_p4831367_esport_gta_disaster.match_ban_pick b
+WHERE a.match_id = b.match_id
+AND a.pick_order = b.pick_order
+AND a.id > b.id;
+
+ALTER TABLE t_p4831367_esport_gta_disaster.match_ban_pick
+DROP CONSTRAINT IF EXISTS uq_match_ban_pick_order;
+
+ALTER TABLE t_p4831367_esport_gta_disaster.match_ban_pick
+ADD CONSTRAINT uq_match_ban_pick_order UNIQUE (match_id, pick_order);
+
+-- Уникальный индекс покрывает поиск по match_id
+DROP INDEX IF EXISTS t_p4831367_esport_gta_disaster.idx_match_ban_pick_match;
@@ -0,0 +1,19 @@
+-- Счет по картам серии (Bo3/Bo5). source: отчет капитана команды 1 или 2
+-- либо итог, подтвержденный судьей. Счет серии (карты, выигранные каждой
+-- командой) пересчитывается в SQL при записи карт и хранится в строке матча:
+-- отчеты в team1/team2_reported_score, итог в team1/team2_score
+CREATE TABLE IF NOT EXISTS t_p4831367_esport_gta_disaster.bracket_match_maps (
+    id SERIAL PRIMARY KEY,
+    match_id INTEGER NOT NULL REFERENCES t_p4831367_esport_gta_disaster.bracket_matches(id) ON DELETE CASCADE,
+    source VARCHAR(10) NOT NULL CHECK (source IN ('team1', 'team2', 'final')),
+    map_number SMALLINT NOT NULL,
+    map_name VARCHAR(100),
+    team1_score INTEGER NOT NULL,
+    team2_score INTEGER NOT NULL,
+    winner_id INTEGER REFERENCES t_p4831367_esport_gta_disaster.teams(id),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_bracket_match_maps UNIQUE (match_id, source, map_number)
+);
+
+COMMENT ON TABLE t_p4831367_esport_gta_disaster.bracket_match_maps IS 'Результаты отдельных карт матча (отчеты капитанов и итог судьи)';
+COMMENT ON COLUMN t_p4831367_esport_gta_disaster.bracket_match_maps.source IS 'team1 / team2 — отчет капитана, final — подтверждено судьей';
@@ -0,0 +1,103 @@
+-- История матчей команд: по строке на каждую команду завершенного матча
+-- (соперник, счет, результат). Индекс (team_id, completed_at, match_id)
+-- обслуживает историю команды и личные встречи одним сканированием с
+-- пагинацией по ключу, без OR по team1_id / team2_id в bracket_matches
+ALTER TABLE t_p4831367_esport_gta_disaster.team_match_history
+ADD COLUMN IF NOT EXISTS opponent_id INTEGER REFERENCES t_p4831367_esport_gta_disaster.teams(id) ON DELETE SET NULL,
+ADD COLUMN IF NOT EXISTS team_score INTEGER,
+ADD COLUMN IF NOT EXISTS opponent_score INTEGER,
+ADD COLUMN IF NOT EXISTS completed_at TIMESTAMP;
+
+UPDATE t_p4831367_esport_gta_disaster.team_match_history
+SET completed_at = COALESCE(created_at, NOW())
+WHERE completed_at IS NULL;
+
+ALTER TABLE t_p4831367_esport_gta_disaster.team_match_history
+ALTER COLUMN completed_at SET NOT NULL,
+ALTER COLUMN completed_at SET DEFAULT NOW();
+
+DELETE FROM t_p4831367_esport_gta_disaster.team_match_history a
+USING t_p4831367_esport_gta_disaster.team_match_history b
+WHERE a.team_id = b.team_id
+AND a.match_id = b.match_id
+AND a.id > b.id;
+
+ALTER TABLE t_p4831367_esport_gta_disaster.team_match_history
+DROP CONSTRAINT IF EXISTS uq_team_match_history;
+
+ALTER TABLE t_p4831367_esport_gta_disaster.team_match_history
+ADD CONSTRAINT uq_team_match_history UNIQUE (team_id, match_id);
+
+DROP INDEX IF EXISTS t_p4831367_esport_gta_disaster.idx_team_match_history_team;
+CREATE INDEX IF NOT EXISTS idx_team_match_history_team_completed
+ON t_p4831367_esport_gta_disaster.team_match_history (team_id, completed_at DESC, match_id DESC);
+CREATE INDEX IF NOT EXISTS idx_team_match_history_head_to_head
+ON t_p4831367_esport_gta_disaster.team_match_history (team_id, opponent_id, completed_at DESC, match_id DESC);
+
+-- Запись истории при подтверждении матча (любым путем: судья, модератор,
+-- завершение матча в сетке) и удаление при сбросе результата
+CREATE OR REPLACE FUNCTION t_p4831367_esport_gta_disaster.record_team_match_history()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status = 'completed' AND NEW.team1_id IS NOT NULL AND NEW.team2_id IS NOT NULL THEN
+        INSERT INTO t_p4831367_esport_gta_disaster.team_match_history
+        (team_id, match_id, tournament_id, opponent_id, team_score, opponent_score, result, completed_at)
+        SELECT side.team_id, NEW.id,
+               COALESCE(NEW.tournament_id, (SELECT tb.tournament_id FROM t_p4831367_esport_gta_disaster.tournament_brackets tb WHERE tb.id = NEW.bracket_id)),
+               side.opponent_id, side.team_score, side.opponent_score,
+               CASE WHEN NEW.winner_id = side.team_id THEN 'win'
+                    WHEN NEW.winner_id IS NULL THEN 'draw'
+                    ELSE 'loss' END,
+               COALESCE(NEW.completed_at, NOW())
+        FROM (VALUES
+            (NEW.team1_id, NEW.team2_id, NEW.team1_score, NEW.team2_score),
+            (NEW.team2_id, NEW.team1_id, NEW.team2_score, NEW.team1_score)
+        ) side(team_id, opponent_id, team_score, opponent_score)
+        ON CONFLICT (team_id, match_id) DO UPDATE
+        SET opponent_id = EXCLUDED.opponent_id,
+            team_score = EXCLUDED.team_score,
+            opponent_score = EXCLUDED.opponent_score,
+            result = EXCLUDED.result,
+            completed_at = EXCLUDED.completed_at;
+    ELSIF OLD.status = 'completed' THEN
+        DELETE FROM t_p4831367_esport_gta_disaster.team_match_history
+        WHERE match_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_bracket_matches_history ON t_p4831367_esport_gta_disaster.bracket_matches;
+CREATE TRIGGER trg_bracket_matches_history
+AFTER UPDATE ON t_p4831367_esport_gta_disaster.bracket_matches
+FOR EACH ROW
+WHEN (
+    (NEW.status = 'completed' OR OLD.status = 'completed')
+    AND (
+        OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.winner_id IS DISTINCT FROM NEW.winner_id
+        OR OLD.team1_score IS DISTINCT FROM NEW.team1_score
+        OR OLD.team2_score IS DISTINCT FROM NEW.team2_score
+    )
+)
+EXECUTE FUNCTION t_p4831367_esport_gta_disaster.record_team_match_history();
+
+-- Заполнение по уже завершенным матчам
+INSERT INTO t_p4831367_esport_gta_disaster.team_match_history
+(team_id, match_id, tournament_id, opponent_id, team_score, opponent_score, result, completed_at)
+SELECT side.team_id, bm.id, COALESCE(bm.tournament_id, tb.tournament_id),
+       side.opponent_id, side.team_score, side.opponent_score,
+       CASE WHEN bm.winner_id = side.team_id THEN 'win'
+            WHEN bm.winner_id IS NULL THEN 'draw'
+            ELSE 'loss' END,
+       COALESCE(bm.completed_at, bm.updated_at, bm.created_at, NOW())
+FROM t_p4831367_esport_gta_disaster.bracket_matches bm
+LEFT JOIN t_p4831367_esport_gta_disaster.tournament_brackets tb ON bm.bracket_id = tb.id
+CROSS JOIN LATERAL (VALUES
+    (bm.team1_id, bm.team2_id, bm.team1_score, bm.team2_score),
+    (bm.team2_id, bm.team1_id, bm.team2_score, bm.team1_score)
+) side(team_id, opponent_id, team_score, opponent_score)
+WHERE bm.status = 'completed'
+AND bm.team1_id IS NOT NULL
+AND bm.team2_id IS NOT NULL
+ON CONFLICT (team_id, match_id) DO NOTHING;
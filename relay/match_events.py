@@ -0,0 +1,238 @@
+"""
+Ретранслятор событий матчей: одно соединение с LISTEN match_events
+раздает события счета и статуса (V0066) всем клиентам через Server-Sent Events.
+
+Вместо опроса get_bracket / get_match_details / get_active_matches клиенты
+подписываются на поток:
+
+    GET /events                     все матчи
+    GET /events?tournament_id=1     матчи турнира
+    GET /events?match_id=10         один матч
+    GET /health                     число подключенных клиентов
+
+Повторное подключение с заголовком Last-Event-ID досылает пропущенные
+события из последних HISTORY_SIZE.
+
+Запуск: DATABASE_URL=postgres://... python relay/match_events.py [port]
+"""
+import os
+import sys
+import json
+import asyncio
+import logging
+from collections import deque
+from urllib.parse import urlsplit, parse_qs
+import psycopg2
+import psycopg2.extensions
+
+CHANNEL = 'match_events'
+DEFAULT_PORT = 8090
+HEARTBEAT_SECONDS = 15
+RECONNECT_SECONDS = 3
+HISTORY_SIZE = 500
+CLIENT_QUEUE_SIZE = 256
+FILTER_KEYS = ('match_id', 'tournament_id')
+LOG_LEVEL = getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO)
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна строка JSON на запись, как в app_logging функций backend"""
+
+    def format(self, record) -> str:
+        entry = {
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'function': 'match-events-relay'
+        }
+        if record.exc_info:
+            entry['traceback'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+log = logging.getLogger('app.relay')
+log.setLevel(LOG_LEVEL)
+log.propagate = False
+_handler = logging.StreamHandler(sys.stdout)
+_handler.setFormatter(JsonFormatter())
+log.addHandler(_handler)
+
+
+class Client:
+    """Подписчик потока: фильтр и очередь кадров SSE"""
+
+    def __init__(self, filters: dict):
+        self.filters = filters
+        self.queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.overflowed = False
+
+    def wants(self, event: dict) -> bool:
+        return all(event.get(key) == value for key, value in self.filters.items())
+
+    def offer(self, event: dict, frame: bytes):
+        if self.overflowed or not self.wants(event):
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Медленный клиент отключается и догонит по Last-Event-ID
+            self.overflowed = True
+
+
+class Relay:
+    """Одно подключение LISTEN к базе и рассылка событий подписчикам"""
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self.clients = set()
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self.last_id = 0
+        self.conn = None
+        self.fd = None
+
+    def publish(self, payload: str):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        self.last_id += 1
+        frame = f'id: {self.last_id}\nevent: match\ndata: {payload}\n\n'.encode('utf-8')
+        self.history.append((self.last_id, event, frame))
+        for client in self.clients:
+            client.offer(event, frame)
+
+    def on_notify(self):
+        try:
+            self.conn.poll()
+        except psycopg2.Error as e:
+            log.warning('listen connection lost: %s', e)
+            self.drop_connection()
+            return
+        while self.conn.notifies:
+            self.publish(self.conn.notifies.pop(0).payload)
+
+    def drop_connection(self):
+        """Снимает чтение сокета и закрывает соединение, чтобы не терять дескриптор"""
+        conn, self.conn = self.conn, None
+        if self.fd is not None:
+            asyncio.get_running_loop().remove_reader(self.fd)
+            self.fd = None
+        if conn is not None:
+            try:
+                conn.close()
+            except psycopg2.Error:
+                pass
+
+    async def listen(self):
+        """Держит LISTEN-соединение, переподключаясь при обрыве"""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.conn is None or self.conn.closed:
+                self.drop_connection()
+                try:
+                    self.conn = psycopg2.connect(self.dsn)
+                    self.conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                    self.conn.cursor().execute(f'LISTEN {CHANNEL}')
+                    self.fd = self.conn.fileno()
+                    loop.add_reader(self.fd, self.on_notify)
+                    log.info('listening on %s', CHANNEL)
+                except psycopg2.Error as e:
+                    log.error('listen failed: %s', e)
+                    self.drop_connection()
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1')
+                if line in ('\r\n', '\n', ''):
+                    break
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+
+            if len(request_line) < 2 or request_line[0] not in ('GET', 'OPTIONS'):
+                await respond(writer, '405 Method Not Allowed', {'error': 'method not allowed'})
+                return
+
+            url = urlsplit(request_line[1])
+            if request_line[0] == 'OPTIONS':
+                await respond(writer, '204 No Content', None)
+            elif url.path == '/health':
+                await respond(writer, '200 OK', {'clients': len(self.clients), 'last_id': self.last_id, 'db': self.conn is not None})
+            elif url.path == '/events':
+                await self.stream(writer, parse_filters(url.query), headers.get('last-event-id'))
+            else:
+                await respond(writer, '404 Not Found', {'error': 'not found'})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def stream(self, writer, filters: dict, last_event_id):
+        writer.write(
+            b'HTTP/1.1 200 OK\r\n'
+            b'Content-Type: text/event-stream\r\n'
+            b'Cache-Control: no-cache\r\n'
+            b'Connection: keep-alive\r\n'
+            b'Access-Control-Allow-Origin: *\r\n'
+            b'X-Accel-Buffering: no\r\n\r\n'
+            b'retry: 3000\n\n'
+        )
+
+        client = Client(filters)
+        if last_event_id and last_event_id.isdigit():
+            for event_id, event, frame in self.history:
+                if event_id > int(last_event_id) and client.wants(event):
+                    writer.write(frame)
+        self.clients.add(client)
+
+        try:
+            await writer.drain()
+            while not client.overflowed:
+                try:
+                    frame = await asyncio.wait_for(client.queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    frame = b': ping\n\n'
+                writer.write(frame)
+                await writer.drain()
+        finally:
+            self.clients.discard(client)
+
+
+def parse_filters(query: str) -> dict:
+    """Фильтр подписки из строки запроса (match_id, tournament_id)"""
+    params = parse_qs(query)
+    filters = {}
+    for key in FILTER_KEYS:
+        value = params.get(key, [''])[0]
+        if value.isdigit():
+            filters[key] = int(value)
+    return filters
+
+
+async def respond(writer, status: str, payload):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(
+        f'HTTP/1.1 {status}\r\n'
+        f'Content-Type: application/json\r\n'
+        f'Access-Control-Allow-Origin: *\r\n'
+        f'Access-Control-Allow-Headers: Last-Event-ID\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        f'Connection: close\r\n\r\n'.encode('latin-1') + body
+    )
+    await writer.drain()
+
+
+async def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else int(os.environ.get('PORT', DEFAULT_PORT))
+    relay = Relay(os.environ['DATABASE_URL'])
+    server = await asyncio.start_server(relay.handle, '0.0.0.0', port)
+    log.info('match events relay on :%s', port)
+    async with server:
+        await asyncio.gather(server.serve_forever(), relay.listen())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
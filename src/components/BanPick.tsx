@@ -17,6 +17,12 @@ interface BanPickItem {
   };
 }
 
+interface BanPickTurn {
+  order: number;
+  team_id: number;
+  action: 'ban' | 'pick';
+}
+
 interface BanPickProps {
   matchId: string;
   teamId: number | null;
@@ -27,6 +33,9 @@ export default function BanPick({ matchId, teamId, isCaptain }: BanPickProps) {
   const [banspicks, setBansPicks] = useState<BanPickItem[]>([]);
   const [mapPool, setMapPool] = useState<string[]>([]);
   const [bestOf, setBestOf] = useState(1);
+  const [nextTurn, setNextTurn] = useState<BanPickTurn | null>(null);
+  const [complete, setComplete] = useState(false);
+  const [decider, setDecider] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
 
   useEffect(() => {
@@ -57,6 +66,9 @@ export default function BanPick({ matchId, teamId, isCaptain }: BanPickProps) {
         setBansPicks(data.bans_picks || []);
         setMapPool(data.map_pool || []);
         setBestOf(data.best_of || 1);
+        setNextTurn(data.next || null);
+        setComplete(Boolean(data.complete));
+        setDecider(data.decider || null);
       }
     } catch (error: any) {
       console.error('Error loading ban-pick:', error);
@@ -87,7 +99,7 @@ export default function BanPick({ matchId, teamId, isCaptain }: BanPickProps) {
           match_id: matchId,
           team_id: teamId,
           map_name: mapName,
-          action: action
+          action_type: action
         })
       });
 
@@ -125,8 +137,8 @@ export default function BanPick({ matchId, teamId, isCaptain }: BanPickProps) {
     );
   };
 
-  const remainingPicks = mapPool.length - banspicks.length;
-  const banPickComplete = remainingPicks <= bestOf;
+  const banPickComplete = complete;
+  const isOurTurn = !!nextTurn && nextTurn.team_id === teamId;
 
   return (
     <Card className="p-4">
@@ -140,6 +152,12 @@ export default function BanPick({ matchId, teamId, isCaptain }: BanPickProps) {
         </div>
       </div>
 
+      {!banPickComplete && nextTurn && (
+        <div className="mb-4 p-3 rounded bg-muted text-sm">
+          Шаг {nextTurn.order}: {isOurTurn ? 'ваш' : 'соперника'} {nextTurn.action === 'ban' ? 'бан' : 'пик'}
+        </div>
+      )}
+
       {banPickComplete && (
         <div className="mb-4 p-3 rounded bg-green-500/10 text-green-500 text-sm">
           <Icon name="CheckCircle" className="h-4 w-4 inline mr-2" />
@@ -151,7 +169,7 @@ export default function BanPick({ matchId, teamId, isCaptain }: BanPickProps) {
         {mapPool.map((map) => {
           const banned = isMapBanned(map);
           const picked = isMapPicked(map);
-          const disabled = banned || picked || loading || !isCaptain;
+          const disabled = banned || picked || loading || !isCaptain || !isOurTurn;
 
           return (
             <div
@@ -168,28 +186,35 @@ export default function BanPick({ matchId, teamId, isCaptain }: BanPickProps) {
                   {getMapStatus(map)}
                 </div>
 
-                {!banned && !picked && isCaptain && (
+                {!banned && !picked && isCaptain && nextTurn && (
                   <div className="flex gap-2">
-                    <Button
-                      size="sm"
-                      variant="destructive"
-                      onClick={() => handleBanPick(map, 'ban')}
-                      disabled={disabled}
-                    >
-                      <Icon name="X" className="h-4 w-4 mr-1" />
-                      Бан
-                    </Button>
-                    <Button
-                      size="sm"
-                      onClick={() => handleBanPick(map, 'pick')}
-                      disabled={disabled}
-                    >
-                      <Icon name="Check" className="h-4 w-4 mr-1" />
-                      Пик
-                    </Button>
+                    {nextTurn.action === 'ban' ? (
+                      <Button
+                        size="sm"
+                        variant="destructive"
+                        onClick={() => handleBanPick(map, 'ban')}
+                        disabled={disabled}
+                      >
+                        <Icon name="X" className="h-4 w-4 mr-1" />
+                        Бан
+                      </Button>
+                    ) : (
+                      <Button
+                        size="sm"
+                        onClick={() => handleBanPick(map, 'pick')}
+                        disabled={disabled}
+                      >
+                        <Icon name="Check" className="h-4 w-4 mr-1" />
+                        Пик
+                      </Button>
+                    )}
                   </div>
                 )}
 
+                {decider === map && (
+                  <div className="text-xs text-muted-foreground">Десайдер</div>
+                )}
+
                 {(banned || picked) && (
                   <Icon 
                     name={banned ? "X" : "Check"} 
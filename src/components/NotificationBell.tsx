@@ -62,6 +62,35 @@ export default function NotificationBell() {
     }
   };
 
+  const loadUnreadCount = async () => {
+    const user = localStorage.getItem('user');
+    if (!user) return;
+
+    const userData = JSON.parse(user);
+
+    try {
+      const response = await fetch(API_URL, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'X-User-Id': userData.id.toString()
+        },
+        body: JSON.stringify({
+          action: 'get_unread_count',
+          user_id: userData.id
+        })
+      });
+
+      const data = await response.json();
+
+      if (response.ok) {
+        setUnreadCount(data.unread_count || 0);
+      }
+    } catch (error) {
+      console.error('Ошибка загрузки счетчика уведомлений:', error);
+    }
+  };
+
   const markAsRead = async (notificationId: number) => {
     const user = localStorage.getItem('user');
     if (!user) return;
@@ -113,7 +142,7 @@ export default function NotificationBell() {
   };
 
   useEffect(() => {
-    loadNotifications();
+    loadUnreadCount();
   }, []);
 
   const getNotificationIcon = (type: string) => {
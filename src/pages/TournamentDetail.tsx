@@ -52,14 +52,15 @@ export default function TournamentDetail() {
           'X-Admin-Id': user.id?.toString() || '0',
         },
         body: JSON.stringify({
-          action: 'get_tournament',
+          action: 'get_tournament_page',
           tournament_id: parseInt(id || '0'),
+          include: ['registrations'],
         }),
       });
 
       const data = await response.json();
       if (data.tournament) {
-        setTournament(data.tournament);
+        setTournament({ ...data.tournament, registered_teams: data.registrations || [] });
       }
     } catch (error) {
       console.error('Ошибка загрузки турнира:', error);
@@ -124,8 +125,10 @@ export default function TournamentDetail() {
           title: 'Успешно!',
           description: data.message,
         });
-        if (data.tournament) {
-          setTournament(data.tournament);
+        if (data.registration) {
+          setTournament((prev) =>
+            prev ? { ...prev, registered_teams: [...(prev.registered_teams || []), data.registration] } : prev
+          );
         } else {
           loadTournament();
         }